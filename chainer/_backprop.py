@@ -153,6 +153,10 @@ def _backprop_to_all(outputs, retain_grad, loss_scale):
         loss_scale (float): see docstring of Variable.backward
 
     """
+    if chainer.config.cache_backward_schedule:
+        _backprop_to_all_scheduled(outputs, retain_grad, loss_scale)
+        return
+
     OrderedDict = chainer.utils._collections.OrderedDict  # fix py2 memory leak
 
     cand_funcs = []
@@ -261,3 +265,250 @@ def _backprop_to_all(outputs, retain_grad, loss_scale):
             x_var._set_grad_var_without_check(gx)
             x_var._loss_scale = loss_scale
     grads.assert_no_grads()
+
+
+class _BackwardSchedule(object):
+
+    """Pre-sorted backward order of a computational graph.
+
+    A schedule only holds positions into the canonical list of function nodes
+    returned by :func:`_trace_graph`, so it can be reused for any graph with
+    the same structural key.
+
+    Attributes:
+        order (tuple of int): Canonical indexes of function nodes in the order
+            they are processed in backprop.
+        target_input_indexes (tuple of tuples of int): Indexes of the inputs
+            that require gradients for each function node in ``order``.
+        unique_target_inputs (tuple of tuples of int): Indexes of the inputs
+            whose gradients are collected for each function node in ``order``,
+            with duplicated input nodes removed.
+
+    """
+
+    __slots__ = ('order', 'target_input_indexes', 'unique_target_inputs')
+
+    def __init__(self, funcs, output_funcs):
+        order = []
+        all_target_input_indexes = []
+        all_unique_target_inputs = []
+        func_ids = {func: i for i, func in enumerate(funcs)}
+
+        # Emulate the traversal of _backprop_to_all assuming that every input
+        # requiring grad receives a gradient.
+        cand_funcs = []
+        seen_set = set()
+
+        def add_cand(cand):
+            if cand not in seen_set:
+                heapq.heappush(cand_funcs, (-cand.rank, len(seen_set), cand))
+                seen_set.add(cand)
+
+        for func in output_funcs:
+            add_cand(func)
+
+        while cand_funcs:
+            _, _, func = heapq.heappop(cand_funcs)
+            inputs = func.inputs
+            target_input_indexes = tuple([
+                i for i, x in enumerate(inputs) if x.requires_grad
+            ])
+            unique_target_inputs = []
+            seen_inputs = set()
+            for i in target_input_indexes:
+                x = inputs[i]
+                if x not in seen_inputs:
+                    seen_inputs.add(x)
+                    unique_target_inputs.append(i)
+                    if x.creator_node is not None:
+                        add_cand(x.creator_node)
+
+            order.append(func_ids[func])
+            all_target_input_indexes.append(target_input_indexes)
+            all_unique_target_inputs.append(tuple(unique_target_inputs))
+
+        self.order = tuple(order)
+        self.target_input_indexes = tuple(all_target_input_indexes)
+        self.unique_target_inputs = tuple(all_unique_target_inputs)
+
+
+# Cache of backward schedules keyed by the structure of graphs.
+_schedule_cache = collections.OrderedDict()
+_schedule_cache_size = 32
+
+
+def _trace_graph(outputs):
+    """Walks a graph and computes its structural key.
+
+    Args:
+        outputs (list of tuple): each tuple is (y_node, y_grad_var).
+
+    Returns:
+        tuple: A list of function nodes in the canonical (discovery) order, a
+        list of the creators of ``outputs`` and a hashable key describing the
+        function types, the shapes and dtypes of the inputs, and the edges of
+        the graph.
+
+    """
+    funcs = []
+    output_funcs = []
+    key = []
+    var_ids = {}
+    seen_set = set()
+
+    def var_id(x):
+        i = var_ids.get(x)
+        if i is None:
+            i = var_ids[x] = len(var_ids)
+        return i
+
+    stack = []
+    for y, _ in outputs:
+        func = y.creator_node
+        key.append(var_id(y))
+        if func is not None:
+            output_funcs.append(func)
+            stack.append(func)
+    key.append(None)
+
+    while stack:
+        func = stack.pop()
+        if func in seen_set:
+            continue
+        seen_set.add(func)
+        funcs.append(func)
+
+        input_keys = []
+        for x in func.inputs:
+            creator = x.creator_node
+            input_keys.append((
+                var_id(x), x.shape, x.dtype, x.requires_grad,
+                creator is None))
+            if creator is not None and x.requires_grad:
+                stack.append(creator)
+        output_keys = []
+        for y in func.outputs:
+            y = y()
+            output_keys.append(None if y is None else var_id(y))
+        key.append((
+            type(func), func._n_local_function_hooks != 0,
+            tuple(input_keys), tuple(output_keys)))
+
+    return funcs, output_funcs, tuple(key)
+
+
+def _get_schedule(outputs):
+    funcs, output_funcs, key = _trace_graph(outputs)
+    schedule = _schedule_cache.pop(key, None)
+    if schedule is None:
+        schedule = _BackwardSchedule(funcs, output_funcs)
+        if len(_schedule_cache) >= _schedule_cache_size:
+            _schedule_cache.popitem(last=False)
+    # Keep the most recently used schedule at the end
+    _schedule_cache[key] = schedule
+    return funcs, schedule
+
+
+def _backprop_to_all_scheduled(outputs, retain_grad, loss_scale):
+    """Backprop to all input variables using a cached backward schedule
+
+    This is equivalent to :func:`_backprop_to_all`, but the order of the
+    function nodes is looked up from the cache of schedules by the structure of
+    the graph instead of being computed with a heap. A function node is
+    skipped if none of its outputs received a gradient.
+
+    """
+    OrderedDict = chainer.utils._collections.OrderedDict  # fix py2 memory leak
+
+    funcs, schedule = _get_schedule(outputs)
+
+    grads = _backprop_utils.GradTable(accumulate_grad_inputs=True)
+    grad_lists = grads.grads
+
+    leaf_nodes = set()
+
+    for y, gy in outputs:
+        grads.accumulate(y, gy)
+        if y.creator_node is None:  # leaf
+            leaf_nodes.add(y)
+
+    # Fix F812 (Python 2)
+    y = None
+    del y
+
+    is_debug = chainer.is_debug()
+    base_hooks = chainer.get_function_hooks().values()
+    for func_id, target_input_indexes, unique_target_inputs in six.moves.zip(
+            schedule.order, schedule.target_input_indexes,
+            schedule.unique_target_inputs):
+        func = funcs[func_id]
+        outputs = [y() for y in func.outputs]  # access via weak ref
+        for y in outputs:
+            if y is not None and grad_lists.get(y):
+                break
+        else:
+            # Not reached by any gradient
+            continue
+        out_grad = tuple([grads.pop(y)
+                          if y is not None and y.creator_node is not None
+                          else None
+                          for y in outputs])
+        if not target_input_indexes:
+            continue
+
+        inputs = func.inputs
+        in_data = [x.data for x in inputs]
+        out_grad_array = [None if g is None else g.array for g in out_grad]
+        if func._n_local_function_hooks != 0:
+            local_hooks = collections.OrderedDict(chainer.get_function_hooks())
+            local_hooks.update(func.local_function_hooks)
+            hooks = local_hooks.values()  # avoid six for performance
+        else:
+            hooks = base_hooks
+
+        with chainer.using_device(
+                backend.get_device_from_array(*(in_data + out_grad_array))):
+            for hook in hooks:
+                hook.backward_preprocess(
+                    func, tuple(in_data), tuple(out_grad_array))
+
+            in_grad = OrderedDict()
+            for i in unique_target_inputs:
+                x = inputs[i]
+                in_grad[x] = grads.get_as_list(x)
+
+            _backprop_utils.backprop_step(
+                func, target_input_indexes, out_grad, in_grad, is_debug)
+
+            for hook in hooks:
+                hook.backward_postprocess(
+                    func, tuple(in_data), tuple(out_grad_array))
+
+        if retain_grad:
+            for y, gy in six.moves.zip(outputs, out_grad):
+                if y is not None:
+                    y._set_grad_var_if_available(gy)
+            del gy  # to reduce memory usage
+        del out_grad  # to reduce memory usage
+
+        for x, gx in in_grad.items():
+            if not gx:  # gradient == None
+                continue
+
+            for gx_elem in gx:
+                if gx_elem is not None:
+                    chainer.variable._check_grad_type(
+                        func, x, True, gx_elem.array)
+            del gx_elem  # to reduce memory usage
+
+            if x.creator_node is None:  # leaf
+                leaf_nodes.add(x)
+        del gx, in_grad  # to reduce memory usage
+
+    for x in leaf_nodes:
+        x_var = x.get_variable_or_none()
+        gx = grads.pop(x)
+        if x_var is not None:
+            x_var._set_grad_var_without_check(gx)
+            x_var._loss_scale = loss_scale
+    grads.assert_no_grads()
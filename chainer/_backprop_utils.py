@@ -12,10 +12,29 @@ def _reduce(grad_list):
     if not grad_list:
         return None
     if len(grad_list) >= 2:
-        grad_list[:] = [chainer.functions.add(*grad_list)]
+        if any([isinstance(g.array, chainer.utils.RowSparseArray)
+                for g in grad_list]):
+            grad_list[:] = [_add_sparse(grad_list)]
+        else:
+            grad_list[:] = [chainer.functions.add(*grad_list)]
     return grad_list[0]
 
 
+def _add_sparse(grad_list):
+    # Row-sparse gradients are not differentiable, so they are summed without
+    # building a graph. The sum is row-sparse unless any gradient is dense.
+    sparse = [g.array for g in grad_list
+              if isinstance(g.array, chainer.utils.RowSparseArray)]
+    dense = [g.array for g in grad_list
+             if not isinstance(g.array, chainer.utils.RowSparseArray)]
+    total = sparse[0]
+    for g in sparse[1:]:
+        total = total + g
+    for g in dense:
+        total = total + g
+    return chainer.Variable._init_unchecked(total, requires_grad=False)
+
+
 def _pure(grad):
     return [] if grad is None else [grad]
 
@@ -202,7 +221,10 @@ def backprop_step(
                     yield gx_elem
 
         for gx in iter_gxs(grad_inputs.values()):
-            if chainer.backend._contains_nan(gx.data):
+            gx = gx.data
+            if isinstance(gx, chainer.utils.RowSparseArray):
+                gx = gx.values
+            if chainer.backend._contains_nan(gx):
                 raise RuntimeError(
                     'NaN is detected on backward computation of {}'
                     .format(func.label))
@@ -0,0 +1,37 @@
+import threading
+
+
+_thread_local = threading.local()
+
+
+class _NullPhase(object):
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, typ, value, traceback):
+        pass
+
+
+_null_phase = _NullPhase()
+
+
+def _get_phase_hooks():
+    try:
+        ret = _thread_local.phase_hooks
+    except AttributeError:
+        ret = []
+        _thread_local.phase_hooks = ret
+    return ret
+
+
+def phase(name):
+    # Returns a context manager that marks a phase of a training step, e.g.,
+    # forward and backward computations in an optimizer. The phase is passed
+    # to the innermost hook activated in the current thread, which is an
+    # object with a ``phase(name)`` method returning a context manager (see
+    # chainer.training.StepProfiler). It does nothing if no hook is active.
+    hooks = getattr(_thread_local, 'phase_hooks', None)
+    if not hooks:
+        return _null_phase
+    return hooks[-1].phase(name)
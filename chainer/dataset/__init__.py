@@ -1,9 +1,11 @@
 # import classes and functions
+from chainer.dataset.convert import BufferPool  # NOQA
 from chainer.dataset.convert import concat_examples  # NOQA
 from chainer.dataset.convert import ConcatWithAsyncTransfer  # NOQA
 from chainer.dataset.convert import converter  # NOQA
 from chainer.dataset.convert import Converter  # NOQA
 from chainer.dataset.convert import to_device  # NOQA
+from chainer.dataset.convert import transfer_collated  # NOQA
 from chainer.dataset.dataset_mixin import DatasetMixin  # NOQA
 from chainer.dataset.download import cache_or_load_file  # NOQA
 from chainer.dataset.download import cached_download  # NOQA
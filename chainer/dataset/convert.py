@@ -1,4 +1,5 @@
 import collections
+import functools
 
 import numpy
 import six
@@ -8,6 +9,10 @@ from chainer import backend
 from chainer.backends import cuda
 
 
+_numpy_concatenate_out_ok = (
+    numpy.lib.NumpyVersion(numpy.__version__) >= '1.14.0')
+
+
 class Converter(object):
 
     """Base class of converters.
@@ -178,7 +183,8 @@ def _get_device(device_spec):
 
 # TODO(hvy): Write unit tests where batch elements contain Python lists.
 @converter()
-def concat_examples(batch, device=None, padding=None):
+def concat_examples(batch, device=None, padding=None, bucket_width=None,
+                    buffer_pool=None):
     """Concatenates a list of examples into array(s).
 
     This function converts an "array of tuples" into a "tuple of arrays".
@@ -203,7 +209,15 @@ def concat_examples(batch, device=None, padding=None):
     on the ``padding`` value. If ``padding`` is ``None`` (default), it raises
     an error. Otherwise, it builds an array of the minimum shape that the
     contents of all arrays can be substituted to. The padding value is then
-    used to the extra elements of the resulting arrays.
+    used to the extra elements of the resulting arrays. If ``bucket_width`` is
+    also given, the length of the first axis of each example in the resulting
+    arrays is rounded up to a multiple of it, so that batches of sequences of
+    similar lengths share the same shape.
+
+    The resulting arrays on CPU are preallocated from the first example, and
+    the examples are written into them directly. If ``buffer_pool`` is given,
+    the resulting arrays are taken from the pool instead of being allocated
+    for each batch.
 
     .. admonition:: Example
 
@@ -253,6 +267,14 @@ def concat_examples(batch, device=None, padding=None):
             minimum dimensionalities that can accommodate all arrays is
             created, and elements outside of the examples are padded by this
             value.
+        bucket_width (int): The length of the first axis of padded examples
+            is rounded up to a multiple of this value. It requires
+            ``padding``; the arrays whose padding value is ``None`` (e.g., in
+            a tuple of padding values) are not rounded up.
+        buffer_pool (~chainer.dataset.BufferPool): A pool of arrays into which
+            the examples on CPU are concatenated. Note that the arrays of a
+            batch are overwritten by a later batch of the same shape. See
+            :class:`~chainer.dataset.BufferPool` for details.
 
     Returns:
         Array, a tuple of arrays, or a dictionary of arrays. The type depends
@@ -262,6 +284,8 @@ def concat_examples(batch, device=None, padding=None):
     assert device is None or isinstance(device, backend.Device)
     if not batch:
         raise ValueError('batch is empty')
+    if bucket_width is not None and padding is None:
+        raise ValueError('bucket_width requires padding')
 
     first_elem = batch[0]
 
@@ -272,7 +296,8 @@ def concat_examples(batch, device=None, padding=None):
 
         for i in six.moves.range(len(first_elem)):
             result.append(to_device(device, _concat_arrays(
-                [example[i] for example in batch], padding[i])))
+                [example[i] for example in batch], padding[i],
+                bucket_width, buffer_pool)))
 
         return tuple(result)
 
@@ -283,49 +308,274 @@ def concat_examples(batch, device=None, padding=None):
 
         for key in first_elem:
             result[key] = to_device(device, _concat_arrays(
-                [example[key] for example in batch], padding[key]))
+                [example[key] for example in batch], padding[key],
+                bucket_width, buffer_pool))
 
         return result
 
     else:
-        return to_device(device, _concat_arrays(batch, padding))
+        return to_device(device, _concat_arrays(
+            batch, padding, bucket_width, buffer_pool))
+
+
+@converter()
+def transfer_collated(batch, device=None):
+    """Sends a batch that is already collated to a device.
+
+    This is a converter for batches returned by iterators that collate
+    examples by themselves, i.e.,
+    :class:`~chainer.iterators.MultiprocessIterator` and
+    :class:`~chainer.iterators.MultithreadIterator` with the ``collate``
+    option.
+
+    Args:
+        batch: An array, a tuple of arrays, or a dictionary of arrays.
+        device (device specifier): A device to which each array is sent.
+            If it is omitted, all arrays are left in their original devices.
+            See :meth:`~chainer.dataset.convert.to_device` for more details.
+
+    Returns:
+        The batch of the same structure whose arrays are sent to ``device``.
+
+    """
+    if isinstance(batch, tuple):
+        return tuple([to_device(device, x) for x in batch])
+    elif isinstance(batch, dict):
+        return {key: to_device(device, x) for key, x in six.iteritems(batch)}
+    else:
+        return to_device(device, batch)
 
 
-def _concat_arrays(arrays, padding):
+def _concat_arrays(arrays, padding, bucket_width=None, buffer_pool=None):
     # Convert `arrays` to numpy.ndarray if `arrays` consists of the built-in
     # types such as int, float or list.
     if not isinstance(arrays[0], chainer.get_array_types()):
         arrays = numpy.asarray(arrays)
+        if padding is None:
+            # `arrays` is already the concatenated array.
+            if buffer_pool is None:
+                return arrays
+            result = buffer_pool.get(arrays.shape, arrays.dtype)
+            result[...] = arrays
+            return result
 
     if padding is not None:
-        arr_concat = _concat_arrays_with_padding(arrays, padding)
-    else:
-        device = backend.get_device_from_array(arrays[0])
-        with chainer.using_device(device):
-            arr_concat = device.xp.concatenate(
-                [array[None] for array in arrays])
+        return _concat_arrays_with_padding(
+            arrays, padding, bucket_width, buffer_pool)
+
+    first = arrays[0]
+    if isinstance(first, numpy.ndarray):
+        shape = (len(arrays),) + first.shape
+        result = _empty(shape, _result_type(arrays), buffer_pool)
+        _stack_into(arrays, result)
+        return result
+
+    device = backend.get_device_from_array(first)
+    with chainer.using_device(device):
+        arr_concat = device.xp.concatenate(
+            [array[None] for array in arrays])
 
     return arr_concat
 
 
-def _concat_arrays_with_padding(arrays, padding):
-    shape = numpy.array(arrays[0].shape, dtype=int)
-    for array in arrays[1:]:
-        if numpy.any(shape != array.shape):
-            numpy.maximum(shape, array.shape, shape)
-    shape = tuple(numpy.insert(shape, 0, len(arrays)))
+def _concat_arrays_with_padding(arrays, padding, bucket_width=None,
+                                buffer_pool=None):
+    first = arrays[0]
+    shapes = numpy.array([array.shape for array in arrays], dtype=int)
+    if shapes.ndim != 2:
+        raise ValueError(
+            'all input arrays must have the same number of dimensions')
+    shape = shapes.max(axis=0)
+    if bucket_width is not None and len(shape) > 0:
+        shape[0] = -(-shape[0] // bucket_width) * bucket_width
+    shape = (len(arrays),) + tuple(shape)
+
+    if isinstance(first, numpy.ndarray):
+        result = _empty(shape, _result_type(arrays), buffer_pool)
+        result.fill(padding)
+        if shapes.shape[1] > 0 and (shapes[:, 1:] == shape[2:]).all():
+            # Only the first axis of the examples differ, e.g., sequences.
+            # Fill the leading elements of all the examples at once.
+            mask = numpy.arange(shape[1]) < shapes[:, :1]
+            result[mask] = numpy.concatenate(arrays)
+        else:
+            _fill_with_padding(result, arrays)
+        return result
 
-    device = backend.get_device_from_array(arrays[0])
+    device = backend.get_device_from_array(first)
     with chainer.using_device(device):
-        result = device.xp.full(shape, padding, dtype=arrays[0].dtype)
-        for i in six.moves.range(len(arrays)):
-            src = arrays[i]
-            slices = tuple(slice(dim) for dim in src.shape)
-            result[(i,) + slices] = src
+        result = device.xp.full(shape, padding, dtype=first.dtype)
+        _fill_with_padding(result, arrays)
 
     return result
 
 
+def _stack_into(arrays, result):
+    # Same as numpy.stack(arrays, out=result) without making a view of each
+    # array, which dominates the time for a large batch of small examples.
+    shape = result.shape[1:]
+    for array in arrays:
+        if array.shape != shape:
+            raise ValueError('all input arrays must have the same shape')
+    if shape and _numpy_concatenate_out_ok:
+        numpy.concatenate(arrays, out=result.reshape((-1,) + shape[1:]))
+    else:
+        result[:] = arrays
+
+
+def _fill_with_padding(result, arrays):
+    for i in six.moves.range(len(arrays)):
+        src = arrays[i]
+        slices = tuple(slice(dim) for dim in src.shape)
+        result[(i,) + slices] = src
+
+
+def _result_type(arrays):
+    # Same as numpy.result_type(*arrays), which numpy.stack uses, without the
+    # limit on the number of arguments.
+    dtypes = set(array.dtype for array in arrays)
+    return functools.reduce(numpy.promote_types, dtypes)
+
+
+def _empty(shape, dtype, buffer_pool):
+    if buffer_pool is None:
+        return numpy.empty(shape, dtype)
+    return buffer_pool.get(shape, dtype)
+
+
+class BufferPool(object):
+
+    """Pool of arrays reused to collate and transfer batches.
+
+    This class keeps arrays for each combination of a shape, a dtype and a
+    device so that batches of the same shape do not allocate new arrays.
+    It is passed to :func:`~chainer.dataset.concat_examples` and
+    :class:`~chainer.dataset.ConcatWithAsyncTransfer`. This is effective when
+    most batches have the same shapes, e.g., when the examples are of fixed
+    size or padded with ``bucket_width``.
+
+    An array obtained by :meth:`get` is in use until it is given back by
+    :meth:`release`, after which it is returned again by :meth:`get`.
+    At most ``n_buffers`` arrays are allocated for each combination; if all of
+    them are in use, the one obtained earliest is recycled, i.e., its contents
+    are overwritten. Therefore, the arrays of a batch are valid until
+    ``n_buffers`` more batches of the same shape are made, even if they are
+    not released. Copy the arrays if you need to keep them longer.
+
+    Args:
+        n_buffers (int): Maximum number of arrays kept for each combination of
+            a shape, a dtype and a device.
+        pinned (bool): If ``True``, host arrays are allocated in the
+            page-locked memory, which makes the transfer to GPUs faster. It
+            requires CuPy.
+
+    Attributes:
+        ~BufferPool.n_allocations (int): Number of arrays allocated by the
+            pool so far. It does not increase once the pool holds the arrays
+            for all the shapes of batches.
+
+    """
+
+    def __init__(self, n_buffers=2, pinned=False):
+        if n_buffers < 1:
+            raise ValueError('n_buffers must be positive')
+        if pinned:
+            cuda.check_cuda_available()
+        self.n_buffers = n_buffers
+        self.pinned = pinned
+        self.n_allocations = 0
+        self._free = {}
+        self._used = {}
+        self._keys = {}
+
+    def get(self, shape, dtype, device=None):
+        """Returns an array of the given shape and dtype.
+
+        The contents of the array are undefined.
+
+        Args:
+            shape (tuple of ints): Shape of the array.
+            dtype: Data type of the array.
+            device (device specifier): Device on which the array is
+                allocated. If it is ``None`` or a CPU device, the array is
+                allocated in the host memory.
+
+        Returns:
+            :ref:`ndarray`: An array from the pool.
+
+        """
+        device = _get_device(device)
+        if device is not None and device.xp is numpy:
+            device = None
+        key = (tuple(shape), numpy.dtype(dtype), device)
+        free = self._free.setdefault(key, [])
+        used = self._used.setdefault(key, [])
+        if free:
+            array = free.pop()
+        elif len(used) < self.n_buffers:
+            array = self._allocate(*key)
+            self._keys[id(array)] = key
+            self.n_allocations += 1
+        else:
+            array = used.pop(0)
+        used.append(array)
+        return array
+
+    def release(self, array):
+        """Gives back an array obtained from the pool.
+
+        The array must not be used after it is released. Releasing an array
+        twice is allowed.
+
+        Args:
+            array (:ref:`ndarray`): An array returned by :meth:`get`.
+
+        """
+        key = self._keys.get(id(array))
+        if key is None:
+            raise ValueError('The array is not an array of the pool.')
+        used = self._used[key]
+        for i, a in enumerate(used):
+            if a is array:
+                del used[i]
+                self._free[key].append(array)
+                return
+
+    def __contains__(self, array):
+        key = self._keys.get(id(array))
+        return key is not None and any(
+            a is array for a in self._used[key] + self._free[key])
+
+    def clear(self):
+        """Releases all the arrays of the pool."""
+        self._free.clear()
+        self._used.clear()
+        self._keys.clear()
+
+    def _allocate(self, shape, dtype, device):
+        if device is not None:
+            with chainer.using_device(device):
+                return device.xp.empty(shape, dtype)
+        if not self.pinned:
+            return numpy.empty(shape, dtype)
+        size = int(numpy.prod(shape, dtype=numpy.int64))
+        mem = cuda.cupy.cuda.alloc_pinned_memory(size * dtype.itemsize)
+        return numpy.frombuffer(mem, dtype, size).reshape(shape)
+
+
+def _get_cuda_device_id(device):
+    # Returns the ID of the CUDA device if `device` specifies a device of
+    # CuPy, otherwise None.
+    if device is None:
+        return None
+    if isinstance(device, six.integer_types):
+        return device if device >= 0 else None
+    device = _get_device(device)
+    if isinstance(device, cuda.GpuDevice):
+        return device.device.id
+    return None
+
+
 class ConcatWithAsyncTransfer(object):
 
     """Interface to concatenate data and transfer them to GPU asynchronously.
@@ -354,15 +604,24 @@ class ConcatWithAsyncTransfer(object):
             synchronization and overlap execution of compute kernels and data
             transfers as much as possible. If ``None``, global synchronization
             is used instead.
+        buffer_pool (~chainer.dataset.BufferPool): A pool of arrays into
+            which the examples are concatenated and from which the
+            destination arrays on the device are taken. It should be created
+            with ``pinned=True`` to transfer arrays to GPU asynchronously.
+            If it is given, batches of the same shapes do not allocate new
+            arrays. The arrays of a returned batch can be given back by
+            :meth:`BufferPool.release`; otherwise they are overwritten after
+            ``buffer_pool.n_buffers`` more batches.
     """
 
-    def __init__(self, stream=None, compute_stream=None):
+    def __init__(self, stream=None, compute_stream=None, buffer_pool=None):
         self._stream = stream
         self.compute_stream = compute_stream
+        self.buffer_pool = buffer_pool
 
         self._device = None
         self._conveyor = collections.defaultdict(
-            lambda: Conveyor(self._device, self._stream))
+            lambda: Conveyor(self._device, self._stream, self.buffer_pool))
         if compute_stream is not None:
             # * event1 prevents a CPU thread to update arrays that might be
             #   still being used by GPU kernels.
@@ -381,7 +640,9 @@ class ConcatWithAsyncTransfer(object):
 
         Args:
             batch (list): A list of examples.
-            device (int): Device ID to which each array is sent.
+            device (int or device specifier): Device to which each array is
+                sent. Arrays are transferred asynchronously only to GPUs of
+                CuPy.
             padding: Scalar value for extra elements.
 
         Returns:
@@ -391,20 +652,22 @@ class ConcatWithAsyncTransfer(object):
         if not batch:
             raise ValueError('batch is empty')
         first_elem = batch[0]
+        device_id = _get_cuda_device_id(device)
+        buffer_pool = self.buffer_pool
 
         if not self._conveyor:
             self._device = device  # device is set at first call
-            if device is not None and device >= 0 and self._stream is None:
-                with cuda.get_device_from_id(device):
+            if device_id is not None and self._stream is None:
+                with cuda.get_device_from_id(device_id):
                     self._stream = cuda.Stream(non_blocking=True)
-        if device is not self._device:
+        if device != self._device:
             raise ValueError('device is different')
 
         if self.compute_stream is not None:
             self._event1.synchronize()
             self._event1.record(stream=self.compute_stream)
 
-        with cuda.get_device_from_id(device):
+        with cuda.get_device_from_id(device_id):
             if isinstance(first_elem, tuple):
                 result = []
                 if not isinstance(padding, tuple):
@@ -412,7 +675,8 @@ class ConcatWithAsyncTransfer(object):
 
                 for i in six.moves.range(len(first_elem)):
                     self._conveyor[i].put(_concat_arrays(
-                        [example[i] for example in batch], padding[i]))
+                        [example[i] for example in batch], padding[i],
+                        buffer_pool=buffer_pool))
 
                 for i in six.moves.range(len(first_elem)):
                     result.append(self._conveyor[i].get(sync=self._sync_get))
@@ -430,7 +694,8 @@ class ConcatWithAsyncTransfer(object):
 
                 for key in first_elem:
                     self._conveyor[key].put(_concat_arrays(
-                        [example[key] for example in batch], padding[key]))
+                        [example[key] for example in batch], padding[key],
+                        buffer_pool=buffer_pool))
 
                 for key in first_elem:
                     result[key] = self._conveyor[key].get(sync=self._sync_get)
@@ -442,7 +707,8 @@ class ConcatWithAsyncTransfer(object):
                 return result
 
             else:
-                return to_device(device, _concat_arrays(batch, padding))
+                return to_device(device, _concat_arrays(
+                    batch, padding, buffer_pool=buffer_pool))
 
 
 class Conveyor(object):
@@ -454,21 +720,30 @@ class Conveyor(object):
     You should call :meth:`put` followed by :meth:`get`.
 
     Args:
-        device (int): Device ID to which an array is sent. Negative value
-            indicates the host memory (CPU). If it is omitted, the array is
-            left in the original device. Asynchronous data transfer is used
-            only when device ID >= 0.
+        device (int or device specifier): Device to which an array is sent.
+            Negative value indicates the host memory (CPU). If it is omitted,
+            the array is left in the original device. Asynchronous data
+            transfer is used only for GPUs of CuPy.
         stream (cupy.cuda.Stream): CUDA stream. An array is sent to GPU
             asynchronously using this stream. If ``None``, asynchronous data
             transfer is not used.
+        buffer_pool (~chainer.dataset.BufferPool): A pool from which the
+            intermediate arrays on pinned memory and the arrays on the target
+            device are taken instead of the double buffers of this object.
+            An array to put that is taken from the pool is directly
+            transferred, and it is released to the pool after the transfer
+            completes.
     """
 
-    def __init__(self, device=None, stream=None):
+    def __init__(self, device=None, stream=None, buffer_pool=None):
         self._device = device
+        self._device_id = _get_cuda_device_id(device)
         self._stream = stream
+        self._buffer_pool = buffer_pool
 
         self._array_set = [[None, None], [None, None]]
         self._ret_array = []
+        self._staging_array = []
 
     def put(self, array):
         """Initiates asynchronous transfer of an array to a target device.
@@ -485,10 +760,15 @@ class Conveyor(object):
 
         Double buffering scheme is used here, so you can initiate next data
         transfer safely even when current data is still used on the target
-        device.
+        device. If the buffer pool is given, the arrays are taken from the
+        pool instead.
         """
-        if self._device is None or self._device < 0 or self._stream is None:
+        if self._device_id is None or self._stream is None:
             self._ret_array.append(to_device(self._device, array))
+            self._staging_array.append(None)
+            return
+        if self._buffer_pool is not None:
+            self._put_pooled(array)
             return
 
         pin_array, cp_array = self._array_set.pop(0)
@@ -518,6 +798,28 @@ class Conveyor(object):
 
         self._array_set.append([pin_array, cp_array])
         self._ret_array.append(cp_array)
+        self._staging_array.append(None)
+
+    def _put_pooled(self, array):
+        pool = self._buffer_pool
+        n_allocations = pool.n_allocations
+        if array in pool:
+            pin_array = array  # already on the (pinned) memory of the pool
+        else:
+            pin_array = pool.get(array.shape, array.dtype)
+        with cuda.get_device_from_id(self._device_id):
+            cp_array = pool.get(
+                array.shape, array.dtype,
+                cuda.GpuDevice.from_device_id(self._device_id))
+            if pool.n_allocations != n_allocations:
+                # See put() for the global synchronization on allocation.
+                cuda.cupy.cuda.runtime.deviceSynchronize()
+            if pin_array is not array:
+                pin_array[...] = array  # copy(CPU): paged -> pinned
+            cp_array.set(pin_array, self._stream)  # copy: CPU to GPU
+
+        self._ret_array.append(cp_array)
+        self._staging_array.append(pin_array)
 
     def get(self, sync=True):
         """Returns the array of data transferred to a target device asynchronously.
@@ -534,8 +836,11 @@ class Conveyor(object):
                 synchronization correctly hence does not use global
                 synchronization.
         """
-        if (self._device is not None and self._device >= 0 and
-                self._stream is not None):
+        pin_array = self._staging_array.pop(0)
+        if self._device_id is not None and self._stream is not None:
             if sync:
                 cuda.cupy.cuda.runtime.deviceSynchronize()
+                if pin_array is not None:
+                    # The transfer from the pinned memory has completed.
+                    self._buffer_pool.release(pin_array)
         return self._ret_array.pop(0)
@@ -9,7 +9,10 @@ class DatasetMixin(object):
     DatasetMixin provides the :meth:`__getitem__` operator. The default
     implementation uses :meth:`get_example` to extract each example, and
     combines the results into a list. This mixin makes it easy to implement a
-    new dataset that does not support efficient slicing.
+    new dataset that does not support efficient slicing. A dataset that can
+    read multiple examples at once efficiently can override
+    :meth:`get_examples`, which is used for slicing and by the built-in
+    iterators to read a minibatch.
 
     Dataset implementation using DatasetMixin still has to provide the
     :meth:`__len__` operator explicitly.
@@ -20,9 +23,10 @@ class DatasetMixin(object):
         """Returns an example or a sequence of examples.
 
         It implements the standard Python indexing and one-dimensional integer
-        array indexing. It uses the :meth:`get_example` method by default, but
-        it may be overridden by the implementation to, for example, improve the
-        slicing performance.
+        array indexing. It uses the :meth:`get_example` method for an integer
+        index and the :meth:`get_examples` method for the other indices by
+        default, but it may be overridden by the implementation to, for
+        example, improve the slicing performance.
 
         Args:
             index (int, slice, list or numpy.ndarray): An index of an example
@@ -31,7 +35,7 @@ class DatasetMixin(object):
         Returns:
             If index is int, returns an example created by `get_example`.
             If index is either slice or one-dimensional list or numpy.ndarray,
-            returns a list of examples created by `get_example`.
+            returns a list of examples created by `get_examples`.
 
         .. admonition:: Example
 
@@ -59,10 +63,9 @@ class DatasetMixin(object):
         """
         if isinstance(index, slice):
             current, stop, step = index.indices(len(self))
-            return [self.get_example(i) for i in
-                    six.moves.range(current, stop, step)]
+            return self.get_examples(six.moves.range(current, stop, step))
         elif isinstance(index, list) or isinstance(index, numpy.ndarray):
-            return [self.get_example(i) for i in index]
+            return self.get_examples(index)
         else:
             return self.get_example(index)
 
@@ -84,3 +87,18 @@ class DatasetMixin(object):
 
         """
         raise NotImplementedError
+
+    def get_examples(self, indices):
+        """Returns a list of examples.
+
+        The default implementation calls :meth:`get_example` for each index.
+        Implementations may override it to read the examples at once.
+
+        Args:
+            indices (iterable of ints): The indices of the examples.
+
+        Returns:
+            list: The examples in the order of ``indices``.
+
+        """
+        return [self.get_example(i) for i in indices]
@@ -1,3 +1,4 @@
+import numpy
 import six
 
 import chainer
@@ -124,22 +125,29 @@ class TabularDataset(dataset_mixin.DatasetMixin):
         """
         return chainer.dataset.tabular._slice._SliceHelper(self)
 
-    def fetch(self):
+    def fetch(self, indices=None):
         """Fetch data.
 
-        This method fetches all data of the dataset/view.
+        This method fetches all data of the dataset/view, or the rows of
+        ``indices`` if it is given.
         Note that this method returns a column-major data
         (i.e. :obj:`([a[0], ..., a[3]], ..., [c[0], ... c[3]])`,
         :obj:`{'a': [a[0], ..., a[3]], ..., 'c': [c[0], ..., c[3]]}`, or
         :obj:`[a[0], ..., a[3]]`).
 
+        Args:
+            indices (list/array of ints or slice): Indices of requested rows.
+                If this argument is :obj:`None`, it indicates all rows.
+
         Returns:
             If :attr:`mode` is :class:`tuple`,
             this method returns a tuple of lists/arrays.
             If :attr:`mode` is :class:`dict`,
             this method returns a dict of lists/arrays.
         """
-        examples = self.get_examples(None, None)
+        if isinstance(indices, numpy.ndarray):
+            indices = indices.tolist()
+        examples = self.get_examples(indices, None)
         if self.mode is tuple:
             return examples
         elif self.mode is dict:
@@ -221,6 +229,34 @@ class TabularDataset(dataset_mixin.DatasetMixin):
         return chainer.dataset.tabular._transform._TransformBatch(
             self, keys, transform_batch)
 
+    def __getitem__(self, index):
+        """Returns an example or a list of examples.
+
+        For a slice, a list or an array of indices, the examples are fetched
+        by a single call of :meth:`get_examples`.
+
+        Args:
+            index (int, slice, list or numpy.ndarray): An index of an example
+                or indexes of examples.
+
+        Returns:
+            An example or a list of examples in the representation of
+            :attr:`mode`.
+
+        """
+        if isinstance(index, (slice, list, numpy.ndarray)):
+            if isinstance(index, numpy.ndarray):
+                index = index.tolist()
+            columns = self.get_examples(index, None)
+            if self.mode is tuple:
+                return list(six.moves.zip(*columns))
+            elif self.mode is dict:
+                return [dict(six.moves.zip(self.keys, example))
+                        for example in six.moves.zip(*columns)]
+            elif self.mode is None:
+                return list(columns[0])
+        return self.get_example(index)
+
     def get_example(self, i):
         example = self.get_examples([i], None)
         example = tuple(col[0] for col in example)
@@ -1,4 +1,8 @@
 # import classes and functions
+from chainer.datasets.binary_dataset import BinaryDataset  # NOQA
+from chainer.datasets.binary_dataset import BinaryDatasetWriter  # NOQA
+from chainer.datasets.binary_dataset import open_binary_dataset  # NOQA
+from chainer.datasets.binary_dataset import open_binary_dataset_writer  # NOQA
 from chainer.datasets.cifar import get_cifar10  # NOQA
 from chainer.datasets.cifar import get_cifar100  # NOQA
 from chainer.datasets.concatenated_dataset import ConcatenatedDataset  # NOQA
@@ -0,0 +1,414 @@
+import io
+import json
+import mmap
+import multiprocessing.util
+import struct
+import threading
+
+import numpy
+import six
+
+from chainer.dataset import dataset_mixin
+from chainer.datasets import pickle_dataset
+
+
+_MAGIC = b'CHAINERBINDATA01'
+# Offset of the index and length of the metadata, followed by the magic.
+_FOOTER = struct.Struct('<QQ')
+# Alignment of each field in bytes.
+_ALIGNMENT = 8
+
+
+class BinaryDatasetWriter(object):
+
+    """Writer class that makes BinaryDataset.
+
+    To make :class:`BinaryDataset`, a user needs to prepare data using
+    :class:`BinaryDatasetWriter`. Each example must be an array, a tuple of
+    arrays or a dictionary of arrays, which have the same structure, the same
+    dtypes and the same numbers of dimensions for all the examples. Scalars
+    and lists are converted to arrays by :func:`numpy.asarray`. Arrays of the
+    object dtype cannot be written; use :class:`PickleDatasetWriter` for
+    them.
+
+    The index of the dataset is written when the writer is closed.
+
+    Args:
+        writer: File like object that supports ``write`` and ``tell`` methods.
+
+    .. seealso: chainer.datasets.BinaryDataset
+
+    """
+
+    def __init__(self, writer):
+        self._writer = writer
+        self._closed = False
+        self._fields = None
+        self._kind = None
+        self._keys = None
+        self._offsets = []
+        self._shapes = []
+        writer.write(_MAGIC)
+
+    def close(self):
+        if not self._closed:
+            self._write_index()
+            self._closed = True
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, x):
+        if self._closed:
+            raise RuntimeError('The writer is already closed.')
+        kind, keys, values = _flatten(x)
+        arrays = [numpy.asarray(v) for v in values]
+        fields = [(a.dtype.str, a.ndim) for a in arrays]
+        for dtype, _ in fields:
+            if numpy.dtype(dtype).hasobject:
+                raise TypeError(
+                    'Arrays of the object dtype cannot be written to '
+                    'BinaryDataset. Use PickleDataset instead.')
+        if self._fields is None:
+            self._kind, self._keys, self._fields = kind, keys, fields
+        elif (kind, keys, fields) != (self._kind, self._keys, self._fields):
+            raise ValueError(
+                'All the examples must have the same structure, dtypes and '
+                'numbers of dimensions.\n'
+                'Expected: {}\nActual: {}'.format(
+                    (self._kind, self._keys, self._fields),
+                    (kind, keys, fields)))
+
+        offsets = []
+        shape = []
+        for a in arrays:
+            position = self._writer.tell()
+            padding = -position % _ALIGNMENT
+            if padding:
+                self._writer.write(b'\0' * padding)
+            offsets.append(position + padding)
+            shape.extend(a.shape)
+            self._writer.write(a.tobytes())
+        self._offsets.append(offsets)
+        self._shapes.append(shape)
+
+    def flush(self):
+        if hasattr(self._writer, 'flush'):
+            self._writer.flush()
+
+    def _write_index(self):
+        n = len(self._offsets)
+        fields = self._fields or []
+        data_end = self._writer.tell()
+        offsets = numpy.array(self._offsets, dtype='<i8').reshape(
+            n, len(fields))
+        shapes = numpy.array(self._shapes, dtype='<i8').reshape(
+            n, sum(ndim for _, ndim in fields))
+        self._writer.write(offsets.tobytes())
+        self._writer.write(shapes.tobytes())
+        meta = json.dumps({
+            'length': n,
+            'kind': self._kind,
+            'keys': self._keys,
+            'fields': fields,
+        }).encode('utf-8')
+        self._writer.write(meta)
+        self._writer.write(_FOOTER.pack(data_end, len(meta)))
+        self._writer.write(_MAGIC)
+        self.flush()
+
+
+class BinaryDataset(dataset_mixin.DatasetMixin):
+
+    """Dataset of arrays stored in a storage in a binary format.
+
+    This dataset stores examples made of NumPy arrays as raw binary records
+    with a compact index at the end of the storage. Unlike
+    :class:`PickleDataset`, which unpickles each example, arrays are read
+    directly from the storage, which is memory-mapped if possible. Therefore
+    it is suitable for a large dataset of arrays that does not fit in the
+    memory.
+
+    An example is returned in the same structure as it is written, i.e., an
+    array, a tuple of arrays or a dictionary of arrays. 0-dimensional arrays
+    are returned as NumPy scalars.
+
+    :meth:`get_examples` reads multiple examples at once. The records of
+    consecutive examples are read by a single read.
+
+    .. testsetup::
+
+        import tempfile
+        fs, path_to_data = tempfile.mkstemp()
+
+    >>> with chainer.datasets.open_binary_dataset_writer(path_to_data) as w:
+    ...     w.write((np.array([1, 2], np.int32), np.float32(0.5)))
+    ...     w.write((np.array([3], np.int32), np.float32(1.5)))
+    ...
+    >>> with chainer.datasets.open_binary_dataset(path_to_data) as dataset:
+    ...     print(dataset[1])
+    ...
+    (array([3], dtype=int32), 1.5)
+
+    .. testcleanup::
+
+        import os
+        os.close(fs)
+
+    Args:
+        reader: File like object. `reader` must support random access. If it
+            supports ``fileno``, the file is memory-mapped.
+
+    .. seealso: chainer.datasets.BinaryDatasetWriter
+
+    """
+
+    def __init__(self, reader):
+        # Only py3 supports `seekable` method
+        if six.PY3 and not reader.seekable():
+            raise ValueError('reader must support random access')
+        self._reader = reader
+        self._lock = threading.RLock()
+        self._load_index()
+        self._mmap = None
+        self._map()
+
+        # TODO: Avoid using undocumented feature
+        multiprocessing.util.register_after_fork(
+            self, BinaryDataset._after_fork)
+
+    def _load_index(self):
+        reader = self._reader
+        tail = len(_MAGIC) + _FOOTER.size
+        reader.seek(0, io.SEEK_END)
+        end = reader.tell()
+        reader.seek(0)
+        if (end < len(_MAGIC) + tail or
+                _read_exact(reader, len(_MAGIC)) != _MAGIC):
+            raise ValueError('The file is not a BinaryDataset.')
+        reader.seek(end - tail)
+        footer = _read_exact(reader, tail)
+        if footer[_FOOTER.size:] != _MAGIC:
+            raise ValueError('The index of BinaryDataset is broken.')
+        data_end, meta_length = _FOOTER.unpack(footer[:_FOOTER.size])
+
+        reader.seek(end - tail - meta_length)
+        meta = json.loads(_read_exact(reader, meta_length).decode('utf-8'))
+        n = meta['length']
+        self._kind = meta['kind']
+        self._keys = meta['keys']
+        self._dtypes = [numpy.dtype(dtype) for dtype, _ in meta['fields']]
+        ndims = [ndim for _, ndim in meta['fields']]
+
+        reader.seek(data_end)
+        n_fields = len(ndims)
+        self._offsets = numpy.frombuffer(
+            _read_exact(reader, n * n_fields * 8), dtype='<i8').reshape(
+                n, n_fields)
+        self._shapes = numpy.frombuffer(
+            _read_exact(reader, n * sum(ndims) * 8), dtype='<i8').reshape(
+                n, sum(ndims))
+        self._shape_slices = []
+        i = 0
+        for ndim in ndims:
+            self._shape_slices.append(slice(i, i + ndim))
+            i += ndim
+        # Records are contiguous; the end of a record is the start of the
+        # next one.
+        if n_fields:
+            self._ends = numpy.append(self._offsets[1:, 0], data_end)
+
+    def _map(self):
+        try:
+            fileno = self._reader.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            return
+        self._mmap = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+
+    def _unmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _after_fork(self):
+        with self._lock:
+            if callable(getattr(self._reader, 'after_fork', None)):
+                self._reader.after_fork()
+                if self._mmap is not None:
+                    self._unmap()
+                    self._map()
+
+    def close(self):
+        """Closes a file reader.
+
+        After a user calls this method, the dataset will no longer be
+        accessible.
+        """
+        with self._lock:
+            self._unmap()
+            self._reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def get_example(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('index out of range')
+        return self._get_run(index, index + 1)[0]
+
+    def get_examples(self, indices):
+        """Returns a list of examples.
+
+        The records of consecutive indices are read at once.
+
+        Args:
+            indices (list of ints or numpy.ndarray): Indices of the examples.
+
+        Returns:
+            list: Examples in the order of ``indices``.
+
+        """
+        indices = numpy.asarray(indices, dtype=numpy.int64).ravel()
+        n = len(self)
+        indices = numpy.where(indices < 0, indices + n, indices)
+        if ((indices < 0) | (indices >= n)).any():
+            raise IndexError('index out of range')
+
+        unique = numpy.unique(indices)
+        examples = {}
+        # Split the sorted indices into runs of consecutive indices
+        breaks = numpy.flatnonzero(numpy.diff(unique) != 1) + 1
+        for run in numpy.split(unique, breaks):
+            if len(run) == 0:
+                continue
+            start = int(run[0])
+            examples.update(enumerate(
+                self._get_run(start, start + len(run)), start))
+        return [examples[i] for i in indices.tolist()]
+
+    def _get_run(self, start, stop):
+        # Reads the examples in [start, stop) by a single read.
+        if not self._dtypes:
+            return [self._unflatten([]) for _ in six.moves.range(start, stop)]
+        base = int(self._offsets[start, 0])
+        buf = self._read(base, int(self._ends[stop - 1]) - base)
+        fields = list(six.moves.zip(self._dtypes, self._shape_slices))
+        examples = []
+        for offsets, shapes in six.moves.zip(
+                (self._offsets[start:stop] - base).tolist(),
+                self._shapes[start:stop].tolist()):
+            values = []
+            for (dtype, s), offset in six.moves.zip(fields, offsets):
+                array = numpy.ndarray(shapes[s], dtype, buf, offset)
+                if array.ndim == 0:
+                    array = array[()]
+                values.append(array)
+            examples.append(self._unflatten(values))
+        return examples
+
+    def _read(self, offset, length):
+        # Returns a writable copy of the bytes of the storage.
+        with self._lock:
+            if self._mmap is not None:
+                return numpy.frombuffer(
+                    self._mmap, numpy.uint8, length, offset).copy()
+            buf = numpy.empty(length, dtype=numpy.uint8)
+            view = memoryview(buf)
+            self._reader.seek(offset)
+            read = 0
+            while read < length:
+                n = self._reader.readinto(view[read:])
+                if not n:
+                    raise IOError('Unexpected end of file')
+                read += n
+        return buf
+
+    def _unflatten(self, values):
+        if self._kind == 'tuple':
+            return tuple(values)
+        elif self._kind == 'dict':
+            return dict(six.moves.zip(self._keys, values))
+        return values[0]
+
+
+def _flatten(x):
+    if isinstance(x, tuple):
+        return 'tuple', None, list(x)
+    elif isinstance(x, dict):
+        keys = sorted(x.keys())
+        return 'dict', keys, [x[key] for key in keys]
+    return 'array', None, [x]
+
+
+def _read_exact(reader, length):
+    data = reader.read(length)
+    if len(data) != length:
+        raise ValueError('The file is not a BinaryDataset.')
+    return data
+
+
+def open_binary_dataset(path):
+    """Opens a dataset stored in a given path.
+
+    This is a helper function to open :class:`BinaryDataset`. It opens a given
+    file in binary mode, and creates a :class:`BinaryDataset` instance.
+
+    This method does not close the opened file. A user needs to call
+    :func:`BinaryDataset.close` or use `with`:
+
+    .. code-block:: python
+
+        with chainer.datasets.open_binary_dataset('path') as dataset:
+            pass  # use dataset
+
+    Args:
+        path (str): Path to a dataset.
+
+    Returns:
+        chainer.datasets.BinaryDataset: Opened dataset.
+
+    .. seealso: chainer.datasets.BinaryDataset
+
+    """
+    reader = pickle_dataset._FileReader(path)
+    return BinaryDataset(reader)
+
+
+def open_binary_dataset_writer(path):
+    """Opens a writer to make a BinaryDataset.
+
+    This is a helper function to open :class:`BinaryDatasetWriter`. It opens a
+    given file in binary mode and creates a :class:`BinaryDatasetWriter`
+    instance.
+
+    This method does not close the opened file. A user needs to call
+    :func:`BinaryDatasetWriter.close` or use `with`:
+
+    .. code-block:: python
+
+        with chainer.datasets.open_binary_dataset_writer('path') as writer:
+            pass  # use writer
+
+    Args:
+        path (str): Path to a dataset.
+
+    Returns:
+        chainer.datasets.BinaryDatasetWriter: Opened writer.
+
+    .. seealso: chainer.datasets.BinaryDataset
+
+    """
+    writer = open(path, 'wb')
+    return BinaryDatasetWriter(writer)
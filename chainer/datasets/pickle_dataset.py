@@ -78,6 +78,10 @@ class PickleDataset(dataset_mixin.DatasetMixin):
     Args:
         reader: File like object. `reader` must support random access.
 
+    .. seealso::
+       :class:`~chainer.datasets.BinaryDataset` stores examples made of
+       arrays without pickling, which is faster to read for large datasets.
+
     """
 
     def __init__(self, reader):
@@ -0,0 +1,22 @@
+from chainer import link_hook
+
+
+class LinkScopeHook(link_hook.LinkHook):
+
+    """Link hook that notifies a function hook of link scopes.
+
+    It calls ``owner._enter_link(args)`` and ``owner._exit_link()`` around
+    the forward computation of each link, where ``args`` is the callback
+    argument of :meth:`~chainer.LinkHook.forward_preprocess`.
+
+    """
+
+    def __init__(self, owner):
+        self.name = owner.name + 'LinkScope'
+        self._owner = owner
+
+    def forward_preprocess(self, args):
+        self._owner._enter_link(args)
+
+    def forward_postprocess(self, args):
+        self._owner._exit_link()
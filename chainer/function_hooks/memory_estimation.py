@@ -0,0 +1,358 @@
+import collections
+import sys
+import weakref
+
+import numpy
+import six
+
+import chainer
+from chainer import function_hook
+from chainer.function_hooks import _link_scope
+from chainer import variable
+
+
+def _nbytes_of_node(node):
+    return int(numpy.prod(node.shape, dtype=numpy.int64)) * \
+        numpy.dtype(node.dtype).itemsize
+
+
+def _hidden_arrays(obj, array_types):
+    # Arrays stored as attributes of a function (e.g., masks and indices)
+    # are kept alive until the function is released.
+    for value in six.itervalues(vars(obj)):
+        if isinstance(value, array_types):
+            yield value
+        elif isinstance(value, (tuple, list)):
+            for v in value:
+                if isinstance(v, array_types):
+                    yield v
+
+
+def _retained_arrays(func, array_types):
+    if func._input_indexes_to_retain is not None and func.inputs is not None:
+        for index in func._input_indexes_to_retain:
+            node = func.inputs[index]
+            if node.creator_node is not None and node.data is not None:
+                yield node.data
+    if func._retained_output_data is not None:
+        for data in func._retained_output_data:
+            if data is not None:
+                yield data
+    for obj in (func, getattr(func, '_function', None)):
+        if obj is not None:
+            for array in _hidden_arrays(obj, array_types):
+                yield array
+
+
+class MemoryEstimationHook(function_hook.FunctionHook):
+    """Function hook for estimating the memory used by a training step.
+
+    This hook records the functions and the link scopes of a forward
+    computation. After the forward computation, :meth:`analyze` walks the
+    computational graph from the outputs and estimates:
+
+    - the activation memory, i.e., the total size of the arrays retained by
+      the graph for backward (inputs and outputs retained by
+      :meth:`~chainer.FunctionNode.retain_inputs` and
+      :meth:`~chainer.FunctionNode.retain_outputs`, and arrays stored as
+      attributes of functions),
+    - the memory in use at each step of the backward computation (the
+      retained arrays that are still needed and the gradients alive at the
+      step) and its peak,
+    - the retained arrays per function and per link scope, and
+    - the link scopes that save the most memory if they are wrapped by
+      :func:`~chainer.functions.forget`.
+
+    The arrays of the inputs of the graph and the parameters are not counted
+    except for the gradients of the parameters. Temporary arrays allocated
+    inside each function are not counted either. The estimate of most models
+    is proportional to the batch size, so it can be extrapolated from a
+    forward computation with a small batch.
+
+    Example:
+        Code example::
+
+            from chainer.function_hooks import MemoryEstimationHook
+            hook = MemoryEstimationHook()
+            with hook:
+                loss = model(x, t)
+            hook.analyze(loss)
+            hook.print_report()
+
+    .. note::
+
+        Link scopes are tracked only when the hook is registered with the
+        ``with`` statement. Graphs of ChainerX arrays are not supported.
+
+    """
+
+    name = 'MemoryEstimationHook'
+
+    def __init__(self):
+        self._scope = ()
+        self._scopes = weakref.WeakKeyDictionary()
+        self._call_order = weakref.WeakKeyDictionary()
+        self._n_calls = 0
+        self._link_inputs = collections.OrderedDict()
+        self._link_hook = _link_scope.LinkScopeHook(self)
+        self._result = None
+
+    def __enter__(self):
+        super(MemoryEstimationHook, self).__enter__()
+        self._link_hook.__enter__()
+        return self
+
+    def __exit__(self, *_):
+        self._link_hook.__exit__()
+        super(MemoryEstimationHook, self).__exit__()
+
+    def _enter_link(self, args):
+        link = args.link
+        self._scope = self._scope + (link.name or link.__class__.__name__,)
+        nbytes = 0
+        for x in list(args.args) + list(args.kwargs.values()):
+            if isinstance(x, variable.Variable):
+                x = x.array
+            if isinstance(x, chainer.get_array_types()):
+                nbytes += x.nbytes
+        self._link_inputs[self._scope] = (
+            self._link_inputs.get(self._scope, 0) + nbytes)
+
+    def _exit_link(self):
+        self._scope = self._scope[:-1]
+
+    def forward_postprocess(self, function, in_data):
+        self._scopes[function] = self._scope
+        self._call_order[function] = self._n_calls
+        self._n_calls += 1
+
+    def analyze(self, outputs):
+        """Analyzes the computational graph of the given outputs.
+
+        Args:
+            outputs (~chainer.Variable or list of ~chainer.Variable): Outputs
+                of the forward computation to backpropagate from.
+
+        Returns:
+            dict: Dictionary of ``activation_memory`` and ``peak_memory`` in
+            bytes.
+
+        """
+        if isinstance(outputs, variable.Variable):
+            outputs = outputs,
+        array_types = chainer.get_array_types()
+
+        # Collect the functions and nodes in the graph.
+        funcs = []
+        seen = set()
+        consumers = collections.defaultdict(list)
+        nodes = collections.OrderedDict()
+        stack = []
+        for out in outputs:
+            nodes[id(out.node)] = out.node
+            if out.creator_node is not None:
+                stack.append(out.creator_node)
+        while stack:
+            func = stack.pop()
+            if id(func) in seen:
+                continue
+            seen.add(id(func))
+            funcs.append(func)
+            for node in func.inputs:
+                nodes[id(node)] = node
+                consumers[id(node)].append(func)
+                if node.creator_node is not None:
+                    stack.append(node.creator_node)
+
+        # Functions in the order of backward computation
+        funcs.sort(key=lambda f: (f.rank, self._call_order.get(f, -1)),
+                   reverse=True)
+        steps = {id(f): i for i, f in enumerate(funcs)}
+
+        # Each retained array is attributed to the function that retains it
+        # for the longest, and is alive until that function is backpropagated.
+        leaf_arrays = set()
+        for node in six.itervalues(nodes):
+            if node.creator_node is None:
+                var = node.get_variable_or_none()
+                if var is not None:
+                    leaf_arrays.add(id(var.array))
+        arrays = {}
+        for func in funcs:
+            step = steps[id(func)]
+            for array in _retained_arrays(func, array_types):
+                if id(array) not in leaf_arrays:
+                    arrays[id(array)] = (array.nbytes, step, func)
+        freed_at = numpy.zeros(len(funcs) + 1, numpy.int64)
+        retained_bytes = collections.defaultdict(int)
+        for nbytes, step, func in six.itervalues(arrays):
+            freed_at[step + 1] += nbytes
+            retained_bytes[id(func)] += nbytes
+        activation_memory = int(freed_at.sum())
+
+        # Gradients are alive from the backward of their first consumer to
+        # that of their creator, and those of leaves are kept to the end.
+        allocated_at = numpy.zeros(len(funcs) + 1, numpy.int64)
+        grad_freed_at = numpy.zeros(len(funcs) + 1, numpy.int64)
+        output_ids = set(id(out.node) for out in outputs)
+        for node_id, node in six.iteritems(nodes):
+            if not node.requires_grad:
+                continue
+            nbytes = _nbytes_of_node(node)
+            if node_id in output_ids:
+                start = 0
+            elif consumers[node_id]:
+                start = min(steps[id(f)] for f in consumers[node_id])
+            else:
+                continue
+            allocated_at[start] += nbytes
+            if node.creator_node is not None:
+                grad_freed_at[steps[id(node.creator_node)] + 1] += nbytes
+
+        memory = (activation_memory - numpy.cumsum(freed_at)[:-1] +
+                  numpy.cumsum(allocated_at)[:-1] -
+                  numpy.cumsum(grad_freed_at)[:-1])
+        timeline = []
+        for func, m in six.moves.zip(funcs, memory):
+            timeline.append({
+                'function': func.label,
+                'link': '/'.join(self._scopes.get(func, ())),
+                'memory': int(m),
+            })
+        peak_memory = max(
+            [activation_memory] + [t['memory'] for t in timeline])
+
+        self._result = {
+            'activation_memory': activation_memory,
+            'peak_memory': int(peak_memory),
+            'timeline': timeline,
+            'funcs': [(func, retained_bytes[id(func)])
+                      for func in reversed(funcs)],
+        }
+        return {'activation_memory': activation_memory,
+                'peak_memory': int(peak_memory)}
+
+    def _get_result(self):
+        if self._result is None:
+            raise RuntimeError('analyze has not been called')
+        return self._result
+
+    @property
+    def activation_memory(self):
+        """Total size of the arrays retained for backward in bytes."""
+        return self._get_result()['activation_memory']
+
+    @property
+    def peak_memory(self):
+        """Estimated peak memory through backward in bytes."""
+        return self._get_result()['peak_memory']
+
+    def timeline(self):
+        """Returns the memory in use at each step of backward.
+
+        Returns:
+            list of dicts: Each element corresponds to the backward of a
+            function in the order of backward computation, and has the
+            ``function`` label, the ``link`` scope and the ``memory`` in
+            bytes while it is computed.
+
+        """
+        return list(self._get_result()['timeline'])
+
+    def summary(self):
+        """Returns the retained memory per function.
+
+        Returns:
+            A summarized dictionary whose keys are the names of functions
+            prefixed by the path of the link scope, and values are
+            dictionaries of ``retained_bytes`` and ``occurrence``.
+
+        """
+        summary = collections.OrderedDict()
+        for func, nbytes in self._get_result()['funcs']:
+            key = '/'.join(self._scopes.get(func, ()) + (func.label,))
+            if key not in summary:
+                summary[key] = {'retained_bytes': 0, 'occurrence': 0}
+            record = summary[key]
+            record['retained_bytes'] += nbytes
+            record['occurrence'] += 1
+        return summary
+
+    def link_summary(self):
+        """Returns the retained memory per link scope.
+
+        Returns:
+            A summarized dictionary whose keys are the paths of link scopes
+            and values are dictionaries of ``retained_bytes`` (including the
+            sub-links) and ``input_bytes``.
+
+        """
+        summary = collections.OrderedDict()
+        for scope, input_bytes in six.iteritems(self._link_inputs):
+            summary[scope] = {'retained_bytes': 0, 'input_bytes': input_bytes}
+        for func, nbytes in self._get_result()['funcs']:
+            scope = self._scopes.get(func, ())
+            for i in six.moves.range(1, len(scope) + 1):
+                if scope[:i] in summary:
+                    summary[scope[:i]]['retained_bytes'] += nbytes
+        return collections.OrderedDict(
+            ('/'.join(scope), record)
+            for scope, record in six.iteritems(summary))
+
+    def suggest_forget_points(self, n=None):
+        """Suggests link scopes to wrap by :func:`~chainer.functions.forget`.
+
+        The memory saved by wrapping a link is estimated as its retained
+        memory minus the size of its inputs, which are retained instead.
+        Links nested in or enclosing an already suggested link are skipped.
+
+        Args:
+            n (int): Maximum number of the suggestions.
+
+        Returns:
+            list of tuples: Pairs of the path of a link scope and the
+            estimated memory saved in bytes, in the descending order of the
+            saving.
+
+        """
+        candidates = []
+        for path, record in six.iteritems(self.link_summary()):
+            saving = record['retained_bytes'] - record['input_bytes']
+            if saving > 0:
+                candidates.append((path, saving))
+        candidates.sort(key=lambda c: -c[1])
+
+        suggestions = []
+        for path, saving in candidates:
+            if any(path.startswith(p + '/') or p.startswith(path + '/')
+                   for p, _ in suggestions):
+                continue
+            suggestions.append((path, saving))
+            if n is not None and len(suggestions) >= n:
+                break
+        return suggestions
+
+    def print_report(self, file=sys.stdout):
+        """Prints a report of the estimated memory usage."""
+        result = self._get_result()
+        file.write('Activation memory: {} bytes\n'.format(
+            result['activation_memory']))
+        file.write('Peak memory: {} bytes\n'.format(result['peak_memory']))
+
+        entries = [['LinkName', 'Retained', 'Input']]
+        for path, record in six.iteritems(self.link_summary()):
+            entries.append([path, str(record['retained_bytes']),
+                            str(record['input_bytes'])])
+        if len(entries) > 1:
+            entry_widths = [max(len(entry[i]) for entry in entries)
+                            for i in range(3)]
+            template = '  '.join('{:>%d}' % w for w in entry_widths)
+            for entry in entries:
+                file.write(template.format(*entry))
+                file.write('\n')
+
+        for path, saving in self.suggest_forget_points():
+            file.write('Suggested forget point: {} (saves {} bytes)\n'.format(
+                path, saving))
+        if hasattr(file, 'flush'):
+            file.flush()
@@ -0,0 +1,346 @@
+import collections
+import os
+import random
+import sys
+import time
+import weakref
+
+from chainer import backend
+from chainer.backends import cuda
+from chainer import function_hook
+from chainer.function_hooks import _link_scope
+
+
+# Select the best-resolution timer function
+try:
+    _get_time = time.perf_counter
+except AttributeError:
+    if os.name == 'nt':
+        _get_time = time.clock
+    else:
+        _get_time = time.time
+
+
+class SamplingTimerHook(function_hook.FunctionHook):
+    """Function hook for low-overhead profiling of functions and links.
+
+    This is a variant of :class:`~chainer.function_hooks.TimerHook` for long
+    runs. Instead of keeping the history of all calls, it aggregates the
+    elapsed time in place per function type and per link scope in which the
+    function is called, so that the memory consumption does not grow over
+    time. Link scopes are tracked in the same way as
+    :class:`~chainer.link_hooks.TimerHook`, and functions called in backward
+    are attributed to the scope in which their forward was called. Functions
+    applied inside the backward of another function are not listed
+    separately, as their time is included in that backward.
+
+    The overhead can be reduced further by sampling. Only one of every
+    ``sampling_interval`` forward passes, i.e., calls of the outermost links,
+    is timed together with the following backward pass, and each call of a
+    function in the sampled passes is timed with the probability of
+    ``sampling_rate``. Calls that are not timed do not synchronize the
+    device.
+
+    Example:
+        Code example::
+
+            from chainer.function_hooks import SamplingTimerHook
+            hook = SamplingTimerHook(sampling_interval=10)
+            with hook:
+                trainer.run()
+            hook.print_report()
+
+        Output example::
+
+            Name                     Forward  Backward  Occurrence
+            Classifier                1.52ms    2.11ms         130
+              predictor               1.19ms    1.92ms         130
+                l1                    0.52ms    0.97ms         130
+                  LinearFunction      0.47ms    0.97ms         130
+                l2                    0.49ms    0.95ms         130
+                  LinearFunction      0.44ms    0.95ms         130
+                ReLU                  0.12ms    0.19ms         130
+              SoftmaxCrossEntropy     0.21ms    0.16ms         130
+              Accuracy                0.07ms    0.00ms         130
+
+        where rows are nested by indentation in the order of link scopes.
+        *Forward* of a link is the elapsed time of its ``forward`` method,
+        and *Backward* of a link is the total backward time of the functions
+        called in its scope.
+
+    .. note::
+
+        Link scopes are tracked only when the hook is registered with the
+        ``with`` statement.
+
+    Args:
+        sampling_interval (int): Interval of the forward passes to time.
+        sampling_rate (float): Probability to time each function call in the
+            sampled passes.
+        seed (int): Seed of the random number generator for the sampling.
+
+    """
+
+    name = 'SamplingTimerHook'
+    table = {'sec': 1, 'ms': 10 ** 3, 'us': 10 ** 6, 'ns': 10 ** 9}
+
+    def __init__(self, sampling_interval=1, sampling_rate=1.0, seed=None):
+        if sampling_interval < 1:
+            raise ValueError('sampling_interval must be positive')
+        if not 0 < sampling_rate <= 1:
+            raise ValueError('sampling_rate must be in (0, 1]')
+        self.sampling_interval = sampling_interval
+        self.sampling_rate = sampling_rate
+        self._random = random.Random(seed)
+
+        # (scope, function name) -> [forward count, forward time,
+        #                            backward count, backward time]
+        self._function_stats = collections.OrderedDict()
+        # scope -> [count, time]
+        self._link_stats = collections.OrderedDict()
+        self._total_time = 0
+        self._n_passes = 0
+        self._n_sampled_passes = 0
+
+        self._scope = ()
+        self._link_stack = []
+        self._running_stack = []
+        self._depth = 0
+        self._n_backward = 0
+        self._sampled = True
+        self._forward_scopes = weakref.WeakKeyDictionary()
+        self._link_hook = _link_scope.LinkScopeHook(self)
+
+    def __enter__(self):
+        super(SamplingTimerHook, self).__enter__()
+        self._link_hook.__enter__()
+        return self
+
+    def __exit__(self, *_):
+        self._link_hook.__exit__()
+        super(SamplingTimerHook, self).__exit__()
+
+    def _start(self, xp):
+        if xp is cuda.cupy:
+            start = cuda.Event()
+            stop = cuda.Event()
+            start.record()
+            return start, stop
+        return _get_time()
+
+    def _stop(self, start):
+        if isinstance(start, tuple):
+            start, stop = start
+            stop.record()
+            stop.synchronize()
+            # Note that `get_elapsed_time` returns result in milliseconds
+            return cuda.cupy.cuda.get_elapsed_time(start, stop) / 1000
+        return _get_time() - start
+
+    def _enter_link(self, args):
+        link = args.link
+        if not self._link_stack:
+            # A new forward pass starts.
+            self._sampled = self._n_passes % self.sampling_interval == 0
+            self._n_passes += 1
+            if self._sampled:
+                self._n_sampled_passes += 1
+        name = link.name or link.__class__.__name__
+        self._scope = self._scope + (name,)
+        if self._sampled:
+            if self._scope not in self._link_stats:
+                # Registered here to keep links in the order of calls.
+                self._link_stats[self._scope] = [0, 0.0]
+            start = self._start(link.xp)
+        else:
+            start = None
+        self._link_stack.append(start)
+
+    def _exit_link(self):
+        start = self._link_stack.pop()
+        if start is not None:
+            record = self._link_stats[self._scope]
+            record[0] += 1
+            record[1] += self._stop(start)
+        self._scope = self._scope[:-1]
+
+    def _preprocess(self, arrays):
+        if self._n_backward or not self._sampled or (
+                self.sampling_rate < 1 and
+                self._random.random() >= self.sampling_rate):
+            self._running_stack.append(None)
+            return
+        self._running_stack.append(
+            self._start(backend.get_array_module(*arrays)))
+        self._depth += 1
+
+    def _postprocess(self, key, index):
+        start = self._running_stack.pop()
+        if start is None:
+            return
+        elapsed_time = self._stop(start)
+        record = self._function_stats.get(key)
+        if record is None:
+            record = self._function_stats[key] = [0, 0.0, 0, 0.0]
+        record[index] += 1
+        record[index + 1] += elapsed_time
+
+        assert self._depth > 0
+        self._depth -= 1
+        if self._depth == 0:
+            self._total_time += elapsed_time
+
+    def forward_preprocess(self, function, in_data):
+        self._preprocess(in_data)
+
+    def forward_postprocess(self, function, in_data):
+        if self._scope and not self._n_backward:
+            self._forward_scopes[function] = self._scope
+        self._postprocess((self._scope, function._impl_name), 0)
+
+    def backward_preprocess(self, function, in_data, out_grad):
+        self._preprocess(in_data + out_grad)
+        # Functions called inside backward are not timed separately since
+        # their time is included in the backward time.
+        self._n_backward += 1
+
+    def backward_postprocess(self, function, in_data, out_grad):
+        self._n_backward -= 1
+        scope = self._forward_scopes.get(function, ())
+        self._postprocess((scope, function._impl_name), 2)
+
+    def total_time(self):
+        """Returns total elapsed time of the timed calls in seconds."""
+        return self._total_time
+
+    @property
+    def n_passes(self):
+        """Number of the forward passes, i.e., calls of the outermost links."""
+        return self._n_passes
+
+    @property
+    def n_sampled_passes(self):
+        """Number of the forward passes that are sampled."""
+        return self._n_sampled_passes
+
+    def summary(self):
+        """Returns a summary of time profiling in functions.
+
+        Returns:
+            A summarized dictionary whose keys are the names of functions
+            prefixed by the path of the link scope (e.g.,
+            ``'Classifier/predictor/l1/LinearFunction'``), and values are
+            dictionaries of ``forward_time``, ``forward_occurrence``,
+            ``backward_time`` and ``backward_occurrence``.
+
+        """
+        summary = collections.OrderedDict()
+        for (scope, name), record in self._function_stats.items():
+            summary['/'.join(scope + (name,))] = {
+                'forward_occurrence': record[0],
+                'forward_time': record[1],
+                'backward_occurrence': record[2],
+                'backward_time': record[3],
+            }
+        return summary
+
+    def link_summary(self):
+        """Returns a summary of time profiling in links.
+
+        Returns:
+            A summarized dictionary whose keys are the paths of link scopes
+            and values are dictionaries of ``elapsed_time`` and
+            ``occurrence``.
+
+        """
+        summary = collections.OrderedDict()
+        for scope, (occurrence, elapsed_time) in self._link_stats.items():
+            summary['/'.join(scope)] = {
+                'elapsed_time': elapsed_time, 'occurrence': occurrence}
+        return summary
+
+    def _tree_rows(self):
+        # Builds rows of (depth, name, forward, backward, occurrence) in the
+        # order of the link scopes.
+        children = collections.OrderedDict()
+        children[()] = []
+        backward_times = collections.defaultdict(float)
+
+        def add_scope(scope):
+            if scope not in children:
+                add_scope(scope[:-1])
+                children[scope] = []
+                children[scope[:-1]].append(('link', scope))
+
+        for scope in self._link_stats:
+            add_scope(scope)
+        for key, record in self._function_stats.items():
+            scope = key[0]
+            add_scope(scope)
+            children[scope].append(('function', key))
+            for i in range(len(scope) + 1):
+                backward_times[scope[:i]] += record[3]
+
+        rows = []
+
+        def visit(scope, depth):
+            for kind, key in children[scope]:
+                if kind == 'link':
+                    count, elapsed_time = self._link_stats.get(key, (0, 0.0))
+                    rows.append((depth, key[-1], elapsed_time,
+                                 backward_times[key], count))
+                    visit(key, depth + 1)
+                else:
+                    record = self._function_stats[key]
+                    rows.append((depth, key[1], record[1], record[3],
+                                 max(record[0], record[2])))
+
+        visit((), 0)
+        return rows
+
+    def _choose_unit(self, second):
+        """Choose optimal unit."""
+        factor = 1
+        for unit in ['sec', 'ms', 'us']:
+            if second * factor >= 1:
+                return factor, unit
+            factor *= 1000.0
+        return factor, 'ns'
+
+    def print_report(self, unit='auto', file=sys.stdout):
+        """Prints a hierarchical report of time profiling.
+
+        Args:
+            unit (str): Supplementary units used for computational times.
+                `sec`, `ms`, `us`, `ns`, `auto`(default) and `auto_foreach`
+                are supported. If `auto`, units of times are aligned to the
+                largest, and if `auto_foreach`, units of times are adjusted for
+                each element.
+        """
+        rows = self._tree_rows()
+        entries = [['Name', 'Forward', 'Backward', 'Occurrence']]
+        auto_foreach = (unit == 'auto_foreach')
+        if unit == 'auto':
+            max_time = max([max(f, b) for _, _, f, b, _ in rows] or [0])
+            factor, unit = self._choose_unit(max_time)
+        elif not auto_foreach:
+            factor = self.table[unit]
+        for depth, name, forward, backward, occurrence in rows:
+            times = []
+            for second in (forward, backward):
+                if auto_foreach:
+                    factor, unit = self._choose_unit(second)
+                times.append('%3.2f%s' % (second * factor, unit))
+            entries.append(
+                ['  ' * depth + name, times[0], times[1], str(occurrence)])
+        entry_widths = [max(len(entry[i]) for entry in entries)
+                        for i in range(4)]
+        name_template = '{:<%d}' % entry_widths[0]
+        template = '  '.join('{:>%d}' % w for w in entry_widths[1:])
+        for name, forward, backward, occurrence in entries:
+            file.write(name_template.format(name))
+            file.write('  ')
+            file.write(template.format(forward, backward, occurrence))
+            file.write('\n')
+        if hasattr(file, 'flush'):
+            file.flush()
@@ -226,6 +226,7 @@ from chainer.functions.pooling.unpooling_nd import unpooling_3d  # NOQA
 from chainer.functions.pooling.unpooling_nd import unpooling_nd  # NOQA
 from chainer.functions.pooling.upsampling_2d import upsampling_2d  # NOQA
 
+from chainer.functions.util.forget import checkpoint_sequential  # NOQA
 from chainer.functions.util.forget import forget  # NOQA
 
 # Aliases
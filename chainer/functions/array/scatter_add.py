@@ -4,6 +4,7 @@ import chainer
 from chainer import backend
 from chainer.backends import cuda
 from chainer import function_node
+from chainer import utils
 from chainer.utils import type_check
 import chainerx
 
@@ -47,7 +48,7 @@ class ScatterAdd(function_node.FunctionNode):
                 'Chainer does not support automatic broadcasting '
                 'of variables.')
         if xp is numpy:
-            numpy.add.at(y, slices, b),
+            utils.add_at(y, slices, b)
         else:
             cuda.cupyx.scatter_add(y, slices, b),
         return y,
@@ -1,5 +1,3 @@
-import numpy
-
 import chainer
 from chainer.backends import cuda
 from chainer.backends import intel64
@@ -142,11 +140,10 @@ class Deconvolution2DFunction(function_node.FunctionNode):
         if self._use_ideep:
             return self._forward_ideep(x, W, b)
 
-        gcol = numpy.tensordot(W, x, (0, 1)).astype(x.dtype, copy=False)
-        gcol = numpy.rollaxis(gcol, 3)
-        y = conv.col2im_cpu(
-            gcol, self.sy, self.sx, self.ph, self.pw, self.outh, self.outw,
-            dy=self.dy, dx=self.dx)
+        y = conv.convolution_backward_data_cpu(
+            x, W, (self.sy, self.sx), (self.ph, self.pw),
+            (self.outh, self.outw), (self.dy, self.dx)
+        ).astype(x.dtype, copy=False)
         # b, k, h, w
         if b is not None:
             y += b.reshape((1, b.size, 1, 1))
@@ -1,18 +1,19 @@
 import numpy
-import six
 
 import chainer
 from chainer import backend
 from chainer.backends import cuda
 from chainer import function_node
 from chainer import utils
+from chainer.utils import argument
 from chainer.utils import type_check
 
 
 class EmbedIDFunction(function_node.FunctionNode):
 
-    def __init__(self, ignore_label=None):
+    def __init__(self, ignore_label=None, sparse_grad=False):
         self.ignore_label = ignore_label
+        self.sparse_grad = sparse_grad
 
     def check_type_forward(self, in_types):
         type_check.expect(in_types.size() == 2)
@@ -48,8 +49,15 @@ class EmbedIDFunction(function_node.FunctionNode):
 
     def backward(self, indexes, grad_outputs):
         inputs = self.get_retained_inputs()
-        gW = EmbedIDGrad(
-            self._w_shape, self.ignore_label).apply(inputs + grad_outputs)[0]
+        grad = EmbedIDGrad(self._w_shape, self.ignore_label)
+        # The row-sparse gradient is not differentiable, so the dense one is
+        # computed if double backprop is enabled.
+        if (self.sparse_grad and not chainer.config.enable_backprop
+                and backend.get_array_module(inputs[0]) is numpy):
+            gW = grad.forward_sparse(inputs[0].array, grad_outputs[0].array)
+            return None, chainer.Variable._init_unchecked(
+                gW, requires_grad=False)
+        gW = grad.apply(inputs + grad_outputs)[0]
         return None, gW
 
 
@@ -69,11 +77,7 @@ class EmbedIDGrad(function_node.FunctionNode):
         if xp is numpy:
             # It is equivalent to `numpy.add.at(gW, x, gy)` but ufunc.at is
             # too slow.
-            for ix, igy in six.moves.zip(x.ravel(),
-                                         gy.reshape(x.size, -1)):
-                if ix == self.ignore_label:
-                    continue
-                gW[ix] += igy
+            utils.scatter_add_rows(gW, x, gy, self.ignore_label)
         else:
             utils.nondeterministic('atomicAdd')
             if self.ignore_label is None:
@@ -97,6 +101,13 @@ class EmbedIDGrad(function_node.FunctionNode):
                         self.ignore_label, gW)
         return gW,
 
+    def forward_sparse(self, x, gy):
+        # Computes the gradient as a row-sparse array without materializing
+        # the dense one.
+        indices, values = utils.segment_sum_rows(
+            x, gy, self.ignore_label)
+        return utils.RowSparseArray(indices, values, self.w_shape)
+
     def backward(self, indexes, grads):
         xp = backend.get_array_module(*grads)
         x = self.get_retained_inputs()[0].data
@@ -118,8 +129,10 @@ class EmbedIDGrad(function_node.FunctionNode):
         return None, ggy
 
 
-def embed_id(x, W, ignore_label=None):
-    """Efficient linear function for one-hot input.
+def embed_id(x, W, ignore_label=None, **kwargs):
+    """embed_id(x, W, ignore_label=None, *, sparse_grad=False)
+
+    Efficient linear function for one-hot input.
 
     This function implements so called *word embeddings*. It takes two
     arguments: a set of IDs (words) ``x`` in :math:`B` dimensional integer
@@ -137,6 +150,11 @@ def embed_id(x, W, ignore_label=None):
         ignore_label (:class:`int` or :class:`None`):
             If ``ignore_label`` is an int value, ``i``-th row of return
             value is filled with ``0``.
+        sparse_grad (bool): If ``True``, the gradient of ``W`` is computed
+            as a :class:`~chainer.utils.RowSparseArray` that only holds the
+            rows of the given IDs, so that optimizers only update these rows.
+            It is only supported on CPU and without double backprop;
+            otherwise, the dense gradient is computed.
 
     Returns:
         ~chainer.Variable: Output variable.
@@ -165,4 +183,9 @@ def embed_id(x, W, ignore_label=None):
                [0., 0., 0.]], dtype=float32)
 
     """
-    return EmbedIDFunction(ignore_label=ignore_label).apply((x, W))[0]
+    sparse_grad = False
+    if kwargs:
+        sparse_grad, = argument.parse_kwargs(
+            kwargs, ('sparse_grad', sparse_grad))
+    return EmbedIDFunction(
+        ignore_label=ignore_label, sparse_grad=sparse_grad).apply((x, W))[0]
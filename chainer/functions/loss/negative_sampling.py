@@ -20,7 +20,8 @@ class NegativeSamplingFunction(function_node.FunctionNode):
     ignore_label = -1
     samples = None
 
-    def __init__(self, sampler, sample_size, reduce='sum'):
+    def __init__(self, sampler, sample_size, reduce='sum',
+                 deterministic=False):
         if reduce not in ('sum', 'no'):
             raise ValueError(
                 'only \'sum\' and \'no\' are valid for \'reduce\', but \'%s\' '
@@ -29,6 +30,7 @@ class NegativeSamplingFunction(function_node.FunctionNode):
         self.sampler = sampler
         self.sample_size = sample_size
         self.reduce = reduce
+        self.deterministic = deterministic
         self.wx = None
 
     def _make_samples(self, t):
@@ -132,50 +134,57 @@ class NegativeSamplingFunction(function_node.FunctionNode):
         gy, = grad_outputs
         return NegativeSamplingFunctionGrad(
             self.reduce, self.ignore_mask, self.sample_size, self.samples,
-            self.wx).apply((x, W, gy))
+            self.wx, self.deterministic).apply((x, W, gy))
 
 
 class NegativeSamplingFunctionGrad(function_node.FunctionNode):
 
-    def __init__(self, reduce, ignore_mask, sample_size, samples, wx):
+    def __init__(self, reduce, ignore_mask, sample_size, samples, wx,
+                 deterministic=False):
         self.reduce = reduce
         self.ignore_mask = ignore_mask
         self.sample_size = sample_size
         self.samples = samples
         self.wx = wx
+        self.deterministic = deterministic
 
     def forward_cpu(self, inputs):
         self.retain_inputs((0, 1, 2))
         x, W, gloss = inputs
 
-        samples = self.samples
-        gx = numpy.zeros_like(x)
-        gW = numpy.zeros_like(W)
-
-        for i in numpy.arange(len(self.ignore_mask))[self.ignore_mask]:
-            ix = x[i]
+        mask = self.ignore_mask
+        samples = self.samples[mask]
+        ix = x[mask]
+        if self.reduce == 'sum':
+            igy = gloss
+        else:
+            igy = gloss[mask][:, None]
 
-            k = samples[i]
-            if self.reduce == 'sum':
-                igy = gloss
-            else:
-                igy = gloss[i]
+        w = W[samples]
+        f = numpy.einsum('ij,ikj->ik', ix, w)
 
-            w = W[k]
-            f = w.dot(ix)
+        # g == -y * gloss / (1 + exp(yf))
+        f[:, 0] *= -1
+        g = igy / (1 + numpy.exp(-f))
+        g[:, 0] *= -1
 
-            # g == -y * gloss / (1 + exp(yf))
-            f[0] *= -1
-            g = igy / (1 + numpy.exp(-f))
-            g[0] *= -1
+        gx = numpy.zeros_like(x)
+        gx[mask] = numpy.einsum('ik,ikj->ij', g, w)
 
-            gx[i] = g.dot(w)
-            for ik, ig in six.moves.zip(k, g):
-                gW[ik] += ig * ix
+        gW = numpy.zeros_like(W)
+        if samples.size == 0:
+            return gx, None, gW
+
+        # Sort the samples stably so that the gradients of each row of ``W``
+        # form a segment, summed in the order of the samples.
+        samples = samples.ravel()
+        order = numpy.argsort(samples, kind='mergesort')
+        rows, starts = numpy.unique(samples[order], return_index=True)
+        gw = (g[:, :, None] * ix[:, None, :]).reshape(-1, x.shape[1])
+        gW[rows] = numpy.add.reduceat(gw[order], starts)
         return gx, None, gW
 
     def forward_gpu(self, inputs):
-        utils.nondeterministic('atomicAdd')
         self.retain_inputs((0, 1, 2))
         x, W, gy = inputs
 
@@ -219,6 +228,11 @@ class NegativeSamplingFunctionGrad(function_node.FunctionNode):
           self.sample_size + 1, gx)
 
         gW = cupy.zeros_like(W)
+        if self.deterministic:
+            self._accumulate_gW_sorted(g, x, gW)
+            return gx, None, gW
+
+        utils.nondeterministic('atomicAdd')
         cuda.elementwise(
             'T g, raw T x, S k, bool mask, int32 c, int32 m',
             'raw T gW',
@@ -235,6 +249,43 @@ class NegativeSamplingFunctionGrad(function_node.FunctionNode):
           self.sample_size + 1, gW)
         return gx, None, gW
 
+    def _accumulate_gW_sorted(self, g, x, gW):
+        # Each row of ``gW`` sums its segment of the sorted samples in order
+        # instead of using atomicAdd, so the result does not depend on the
+        # scheduling of threads.
+        cupy = cuda.cupy
+        samples = self.samples.ravel()
+        if samples.size == 0:
+            return
+        order = cupy.argsort(samples)
+        sorted_samples = samples[order]
+        bounds = cupy.concatenate((
+            cupy.zeros(1, numpy.int64),
+            cupy.nonzero(sorted_samples[1:] != sorted_samples[:-1])[0] + 1,
+            cupy.full(1, samples.size, numpy.int64)))
+        rows = sorted_samples[bounds[:-1]]
+
+        n_in = x.shape[1]
+        cuda.elementwise(
+            'raw T g, raw T x, raw I order, raw I bounds, raw S rows, '
+            'raw bool mask, int32 c, int32 m',
+            'raw T gW',
+            '''
+            int u = i / c;
+            int j = i % c;
+            T w = 0;
+            for (I p = bounds[u]; p < bounds[u + 1]; ++p) {
+                I k = order[p];
+                if (mask[k / m]) {
+                    w += g[k] * x[(k / m) * c + j];
+                }
+            }
+            gW[rows[u] * c + j] = w;
+            ''',
+            'negative_sampling_calculate_gw_sorted'
+        )(g, x, order, bounds, rows, self.ignore_mask,
+          n_in, self.sample_size + 1, gW, size=len(rows) * n_in)
+
     def backward(self, indexes, grad_outputs):
         x, W, gy = self.get_retained_inputs()
 
@@ -327,7 +378,7 @@ class NegativeSamplingFunctionGrad(function_node.FunctionNode):
 
 def negative_sampling(x, t, W, sampler, sample_size, reduce='sum', **kwargs):
     """negative_sampling(x, t, W, sampler, sample_size, reduce='sum', *, \
-return_samples=False)
+return_samples=False, deterministic=False)
 
     Negative sampling loss function.
 
@@ -382,6 +433,11 @@ return_samples=False)
             :math:`(\\text{batch_size}, \\text{sample_size} + 1)`-array of
             integers whose first column is fixed to the ground truth labels
             and the other columns are drawn from the ``sampler``.
+        deterministic (bool):
+            If ``True``, the gradient of ``W`` is accumulated in a fixed
+            order on GPU as well, by sorting the samples instead of using
+            atomic additions, which is slower. The CPU implementation always
+            sums the gradients of each row in the order of the samples.
 
     Returns:
         ~chainer.Variable or tuple:
@@ -404,11 +460,14 @@ return_samples=False)
 
     """
     return_samples = False
+    deterministic = False
     if kwargs:
-        return_samples, = argument.parse_kwargs(
-            kwargs, ('return_samples', return_samples))
+        return_samples, deterministic = argument.parse_kwargs(
+            kwargs, ('return_samples', return_samples),
+            ('deterministic', deterministic))
 
-    func = NegativeSamplingFunction(sampler, sample_size, reduce)
+    func = NegativeSamplingFunction(
+        sampler, sample_size, reduce, deterministic)
     out = func.apply((x, t, W))[0]
 
     if return_samples:
@@ -1,5 +1,3 @@
-import numpy
-
 import chainer
 from chainer import backend
 from chainer.backends import cuda
@@ -24,10 +22,11 @@ class AveragePooling2D(pooling_2d.Pooling2D):
         self._in_shape = x[0].shape
         self._in_dtype = x[0].dtype
 
-        col = conv.im2col_cpu(x[0], self.kh, self.kw, self.sy, self.sx,
-                              self.ph, self.pw)
-        y = col.mean(axis=(2, 3))
-        return y,
+        y = conv.average_pooling_forward_cpu(
+            x[0], (self.kh, self.kw), (self.sy, self.sx), (self.ph, self.pw),
+            False)
+        y /= self.kh * self.kw
+        return y.astype(x[0].dtype, copy=False),
 
     def _forward_ideep(self, x):
         self._in_shape = x[0].shape
@@ -120,10 +119,9 @@ class AveragePooling2DGrad(function_node.FunctionNode):
                 and intel64.inputs_all_ready(gy)):
             return self._forward_ideep(gy)
 
-        h, w = self._in_shape[2:]
-        gcol = numpy.tile(gy[0][:, :, None, None],
-                          (1, 1, self.kh, self.kw, 1, 1))
-        gx = conv.col2im_cpu(gcol, self.sy, self.sx, self.ph, self.pw, h, w)
+        gx = conv.average_pooling_backward_cpu(
+            gy[0], (self.kh, self.kw), (self.sy, self.sx), (self.ph, self.pw),
+            self._in_shape[2:])
         gx /= self.kh * self.kw
         return gx,
 
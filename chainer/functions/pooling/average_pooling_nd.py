@@ -11,7 +11,6 @@ from chainer import function_node
 from chainer.functions.pooling import average_pooling_nd_kernel
 from chainer.functions.pooling import pooling_nd
 from chainer.utils import conv
-from chainer.utils import conv_nd
 import chainerx
 
 
@@ -95,21 +94,18 @@ class AveragePoolingND(pooling_nd._PoolingND):
         self._in_shape = x.shape
         self._in_dtype = x.dtype
 
-        col = conv_nd.im2col_nd_cpu(
-            x, self.ksize, self.stride, self.pad, cover_all=self.cover_all)
-
-        # mean along (_, _, k_1, k_2, ..., k_N, _, ..., _)
-        y_axis = tuple(six.moves.range(2, 2 + len(self.ksize)))
+        y = conv.average_pooling_forward_cpu(
+            x, self.ksize, self.stride, self.pad, self.cover_all)
         if self.pad_value is None:
             dims = x.shape[2:]
             width = self._get_pooling_width(numpy, dims, x.dtype)
-            y = col.sum(axis=y_axis) / width
+            y /= width
             self.width = width
         else:
             assert self.pad_value == 0
-            y = col.mean(axis=y_axis)
+            y /= functools.reduce(operator.mul, self.ksize)
 
-        return y,
+        return y.astype(x.dtype, copy=False),
 
     def forward_gpu(self, inputs):
         if chainer.should_use_cudnn('>=auto') and 2 <= self.ndim <= 3:
@@ -178,16 +174,12 @@ class AveragePoolingNDGrad(function_node.FunctionNode):
     def forward_cpu(self, gys):
         gy, = gys
         idims = self._in_shape[2:]
-        odims = gy.shape[2:]
-        colon = slice(None, None, None)
         is_pad_value_none = self.pad_value is None
         if is_pad_value_none:
             width = self.apoolnd.width
             numpy.divide(gy, width, out=gy)
-        gy_index = (colon, colon) + (None,) * len(idims)
-        gcol_reps = (1, 1) + self.ksize + (1,) * len(odims)
-        gcol = numpy.tile(gy[gy_index], gcol_reps)
-        gx = conv_nd.col2im_nd_cpu(gcol, self.stride, self.pad, idims)
+        gx = conv.average_pooling_backward_cpu(
+            gy, self.ksize, self.stride, self.pad, idims)
         if not is_pad_value_none:
             gx /= functools.reduce(operator.mul, self.ksize)
         return gx,
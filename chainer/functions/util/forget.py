@@ -1,6 +1,13 @@
+import math
+import weakref
+
+import numpy
+import six
+
 import chainer
 from chainer import function
 from chainer import function_node
+from chainer.utils import argument
 from chainer import variable
 
 
@@ -154,3 +161,177 @@ def forget(func, *xs):
     if len(y) == 1:
         y, = y
     return y
+
+
+# Output sizes of the layers measured by probing, cached per link and input
+# signature so that structurally repeated iterations do not probe again.
+_output_sizes_cache = weakref.WeakKeyDictionary()
+
+
+def _apply_layers(layers, xs):
+    for layer in layers:
+        if isinstance(xs, tuple):
+            xs = layer(*xs)
+        else:
+            xs = layer(xs)
+    return xs
+
+
+class _SegmentFunction(object):
+
+    def __init__(self, layers):
+        self.layers = layers
+
+    def __call__(self, *xs):
+        return _apply_layers(self.layers, xs)
+
+
+def _nbytes(xs):
+    if not isinstance(xs, tuple):
+        xs = xs,
+    return sum(x.array.nbytes if isinstance(x, variable.Variable)
+               else x.nbytes for x in xs)
+
+
+def _get_output_sizes(layers, xs):
+    key = tuple((x.shape, x.dtype) for x in xs)
+    cache = None
+    if isinstance(layers, chainer.Link):
+        cache = _output_sizes_cache.setdefault(layers, {})
+        if key in cache:
+            return cache[key]
+
+    # Probe the output sizes without building a graph. The recomputation
+    # flag keeps links from updating their statistics twice.
+    sizes = []
+    with function.no_backprop_mode(), \
+            chainer.using_config('in_recomputing', True):
+        h = xs
+        for layer in layers:
+            h = _apply_layers((layer,), h)
+            sizes.append(_nbytes(h))
+    if cache is not None:
+        cache[key] = sizes
+    return sizes
+
+
+def _split_by_count(n_layers, n_segments):
+    bounds = numpy.linspace(0, n_layers, n_segments + 1).round()
+    return [(int(b), int(e)) for b, e in zip(bounds[:-1], bounds[1:])
+            if b < e]
+
+
+def _split_by_size(sizes, n_segments):
+    # Splits the layers so that each segment holds about the same amount of
+    # activations.
+    cumsum = numpy.cumsum(sizes)
+    thresholds = cumsum[-1] * numpy.arange(1, n_segments) / n_segments
+    ends = numpy.searchsorted(cumsum, thresholds) + 1
+    bounds = sorted(set([0] + [int(e) for e in ends] + [len(sizes)]))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _estimate_peak(sizes, segments):
+    # The outputs of all segments but the last are retained by ``Forget``
+    # until backward, and the activations of one segment are alive at once
+    # while it is recomputed.
+    retained = sum(sizes[e - 1] for _, e in segments[:-1])
+    return retained + max(sum(sizes[b:e]) for b, e in segments)
+
+
+def _plan_segments(sizes, memory_budget):
+    if sum(sizes) <= memory_budget:
+        return None
+    best = None
+    for n_segments in six.moves.range(1, len(sizes) + 1):
+        segments = _split_by_size(sizes, n_segments)
+        peak = _estimate_peak(sizes, segments)
+        if peak <= memory_budget:
+            return segments
+        if best is None or peak < best[0]:
+            best = peak, segments
+    return best[1]
+
+
+def checkpoint_sequential(layers, *xs, **kwargs):
+    """checkpoint_sequential(layers, *xs, *, n_segments=None, \
+memory_budget=None)
+
+    Calls a sequence of layers with automatic recomputation.
+
+    This function splits ``layers`` into consecutive segments and calls each
+    segment through :func:`~chainer.functions.forget`, so that only the
+    outputs of the segments are kept for backpropagation. The intermediate
+    results inside a segment are recomputed on backward, one segment at a
+    time.
+
+    The segments are chosen in one of the following ways.
+
+    - If ``memory_budget`` is given, the output size of every layer is
+      measured by a forward computation without a computational graph, and
+      the fewest segments whose estimated peak activation memory fits in the
+      budget are used. Each segment holds about the same amount of
+      activations. If all the activations fit in the budget, the layers are
+      called as usual without recomputation. For a :class:`~chainer.Link`
+      such as :class:`~chainer.Sequential`, the measured sizes are cached
+      per shapes and dtypes of the inputs.
+    - If ``n_segments`` is given, the layers are split into that many
+      segments of about the same number of layers.
+    - Otherwise, the layers are split into :math:`\\lceil\\sqrt{N}\\rceil`
+      segments, where :math:`N` is the number of layers, which bounds the
+      activation memory by :math:`O(\\sqrt{N})` layers.
+
+    The same restrictions as :func:`~chainer.functions.forget` apply to the
+    layers.
+
+    .. admonition:: Example
+
+       >>> model = chainer.Sequential(
+       ...     L.Linear(3, 4), F.relu, L.Linear(4, 4), F.relu, L.Linear(4, 2))
+       >>> x = np.random.uniform(-1, 1, (2, 3)).astype(np.float32)
+       >>> y = F.checkpoint_sequential(model, x)
+       >>> y.shape
+       (2, 2)
+
+    Args:
+        layers: A sequence of callables, e.g., :class:`~chainer.Sequential`,
+            :class:`~chainer.ChainList` or a list. The outputs of each layer
+            are fed to the next layer as in :class:`~chainer.Sequential`.
+        xs (:class:`tuple` of :class:`~chainer.Variable` or :ref:`ndarray`):
+            Argument variables of the first layer.
+        n_segments (int): Number of the segments.
+        memory_budget (int): Budget of the activation memory in bytes.
+
+    Returns:
+        The outputs of the last layer.
+
+    """
+    n_segments, memory_budget = argument.parse_kwargs(
+        kwargs, ('n_segments', None), ('memory_budget', None))
+    if n_segments is not None and memory_budget is not None:
+        raise ValueError(
+            'n_segments and memory_budget cannot be given at the same time')
+
+    layer_list = list(layers)
+    if not layer_list:
+        raise ValueError('layers must not be empty')
+
+    if memory_budget is not None:
+        segments = _plan_segments(
+            _get_output_sizes(layers, xs), memory_budget)
+        if segments is None:
+            return _apply_layers(layer_list, xs)
+    else:
+        if n_segments is None:
+            n_segments = int(math.ceil(math.sqrt(len(layer_list))))
+        if n_segments <= 0:
+            raise ValueError('n_segments must be positive')
+        segments = _split_by_count(
+            len(layer_list), min(n_segments, len(layer_list)))
+
+    h = xs
+    for begin, end in segments:
+        if not isinstance(h, tuple):
+            h = h,
+        h = forget(_SegmentFunction(layer_list[begin:end]), *h)
+    return h
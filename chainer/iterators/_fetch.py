@@ -0,0 +1,9 @@
+from chainer.dataset import dataset_mixin
+
+
+def get_examples(dataset, indices):
+    # Returns a list of the examples of `indices`.
+    # Datasets based on DatasetMixin can read the examples at once.
+    if isinstance(dataset, dataset_mixin.DatasetMixin):
+        return dataset[indices]
+    return [dataset[index] for index in indices]
@@ -10,7 +10,9 @@ import warnings
 import numpy
 import six
 
+from chainer.dataset import dataset_mixin
 from chainer.dataset import iterator
+from chainer.iterators import _fetch
 from chainer.iterators import _statemachine
 from chainer.iterators.order_samplers import ShuffleOrderSampler
 
@@ -89,6 +91,28 @@ class MultiprocessIterator(iterator.Iterator):
             can complete before it will exit and be replaced with a fresh
             worker process, to enable unused resources to be freed. If
             ``None``, worker processes will live as long as the pool.
+        zero_copy (bool): If ``True``, arrays in a batch are returned as views
+            of the shared memory into which the worker processes wrote them,
+            instead of being copied out of it. A ring of
+            ``n_prefetch + 2`` shared memory slots is allocated, and the
+            slot of a batch is reused after the next call of ``__next__``.
+            Therefore, the arrays of a batch are valid only until the next
+            batch is requested; copy them if you need to keep them longer.
+        collate (callable): A function that converts a list of examples into
+            a batch, e.g., :func:`~chainer.dataset.concat_examples` without
+            device transfer. If it is given, each batch is collated by a
+            worker process and written to the shared memory, and the iterator
+            returns the collated batch instead of a list of examples. Use a
+            converter that does not concatenate examples, e.g.,
+            :func:`~chainer.dataset.transfer_collated`, for such batches.
+            With the default ``fork`` start method of :mod:`multiprocessing`,
+            the function does not need to be picklable.
+
+    .. note::
+
+            When an example does not fit in the shared memory, it is sent to
+            the main process by pickle, and the shared memory is enlarged for
+            the following batches.
 
     """
 
@@ -103,7 +127,7 @@ class MultiprocessIterator(iterator.Iterator):
     def __init__(self, dataset, batch_size, repeat=True, shuffle=None,
                  n_processes=None, n_prefetch=1, shared_mem=None,
                  order_sampler=None, dataset_timeout=30.0,
-                 maxtasksperchild=None):
+                 maxtasksperchild=None, zero_copy=False, collate=None):
         self.dataset = dataset
         self.batch_size = batch_size
         self.repeat = repeat
@@ -113,6 +137,8 @@ class MultiprocessIterator(iterator.Iterator):
         self.shared_mem = shared_mem
         self.dataset_timeout = dataset_timeout
         self._maxtasksperchild = maxtasksperchild
+        self.zero_copy = zero_copy
+        self.collate = collate
 
         if self.shuffle is not None:
             if order_sampler is not None:
@@ -138,7 +164,8 @@ class MultiprocessIterator(iterator.Iterator):
             self.dataset, self.batch_size, self.repeat,
             self.n_processes, self.n_prefetch, self.shared_mem,
             self._comm, self.order_sampler,
-            self._interruption_testing, self._maxtasksperchild)
+            self._interruption_testing, self._maxtasksperchild,
+            self.zero_copy, self.collate)
         # defer launching prefetch thread until creating the worker pool,
         # not to leave a background thread in forked processes.
 
@@ -184,7 +211,8 @@ class MultiprocessIterator(iterator.Iterator):
         other = MultiprocessIterator(
             self.dataset, self.batch_size, self.repeat, shuffle=None,
             n_processes=self.n_processes, n_prefetch=self.n_prefetch,
-            shared_mem=self.shared_mem, order_sampler=self.order_sampler)
+            shared_mem=self.shared_mem, order_sampler=self.order_sampler,
+            zero_copy=self.zero_copy, collate=self.collate)
 
         other._reset_state(self.current_position, self.epoch,
                            self.is_new_epoch, self._state.order)
@@ -315,6 +343,12 @@ class _Communicator(object):
         self._status = _Communicator.STATUS_CONTINUE
         self._reset_count = 0
 
+        # Shared memory slots that are not used by any batch
+        self._slot_cond = threading.Condition(self._lock)
+        self._slot_generation = 0
+        self._free_slots = []
+        self._held_slot = None
+
     @property
     def is_terminated(self):
         with self._lock:
@@ -331,8 +365,11 @@ class _Communicator(object):
                         and dt > datetime.timedelta(
                             seconds=self.dataset_timeout)):
                     _raise_timeout_warning()
-            batch, prefetch_state = self._batch_queue.pop(0)
+            batch, prefetch_state, slot = self._batch_queue.pop(0)
             self._not_full_cond.notify()
+            # The previous batch is no longer used by the iterator
+            self._release_slot(self._held_slot)
+            self._held_slot = slot
             return batch, prefetch_state
 
     # called from iterator
@@ -340,7 +377,7 @@ class _Communicator(object):
         with self._lock:
             self._status = _Communicator.STATUS_RESET
             self._prefetch_state = prefetch_state
-            self._batch_queue = []
+            self._clear_batch_queue()
             self._not_full_cond.notify()
             self._reset_count += 1
 
@@ -348,7 +385,7 @@ class _Communicator(object):
     def terminate(self):
         with self._lock:
             self._status = _Communicator.STATUS_TERMINATE
-            self._batch_queue = []
+            self._clear_batch_queue()
             self._not_full_cond.notify()
             self._reset_count += 1
 
@@ -363,13 +400,49 @@ class _Communicator(object):
             return status, prefetch_state, self._reset_count
 
     # called from thread
-    def put(self, batch, prefetch_state, reset_count):
+    def put(self, batch, prefetch_state, reset_count, slot=None):
         with self._lock:
             if len(self._batch_queue) == self.n_prefetch:
                 self._not_full_cond.wait()
             if reset_count == self._reset_count:
-                self._batch_queue.append((batch, prefetch_state))
+                self._batch_queue.append((batch, prefetch_state, slot))
                 self._not_empty_cond.notify()
+            else:
+                self._release_slot(slot)
+
+    # called from thread
+    def set_slots(self, generation, n_slots):
+        # Slots are tuples of (generation, index). The slots of an older
+        # generation are discarded when they are released.
+        with self._lock:
+            self._slot_generation = generation
+            self._free_slots = [(generation, i) for i in range(n_slots)]
+            self._slot_cond.notify_all()
+
+    # called from thread
+    def acquire_slot(self):
+        # Returns None if the iterator is terminated while waiting.
+        with self._lock:
+            while not self._free_slots:
+                if self._status == _Communicator.STATUS_TERMINATE:
+                    return None
+                self._slot_cond.wait(_response_time)
+            return self._free_slots.pop(0)
+
+    # called from thread
+    def release_slot(self, slot):
+        with self._lock:
+            self._release_slot(slot)
+
+    def _release_slot(self, slot):
+        if slot is not None and slot[0] == self._slot_generation:
+            self._free_slots.append(slot)
+            self._slot_cond.notify()
+
+    def _clear_batch_queue(self):
+        for _, _, slot in self._batch_queue:
+            self._release_slot(slot)
+        self._batch_queue = []
 
 
 class _PrefetchLoop(object):
@@ -377,11 +450,15 @@ class _PrefetchLoop(object):
     _thread = None
     _pool = None
     _terminating = False
+    _slot_generation = 0
+    _reallocation_required = False
+    collate_mem_size = None
 
     def __init__(self, dataset, batch_size, repeat,
                  n_processes, n_prefetch, mem_size, comm,
                  order_sampler,
-                 _interruption_testing, maxtasksperchild):
+                 _interruption_testing, maxtasksperchild, zero_copy=False,
+                 collate=None):
         self.dataset = dataset
         self.batch_size = batch_size
         self.repeat = repeat
@@ -390,6 +467,14 @@ class _PrefetchLoop(object):
         self._comm = comm
         self.order_sampler = order_sampler
         self.maxtasksperchild = maxtasksperchild
+        self.zero_copy = zero_copy
+        self.collate = collate
+        if collate is not None and mem_size is not None:
+            self.collate_mem_size = batch_size * mem_size
+        # When batches are views of the shared memory, each of the batches in
+        # the queue, the one being fetched and the one held by the iterator
+        # needs its own slot.
+        self.n_slots = n_prefetch + 2 if zero_copy else 1
 
         self._allocate_shared_memory()
 
@@ -432,7 +517,7 @@ class _PrefetchLoop(object):
             batch_ret = [None]
 
             def fetch_batch():
-                batch_ret[0] = [self.dataset[idx] for idx in indices]
+                batch_ret[0] = _fetch.get_examples(self.dataset, indices)
 
             if dataset_timeout is None:
                 # Timeout is not set: fetch synchronously
@@ -449,23 +534,50 @@ class _PrefetchLoop(object):
 
             batch = batch_ret[0]
             self.mem_size = max(map(_measure, batch))
+            if self.collate is not None:
+                batch = self.collate(batch)
+                self.collate_mem_size = _measure(batch)
             self._allocate_shared_memory()
 
         return batch, self.prefetch_state
 
     def _allocate_shared_memory(self):
+        self._slot_generation += 1
         if self.measure_required():
-            self.mem_bulk = None
+            self.mem_slots = None
         else:
-            self.mem_bulk = \
+            self.mem_slots = [
                 sharedctypes.RawArray('b', self.batch_size * self.mem_size)
+                for _ in six.moves.range(self.n_slots)]
+            self._comm.set_slots(self._slot_generation, self.n_slots)
+        if self.collate is None or self.collate_mem_size is None:
+            self.collate_mem_slots = None
+        else:
+            # Collated batches are written to separate slots because the
+            # examples are read from the slots while collating.
+            self.collate_mem_slots = [
+                sharedctypes.RawArray('b', self.collate_mem_size)
+                for _ in six.moves.range(self.n_slots)]
 
-    def launch_thread(self):
+    def _create_pool(self):
         self._pool = multiprocessing.Pool(
             processes=self.n_processes,
             initializer=_fetch_setup,
-            initargs=(self.dataset, self.mem_size, self.mem_bulk),
+            initargs=(self.dataset, self.mem_size, self.mem_slots,
+                      self.collate, self.collate_mem_slots),
             maxtasksperchild=self.maxtasksperchild)
+
+    def _reallocate_shared_memory(self):
+        # Recreates the worker pool to share a larger shared memory.
+        # The previous shared memory is released when no batch refers to it.
+        self._pool.close()
+        self._pool.join()
+        self._allocate_shared_memory()
+        self._create_pool()
+        self._reallocation_required = False
+
+    def launch_thread(self):
+        self._create_pool()
         if self._interruption_testing:
             pids = self._pool.map(_report_pid, range(self.n_processes))
             print(' '.join(map(str, pids)))
@@ -500,26 +612,92 @@ class _PrefetchLoop(object):
         elif status == _Communicator.STATUS_TERMINATE:
             return False  # stop loop
 
+        if self._reallocation_required:
+            self._reallocate_shared_memory()
+
         self.prefetch_state, indices = _statemachine.iterator_statemachine(
             self.prefetch_state, self.batch_size, self.repeat,
             self.order_sampler, len(self.dataset))
+        slot = None
         if indices is None:  # stop iteration
             batch = None
         else:
-            future = self._pool.map_async(_fetch_run, enumerate(indices))
-            while True:
-                try:
-                    data_all = future.get(_response_time)
-                except multiprocessing.TimeoutError:
-                    if self._comm.is_terminated:
-                        return False
-                else:
-                    break
-            batch = [_unpack(data, self.mem_bulk) for data in data_all]
-
-        self._comm.put(batch, self.prefetch_state, reset_count)
+            if self.mem_slots is not None:
+                slot = self._comm.acquire_slot()
+                if slot is None:  # terminated
+                    return False
+                mem = self.mem_slots[slot[1]]
+                slot_index = slot[1]
+            else:
+                mem = None
+                slot_index = 0
+            if isinstance(self.dataset, dataset_mixin.DatasetMixin):
+                # Read a chunk of examples at once in each worker
+                chunks = numpy.array_split(
+                    numpy.arange(len(indices)),
+                    min(self.n_processes, len(indices)))
+                future = self._pool.map_async(
+                    _fetch_run_batch,
+                    [(slot_index, chunk[0], indices[chunk])
+                     for chunk in chunks])
+            else:
+                future = self._pool.map_async(
+                    _fetch_run,
+                    [(slot_index, i, index)
+                     for i, index in enumerate(indices)])
+            data_all = self._wait(future)
+            if data_all is None:  # terminated
+                self._comm.release_slot(slot)
+                return False
+            if isinstance(self.dataset, dataset_mixin.DatasetMixin):
+                data_all = [data for chunk in data_all for data in chunk]
+
+            if self.collate is None:
+                batch = [_unpack(data, mem, copy=not self.zero_copy)
+                         for data in data_all]
+                mem_size = max(map(_measure, batch))
+            else:
+                mem_size = max([_measure_packed(data) for data in data_all])
+                future = self._pool.apply_async(
+                    _collate_run, ((slot_index, data_all),))
+                data = self._wait(future)
+                if data is None:  # terminated
+                    self._comm.release_slot(slot)
+                    return False
+                collate_mem = None
+                if self.collate_mem_slots is not None:
+                    collate_mem = self.collate_mem_slots[slot_index]
+                batch = _unpack(data, collate_mem, copy=not self.zero_copy)
+
+                collate_mem_size = _measure(batch)
+                if 0 < self.collate_mem_size < collate_mem_size:
+                    self.collate_mem_size = collate_mem_size
+                    self._reallocation_required = True
+
+            if mem is not None and 0 < self.mem_size < mem_size:
+                # Enlarge the shared memory so that the following
+                # examples are not sent by pickle
+                self.mem_size = mem_size
+                self._reallocation_required = True
+
+            if not self.zero_copy:
+                # The batch has been copied out of the shared memory
+                self._comm.release_slot(slot)
+                slot = None
+
+        self._comm.put(batch, self.prefetch_state, reset_count, slot)
         return True
 
+    def _wait(self, future):
+        # Waits for the result of a task of the pool.
+        # Returns None if the iterator is terminated while waiting.
+        while True:
+            try:
+                return future.get(_response_time)
+            except multiprocessing.TimeoutError:
+                if self._comm.is_terminated:
+                    return None
+
 
 # Using `parameterized` function (e.g. bound method) with Pool is tricky due to
 # restrictions imposed by Pickle. Picklable types differ across versions.
@@ -529,27 +707,58 @@ class _PrefetchLoop(object):
 # To make static linter happy, we first initialize global variables.
 _fetch_dataset = None
 _fetch_mem_size = None
-_fetch_mem_bulk = None
+_fetch_mem_slots = None
+_fetch_collate = None
+_fetch_collate_mem_slots = None
 
 
-def _fetch_setup(dataset, mem_size, mem_bulk):
-    global _fetch_dataset, _fetch_mem_size, _fetch_mem_bulk
+def _fetch_setup(dataset, mem_size, mem_slots, collate=None,
+                 collate_mem_slots=None):
+    global _fetch_dataset, _fetch_mem_size, _fetch_mem_slots
+    global _fetch_collate, _fetch_collate_mem_slots
     signal.signal(signal.SIGINT, signal.SIG_IGN)
     _fetch_dataset = dataset
     _fetch_mem_size = mem_size
-    _fetch_mem_bulk = mem_bulk
+    _fetch_mem_slots = mem_slots
+    _fetch_collate = collate
+    _fetch_collate_mem_slots = collate_mem_slots
 
 
 def _fetch_run(inputs):
-    i, index = inputs
+    slot, i, index = inputs
     data = _fetch_dataset[index]
-    if _fetch_mem_bulk is not None:
+    if _fetch_mem_slots is not None:
         offset = i * _fetch_mem_size
         limit = offset + _fetch_mem_size
-        data = _pack(data, _fetch_mem_bulk, offset, limit)
+        data = _pack(data, _fetch_mem_slots[slot], offset, limit)
     return data
 
 
+def _fetch_run_batch(inputs):
+    slot, start, indices = inputs
+    examples = list(_fetch_dataset[indices])
+    if _fetch_mem_slots is not None:
+        mem = _fetch_mem_slots[slot]
+        for i in six.moves.range(len(examples)):
+            offset = (start + i) * _fetch_mem_size
+            limit = offset + _fetch_mem_size
+            examples[i] = _pack(examples[i], mem, offset, limit)
+    return examples
+
+
+def _collate_run(inputs):
+    slot, data_all = inputs
+    mem = None
+    if _fetch_mem_slots is not None:
+        mem = _fetch_mem_slots[slot]
+    batch = _fetch_collate(
+        [_unpack(data, mem, copy=False) for data in data_all])
+    if _fetch_collate_mem_slots is not None:
+        mem = _fetch_collate_mem_slots[slot]
+        batch = _pack(batch, mem, 0, len(mem))
+    return batch
+
+
 def _report_pid(_):  # for testing
     return multiprocessing.current_process().pid
 
@@ -570,19 +779,42 @@ class _PackedNdarray(object):
         target = numpy.frombuffer(mem, self.dtype, self.size, self.offset)
         target[...] = array.ravel()
 
-    def unpack(self, mem):
+    def unpack(self, mem, copy=True):
         ret = numpy.frombuffer(mem, self.dtype, self.size, self.offset)
-        ret = ret.reshape(self.shape).copy()
+        ret = ret.reshape(self.shape)
+        if copy:
+            ret = ret.copy()
         return ret
 
 
 def _measure(data):
     expect = 0
     t = type(data)
-    if t is tuple or t is list or t is dict:
+    if t is dict:
+        data = six.itervalues(data)
+        t = list
+    if t is tuple or t is list:
         for v in data:
             if isinstance(v, numpy.ndarray):
                 expect += v.nbytes
+    elif t is numpy.ndarray:
+        expect = data.nbytes
+    return expect
+
+
+def _measure_packed(data):
+    # Same as _measure, but also counts arrays packed in the shared memory.
+    expect = 0
+    t = type(data)
+    if t is dict:
+        data = six.itervalues(data)
+        t = list
+    if t is tuple or t is list:
+        for v in data:
+            if isinstance(v, (numpy.ndarray, _PackedNdarray)):
+                expect += v.nbytes
+    elif t is numpy.ndarray or t is _PackedNdarray:
+        expect = data.nbytes
     return expect
 
 
@@ -630,24 +862,24 @@ def _pack(data, mem, offset, limit):
     return data
 
 
-def _unpack(data, mem):
-    if len(mem) == 0:
+def _unpack(data, mem, copy=True):
+    if mem is None or len(mem) == 0:
         return data
     t = type(data)
     if t is tuple or t is list:
         ret = []
         for v in data:
             if isinstance(v, _PackedNdarray):
-                v = v.unpack(mem)
+                v = v.unpack(mem, copy)
             ret.append(v)
         data = t(ret)
     elif t is dict:
         ret = {}
         for k, v in six.iteritems(data):
             if isinstance(v, _PackedNdarray):
-                v = v.unpack(mem)
+                v = v.unpack(mem, copy)
             ret[k] = v
         data = ret
     elif t is _PackedNdarray:
-        data = data.unpack(mem)
+        data = data.unpack(mem, copy)
     return data
@@ -39,11 +39,20 @@ class MultithreadIterator(iterator.Iterator):
             This should return the next order. The size of the order
             should remain constant.
             This option cannot be used when ``shuffle`` is not ``None``.
+        collate (callable): A function that converts a list of examples into
+            a batch, e.g., :func:`~chainer.dataset.concat_examples` without
+            device transfer. If it is given, the batch is collated by a
+            background thread while the previous batch is being processed,
+            and the iterator returns the collated batch instead of a list of
+            examples. Use a converter that does not concatenate examples, e.g.,
+            :func:`~chainer.dataset.transfer_collated`, for such batches.
 
     """
 
+    _collate_pool = None
+
     def __init__(self, dataset, batch_size, repeat=True, shuffle=None,
-                 n_threads=1, order_sampler=None):
+                 n_threads=1, order_sampler=None, collate=None):
         self.dataset = dataset
         self.batch_size = batch_size
         self._repeat = repeat
@@ -64,6 +73,7 @@ class MultithreadIterator(iterator.Iterator):
         self.order_sampler = order_sampler
 
         self.n_threads = n_threads
+        self.collate = collate
         self._pool = None
 
         self.reset()
@@ -81,11 +91,15 @@ class MultithreadIterator(iterator.Iterator):
 
     def finalize(self):
         pool = self._pool
+        collate_pool = self._collate_pool
 
         self._next = None
         self._pool = None
+        self._collate_pool = None
         if pool is not None:
             pool.terminate()
+        if collate_pool is not None:
+            collate_pool.terminate()
 
     def __next__(self):
         if self._next is None:
@@ -141,6 +155,12 @@ class MultithreadIterator(iterator.Iterator):
         dataset, index = args
         return dataset[index]
 
+    @staticmethod
+    def _collate(collate, future):
+        while not future.ready():
+            future.wait(0.5)  # To avoid interruption bug in Python2
+        return collate(future.get())
+
     def _invoke_prefetch(self):
         assert self._next is None
         self._next_state, indices = _statemachine.iterator_statemachine(
@@ -154,6 +174,13 @@ class MultithreadIterator(iterator.Iterator):
                 self._pool = pool.ThreadPool(self.n_threads)
             args = [(self.dataset, index) for index in indices]
             self._next = self._pool.map_async(MultithreadIterator._read, args)
+            if self.collate is not None:
+                # Collate in another thread not to occupy a worker thread
+                # while waiting for the other examples.
+                if self._collate_pool is None:
+                    self._collate_pool = pool.ThreadPool(1)
+                self._next = self._collate_pool.apply_async(
+                    MultithreadIterator._collate, (self.collate, self._next))
 
     def _get(self):
         self._previous_epoch_detail = self.epoch_detail
@@ -167,6 +194,8 @@ class MultithreadIterator(iterator.Iterator):
         while not next.ready():
             next.wait(0.5)  # To avoid interruption bug in Python2
 
+        if self.collate is not None:
+            return next.get()
         batch = [data for data in next.get()]
         return batch
 
@@ -3,6 +3,8 @@ from __future__ import division
 import numpy
 
 from chainer.dataset import iterator
+from chainer.dataset.tabular import tabular_dataset
+from chainer.iterators import _fetch
 from chainer.iterators import _statemachine
 from chainer.iterators.order_samplers import ShuffleOrderSampler
 
@@ -40,13 +42,29 @@ class SerialIterator(iterator.Iterator):
             This should return the next order. The size of the order
             should remain constant.
             This option cannot be used when ``shuffle`` is not ``None``.
+        columnar (bool): If ``True``, each batch is returned in the
+            column-major form, i.e., the output of
+            :meth:`~chainer.dataset.TabularDataset.fetch` for the indices of
+            the batch, instead of a list of examples. ``dataset`` must be a
+            :class:`~chainer.dataset.TabularDataset`.
+
+    Datasets based on :class:`~chainer.dataset.DatasetMixin` read the examples
+    of each batch by a single call of
+    :meth:`~chainer.dataset.DatasetMixin.get_examples`.
 
     """
 
     def __init__(self, dataset, batch_size,
-                 repeat=True, shuffle=None, order_sampler=None):
+                 repeat=True, shuffle=None, order_sampler=None,
+                 columnar=False):
+        if columnar and not isinstance(
+                dataset, tabular_dataset.TabularDataset):
+            raise TypeError(
+                'columnar option requires a TabularDataset. Actual: {}'.format(
+                    type(dataset)))
         self.dataset = dataset
         self.batch_size = batch_size
+        self.columnar = columnar
         self._repeat = repeat
         self._shuffle = shuffle
 
@@ -74,7 +92,9 @@ class SerialIterator(iterator.Iterator):
         if indices is None:
             raise StopIteration
 
-        batch = [self.dataset[index] for index in indices]
+        if self.columnar:
+            return self.dataset.fetch(indices)
+        batch = _fetch.get_examples(self.dataset, indices)
         return batch
 
     next = __next__
@@ -659,6 +659,12 @@ class Link(device_resident.DeviceResident):
                 # Initialize the parameter here
                 param.initialize(data.shape)
                 param.data[:] = param.device.send(data)
+            elif (isinstance(data, numpy.ndarray)
+                    and isinstance(param.data, numpy.ndarray)
+                    and data is not param.data):
+                # The deserializer returned its own array instead of copying
+                # the values into the parameter
+                param.data = data
         for name in self._persistent:
             d[name] = serializer(name, d[name])
 
@@ -127,44 +127,51 @@ class BinaryHierarchicalSoftmaxFunction(
         self.codes = visitor.visit_array(self.codes)
         self.begins = visitor.visit_array(self.begins)
 
+    def _gather_paths(self, t):
+        # Returns the example index and the position in ``paths`` of every
+        # node on the paths of the labels ``t``, concatenated in order.
+        begins = self.begins[t]
+        lengths = self.begins[t + 1] - begins
+        rows = numpy.repeat(numpy.arange(len(t)), lengths)
+        offsets = numpy.arange(len(rows)) - numpy.repeat(
+            numpy.cumsum(lengths) - lengths, lengths)
+        return rows, begins[rows] + offsets
+
     def forward_cpu(self, inputs):
         x, t, W = inputs
 
-        loss = x.dtype.type(0.0)
-        for ix, it in six.moves.zip(x, t):
-            loss += self._forward_cpu_one(ix, it, W)
-        return numpy.array(loss),
-
-    def _forward_cpu_one(self, x, t, W):
-        begin = self.begins[t]
-        end = self.begins[t + 1]
-
-        w = W[self.paths[begin:end]]
-        wxy = w.dot(x) * self.codes[begin:end]
+        rows, positions = self._gather_paths(t)
+        w = W[self.paths[positions]]
+        wxy = numpy.einsum('ij,ij->i', w, x[rows]) * self.codes[positions]
         loss = numpy.logaddexp(0.0, -wxy)  # == log(1 + exp(-wxy))
-        return numpy.sum(loss)
+        return numpy.array(loss.sum(), dtype=x.dtype),
 
     def backward_cpu(self, inputs, grad_outputs):
         x, t, W = inputs
         gloss, = grad_outputs
-        gx = numpy.empty_like(x)
+
+        rows, positions = self._gather_paths(t)
+        nodes = self.paths[positions]
+        codes = self.codes[positions]
+        w = W[nodes]
+        xs = x[rows]
+        wxy = numpy.einsum('ij,ij->i', w, xs) * codes
+        g = (-gloss * codes / (1.0 + numpy.exp(wxy)))[:, None]
+
+        gx = numpy.zeros_like(x)
         gW = numpy.zeros_like(W)
-        for i, (ix, it) in enumerate(six.moves.zip(x, t)):
-            gx[i] = self._backward_cpu_one(ix, it, W, gloss, gW)
-        return gx, None, gW
+        if len(rows) == 0:
+            return gx, None, gW
 
-    def _backward_cpu_one(self, x, t, W, gloss, gW):
-        begin = self.begins[t]
-        end = self.begins[t + 1]
-
-        path = self.paths[begin:end]
-        w = W[path]
-        wxy = w.dot(x) * self.codes[begin:end]
-        g = -gloss * self.codes[begin:end] / (1.0 + numpy.exp(wxy))
-        gx = g.dot(w)
-        gw = g.reshape((g.shape[0], 1)).dot(x.reshape(1, x.shape[0]))
-        gW[path] += gw
-        return gx
+        # ``rows`` is sorted, so each example is a contiguous segment.
+        gx_rows, gx_starts = numpy.unique(rows, return_index=True)
+        gx[gx_rows] = numpy.add.reduceat(g * w, gx_starts)
+
+        # Sort by node to reduce the gradients of each row of ``W`` at once.
+        order = numpy.argsort(nodes, kind='mergesort')
+        gW_rows, gW_starts = numpy.unique(nodes[order], return_index=True)
+        gW[gW_rows] = numpy.add.reduceat((g * xs)[order], gW_starts)
+        return gx, None, gW
 
     def forward_gpu(self, inputs):
         x, t, W = inputs
@@ -48,7 +48,8 @@ class NegativeSampling(link.Link):
         self.sampler.device_resident_accept(visitor)
 
     def forward(self, x, t, reduce='sum', **kwargs):
-        """forward(x, t, reduce='sum', *, return_samples=False)
+        """forward(x, t, reduce='sum', *, return_samples=False, \
+deterministic=False)
 
         Computes the loss value for given input and ground truth labels.
 
@@ -65,6 +66,10 @@ class NegativeSampling(link.Link):
                 integers whose first column is fixed to the ground truth labels
                 and the other columns are drawn from the
                 :class:`chainer.utils.WalkerAlias` sampler.
+            deterministic (bool):
+                If ``True``, the gradient of the weight matrix is accumulated
+                in a fixed order on GPU as well. See
+                :func:`~chainer.functions.negative_sampling`.
 
         Returns:
             ~chainer.Variable or tuple:
@@ -76,11 +81,14 @@ class NegativeSampling(link.Link):
 
         """
         return_samples = False
+        deterministic = False
         if kwargs:
-            return_samples, = argument.parse_kwargs(
-                kwargs, ('return_samples', return_samples))
+            return_samples, deterministic = argument.parse_kwargs(
+                kwargs, ('return_samples', return_samples),
+                ('deterministic', deterministic))
 
         ret = negative_sampling.negative_sampling(
             x, t, self.W, self.sampler.sample, self.sample_size,
-            reduce=reduce, return_samples=return_samples)
+            reduce=reduce, return_samples=return_samples,
+            deterministic=deterministic)
         return ret
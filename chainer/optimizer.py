@@ -8,9 +8,12 @@ import numpy
 import six
 
 import chainer
+from chainer import _phase
+from chainer.backends import cuda
 from chainer import link as link_module
 from chainer import optimizer_hooks
 from chainer import serializer as serializer_module
+from chainer import utils
 from chainer import variable
 import chainerx
 
@@ -186,6 +189,12 @@ class UpdateRule(object):
 
     """
 
+    # Update rules whose update_core only consists of elementwise operations
+    # over the parameter, the gradient and the state arrays set this flag, so
+    # that GradientMethod.use_fused_update can apply them to a flat arena of
+    # many parameters at once.
+    _elementwise_update = False
+
     def __init__(self, parent_hyperparam=None):
         self._state = None
         self.enabled = True
@@ -284,7 +293,10 @@ class UpdateRule(object):
 
         # Call update_core
         self._hookable.call_hooks('pre', args=(self, param_,))
-        self.update_core(param_)
+        if isinstance(param_._grad, utils.RowSparseArray):
+            self._update_core_sparse(param_)
+        else:
+            self.update_core(param_)
         self._hookable.call_hooks('post', args=(self, param_,))
 
         # Convert back to the original dtype
@@ -293,6 +305,32 @@ class UpdateRule(object):
                 param.array = fp32_param.array.astype(param.dtype)
             fp32_param.grad = None
 
+    def _update_core_sparse(self, param):
+        # Updates the parameter by a row-sparse gradient. Elementwise update
+        # rules only update the referenced rows and their states ("lazy"
+        # update), and the others use the dense gradient.
+        grad = param.grad
+        if not self._elementwise_update:
+            param.grad = grad.to_dense()
+            self.update_core(param)
+            return
+
+        grad = grad.coalesce()
+        rows = grad.indices
+        array = param.array
+        row_param = variable.Parameter(array[rows], name=param.name)
+        row_param.grad = grad.values
+        state = self._state
+        self._state = {name: value[rows] for name, value in state.items()}
+        try:
+            self.update_core(row_param)
+            array[rows] = row_param.array
+            for name, value in state.items():
+                value[rows] = self._state[name]
+        finally:
+            self._state = state
+        param._set_grad_without_check(grad)
+
     def _create_uninitialized_parameter(self, dtype, name):
         # Creates an uninitialized parameter with given dtype.
         # This is somewhat tricky but the parameter is created with a
@@ -756,7 +794,10 @@ class Optimizer(object):
             return
         for name, param in self.target.namedparams():
             xp = param.device.xp
-            if not xp.all(xp.isfinite(param.grad)):
+            grad = param.grad
+            if isinstance(grad, utils.RowSparseArray):
+                grad = grad.values
+            if not xp.all(xp.isfinite(grad)):
                 self._loss_scaling_isnan = True
                 self._loss_scaling_isnan_ever = True
                 warnings.warn(
@@ -780,6 +821,179 @@ class Optimizer(object):
                                       self._loss_scale * multiplier))
 
 
+class _ParameterArena(object):
+
+    # Flat arrays holding the parameters, the gradients and the update rule
+    # states of parameters sharing an update rule class, a device and a dtype.
+    # The array, the gradient and the state entries of each parameter are
+    # replaced with views into them, so that the whole group is updated by a
+    # single call of update_core of a representative update rule.
+
+    def __init__(self, params):
+        self.params = params
+        self.rules = [param.update_rule for param in params]
+        self.device = device = params[0].device
+        dtype = params[0].dtype
+        offsets = numpy.cumsum([0] + [param.size for param in params])
+        with chainer.using_device(device):
+            self.data = device.xp.empty((int(offsets[-1]),), dtype)
+            self.grad = device.xp.zeros_like(self.data)
+        self.slices = [slice(int(begin), int(end))
+                       for begin, end in zip(offsets[:-1], offsets[1:])]
+        self.data_views = []
+        self.grad_views = []
+        for param, s in zip(params, self.slices):
+            data = self.data[s].reshape(param.shape)
+            data[...] = param.array
+            param.array = data
+            self.data_views.append(data)
+            self.grad_views.append(self.grad[s].reshape(param.shape))
+
+        self.rule = copy.copy(self.rules[0])
+        self.flat_param = variable.Parameter(self.data)
+        self.flat_param.grad = self.grad
+        self.flat_param.update_rule = self.rule
+        self.states = None
+        self.state_views = None
+
+    @staticmethod
+    def get_key(param):
+        # Returns the key of the arena the parameter belongs to, or None if
+        # the parameter cannot be packed into an arena.
+        rule = param.update_rule
+        if rule is None or not rule._elementwise_update:
+            return None
+        array = param.array
+        if not isinstance(array, (numpy.ndarray, cuda.ndarray)):
+            return None
+        if rule._use_fp32_update and array.dtype == numpy.float16:
+            return None
+        return type(rule), param.device, array.dtype
+
+    def holds(self, params):
+        # Checks if the arena still holds the given parameters as views.
+        if len(params) != len(self.params):
+            return False
+        for param, rule, old_param, data in zip(
+                params, self.rules, self.params, self.data_views):
+            if param is not old_param or param.update_rule is not rule:
+                return False
+            array = param.array
+            if array is data:
+                continue
+            # The array has been replaced (e.g. by a deserializer).
+            if (array is None
+                    or array.shape != data.shape
+                    or array.dtype != data.dtype
+                    or param.device != self.device):
+                return False
+            data[...] = array
+            param.array = data
+        return True
+
+    def update(self):
+        params = self.params
+        rules = self.rules
+        if not self._is_fusible():
+            for param in params:
+                param.update()
+            return
+
+        self.gather_grads()
+        if not self._has_state_views():
+            self._init_states()
+
+        for rule in rules:
+            rule.t += 1
+        rule = self.rule
+        rule.t = rules[0].t
+
+        loss_scale = params[0]._loss_scale
+        if loss_scale is not None:
+            self.grad /= loss_scale
+        rule.update_core(self.flat_param)
+
+    def gather_grads(self):
+        # Copies gradients allocated outside of the arena (e.g. by backprop)
+        # into it. Returns False if any parameter has no gradient.
+        for param, grad in zip(self.params, self.grad_views):
+            g = param.grad
+            if g is grad:
+                continue
+            if g is None or isinstance(g, utils.RowSparseArray):
+                return False
+            grad[...] = g
+            param._set_grad_without_check(grad)
+        return True
+
+    def get_flat_param(self):
+        # Returns a parameter whose array and gradient cover the whole arena,
+        # or None if the parameters cannot be handled at once.
+        loss_scale = self.params[0]._loss_scale
+        for param in self.params:
+            if param._loss_scale != loss_scale:
+                return None
+        if not self.gather_grads():
+            return None
+        self.flat_param._loss_scale = loss_scale
+        return self.flat_param
+
+    def _is_fusible(self):
+        # The update rules can be fused only if they behave identically.
+        rule0 = self.rules[0]
+        t = rule0.t
+        parent = rule0.hyperparam.parent
+        loss_scale = self.params[0]._loss_scale
+        for param, rule in zip(self.params, self.rules):
+            hookable = rule._hookable
+            if (not rule.enabled
+                    or rule.t != t
+                    or rule.hyperparam.parent is not parent
+                    or len(rule.hyperparam.__dict__) != 1
+                    or hookable._pre_update_hooks
+                    or hookable._post_update_hooks
+                    or param.grad is None
+                    or isinstance(param.grad, utils.RowSparseArray)
+                    or param._loss_scale != loss_scale):
+                return False
+        return True
+
+    def _has_state_views(self):
+        if self.states is None:
+            return False
+        for rule, views in zip(self.rules, self.state_views):
+            state = rule.state
+            if state is None or len(state) != len(views):
+                return False
+            for name, view in six.iteritems(views):
+                if state.get(name) is not view:
+                    return False
+        return True
+
+    def _init_states(self):
+        # Initializes the flat states and copies the existing per-parameter
+        # states (e.g. loaded from a snapshot) into them.
+        device = self.device
+        rule = self.rule
+        rule._state = {}
+        with chainer.using_device(device):
+            rule.init_state(self.flat_param)
+            self.states = rule.state
+            self.state_views = []
+            for param, param_rule, s in zip(
+                    self.params, self.rules, self.slices):
+                old_state = param_rule.state or {}
+                views = {}
+                for name, flat in six.iteritems(self.states):
+                    view = flat[s].reshape(param.shape)
+                    value = old_state.get(name)
+                    if value is not None and value is not view:
+                        view[...] = device.send(value)
+                    views[name] = view
+                param_rule._state = views
+                self.state_views.append(views)
+
+
 class GradientMethod(Optimizer):
     """Base class of all single gradient-based optimizers.
 
@@ -811,9 +1025,13 @@ class GradientMethod(Optimizer):
         super(GradientMethod, self).__init__()
         self.hyperparam = Hyperparameter()
         self._use_fp32_update = False
+        self._use_fused_update = False
+        self._arenas = {}
+        self._arena_layout = None
 
     def setup(self, link):
         super(GradientMethod, self).setup(link)
+        self._arenas = {}
         for param in link.params():
             param.update_rule = self.create_update_rule()
             if self._use_fp32_update:
@@ -836,7 +1054,17 @@ class GradientMethod(Optimizer):
                     param.grad = device.xp.zeros_like(param.data)
 
     def call_hook(self, hook):
-        super(GradientMethod, self).call_hook(hook)
+        # A per-parameter hook whose computation only consists of elementwise
+        # operations over the parameter and its gradient declares it by the
+        # class attribute ``_elementwise = True``. Such a hook is applied to
+        # the flat parameter of each arena at once in the fused update mode.
+        if (self._use_fused_update
+                and getattr(hook, 'call_for_each_param', False)
+                and getattr(hook, '_elementwise', False)):
+            for param in self._get_flat_params():
+                hook(param.update_rule, param)
+        else:
+            super(GradientMethod, self).call_hook(hook)
         self.reallocate_cleared_grads()
 
     def update(self, lossfun=None, *args, **kwds):
@@ -856,26 +1084,39 @@ class GradientMethod(Optimizer):
         """
         if lossfun is not None:
             use_cleargrads = getattr(self, '_use_cleargrads', True)
-            loss = lossfun(*args, **kwds)
-            if use_cleargrads:
-                self.target.cleargrads()
-            else:
-                self.target.zerograds()
-            loss.backward(loss_scale=self._loss_scale)
-            del loss
+            with _phase.phase('forward'):
+                loss = lossfun(*args, **kwds)
+            with _phase.phase('backward'):
+                if use_cleargrads:
+                    self.target.cleargrads()
+                else:
+                    self.target.zerograds()
+                loss.backward(loss_scale=self._loss_scale)
+                del loss
 
         self.reallocate_cleared_grads()
         self.check_nan_in_grads()
-        self.call_hooks('pre')
 
-        self.t += 1
-        if self.is_safe_to_update():
-            for param in self.target.params():
-                param.update()
+        # In the fused update mode, the arenas are prepared once and shared
+        # by the hooks and the update.
+        if self._use_fused_update:
+            self._arena_layout = self._prepare_arenas()
+        try:
+            self.call_hooks('pre')
 
-        self.reallocate_cleared_grads()
+            self.t += 1
+            if self.is_safe_to_update():
+                if self._use_fused_update:
+                    self._update_fused()
+                else:
+                    for param in self.target.params():
+                        param.update()
 
-        self.call_hooks('post')
+            self.reallocate_cleared_grads()
+
+            self.call_hooks('post')
+        finally:
+            self._arena_layout = None
         self.update_loss_scale()
 
     def use_cleargrads(self, use=True):
@@ -922,6 +1163,87 @@ class GradientMethod(Optimizer):
             for param in link.params():
                 param.update_rule.use_fp32_update()
 
+    def use_fused_update(self, flag=True):
+        """Enables fused update of parameters packed into flat arenas.
+
+        When it is enabled, parameters of update rules that only consist of
+        elementwise operations (e.g. those of
+        :class:`~chainer.optimizers.Adam`,
+        :class:`~chainer.optimizers.MomentumSGD`,
+        :class:`~chainer.optimizers.RMSprop` and
+        :class:`~chainer.optimizers.AdaGrad`) are grouped by the update rule
+        class, the device and the dtype. The arrays, the gradients and the
+        update rule states of each group are packed into contiguous arrays,
+        and :attr:`~chainer.Variable.array`, :attr:`~chainer.Variable.grad`
+        and the entries of :attr:`~chainer.UpdateRule.state` of each parameter
+        become views into them. Each group is then updated by a handful of
+        vectorized operations instead of a few operations per parameter.
+
+        Gradients computed into new arrays by backprop are copied into the
+        arena before the update. A group falls back to the per-parameter
+        update if any of its update rules is disabled, has its own
+        hyperparameters or hooks, or has a different update count. The states
+        are still serialized per parameter, so snapshots are interchangeable
+        with those taken without this mode.
+
+        Args:
+            flag (bool): If ``True``, enables the fused update.
+
+        """
+        self._use_fused_update = flag
+        self._arenas = {}
+
+    def _prepare_arenas(self):
+        # Packs the parameters into arenas, reusing the existing ones if they
+        # still hold the same parameters. Returns the arenas and the
+        # parameters that cannot be packed.
+        groups = collections.OrderedDict()
+        others = []
+        for param in self.target.params():
+            key = _ParameterArena.get_key(param)
+            if key is None:
+                others.append(param)
+            else:
+                groups.setdefault(key, []).append(param)
+
+        arenas = collections.OrderedDict()
+        for key, params in six.iteritems(groups):
+            arena = self._arenas.get(key)
+            if arena is None or not arena.holds(params):
+                arena = _ParameterArena(params)
+            arenas[key] = arena
+        self._arenas = arenas
+        return list(arenas.values()), others
+
+    def _get_flat_params(self):
+        # Returns the initialized parameters, where the parameters packed in
+        # an arena are represented by the flat parameter of the arena.
+        if not self._use_fused_update:
+            return list(self.target.params(False))
+        arenas, others = self._get_arena_layout()
+        params = [param for param in others if param.array is not None]
+        for arena in arenas:
+            flat_param = arena.get_flat_param()
+            if flat_param is None:
+                params.extend(arena.params)
+            else:
+                params.append(flat_param)
+        return params
+
+    def _get_arena_layout(self):
+        # Returns the arenas prepared for the running update, if any.
+        layout = self._arena_layout
+        if layout is None:
+            layout = self._prepare_arenas()
+        return layout
+
+    def _update_fused(self):
+        arenas, others = self._get_arena_layout()
+        for param in others:
+            param.update()
+        for arena in arenas:
+            arena.update()
+
 
 class HyperparameterProxy(object):
 
@@ -4,19 +4,18 @@ import numpy
 import six
 
 import chainer
-from chainer import backend
 
 
 def _sum_sqnorm_grads(params):
     # Calculates sum of squares of gradients.
 
     # Returns a tuple of the sum and the device of the sum.
-    # The device will be `None` in multi-device case.
 
-    # If the inputs are on a single device, the sum is returned
-    # as an ndarray on the device, so that no synchronization is taken place.
-    # If there are multiple devices, accumulation is done on each device
-    # first, and the total sum is returned as a python float.
+    # The sum is returned as an ndarray on the device, so that no
+    # synchronization is taken place. If there are multiple devices,
+    # accumulation is done on each device first, and the partial sums are
+    # then transferred to and accumulated on the device of the first
+    # parameter.
 
     # TODO(niboshi): Support and test len(params) == 0
 
@@ -37,22 +36,33 @@ def _sum_sqnorm_grads(params):
             dots = []
             for param in paramlist:
                 g = param.grad
+                if isinstance(g, chainer.utils.RowSparseArray):
+                    # Duplicated rows have to be summed up first.
+                    g = g.coalesce().values
                 g = g.ravel()
                 dots.append(g.dot(g))
             sq_sums.append(sum(dots))
 
     # Return the total sum.
+    ret_device = params[0].device
     if len(sq_sums) == 1:
         # single device
         sqnorm = sq_sums[0]
-        ret_device = params[0].device
     else:
         # multi-device
-        sqnorm = sum([float(s) for s in sq_sums])
-        ret_device = None
+        with chainer.using_device(ret_device):
+            sqnorm = sum([_send_scalar(s, ret_device) for s in sq_sums])
     return sqnorm, ret_device
 
 
+def _send_scalar(value, device):
+    # Transfers a scalar array to the device. NumPy scalars are converted to
+    # 0-dim arrays first as they cannot be sent as they are.
+    if isinstance(value, numpy.generic):
+        value = numpy.asarray(value)
+    return device.send(value)
+
+
 class GradientClipping(object):
     """Optimizer hook function for gradient clipping.
 
@@ -82,10 +92,16 @@ class GradientClipping(object):
         self.threshold = threshold
 
     def __call__(self, opt):
-        sqnorm, device = _sum_sqnorm_grads(list(opt.target.params(False)))
-        if device is None:
-            # Assign a dummy device for using_device.
-            device = backend.CpuDevice()
+        # In the fused update mode of GradientMethod, the parameters packed
+        # into an arena are given as a single flat parameter.
+        get_flat_params = getattr(opt, '_get_flat_params', None)
+        if get_flat_params is not None:
+            params = get_flat_params()
+        else:
+            params = list(opt.target.params(False))
+        if not params:
+            return
+        sqnorm, device = _sum_sqnorm_grads(params)
 
         with chainer.using_device(device):
             norm = device.xp.sqrt(sqnorm)
@@ -100,7 +116,15 @@ class GradientClipping(object):
             else:
                 rate = rate.clip(None, 1)
 
-        for param in opt.target.params(False):
+        rates = {device: rate}
+        for param in params:
             grad = param.grad
-            with chainer.using_device(param.device):
-                grad *= rate
+            param_device = param.device
+            param_rate = rates.get(param_device)
+            if param_rate is None:
+                # The rate is transferred between devices without
+                # synchronization with the host, unless it is sent to CPU.
+                param_rate = _send_scalar(rate, param_device)
+                rates[param_device] = param_rate
+            with chainer.using_device(param_device):
+                grad *= param_rate
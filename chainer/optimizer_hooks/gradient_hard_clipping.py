@@ -37,6 +37,7 @@ class GradientHardClipping(object):
     name = 'GradientHardClipping'
     call_for_each_param = True
     timing = 'pre'
+    _elementwise = True
 
     def __init__(self, lower_bound, upper_bound):
         self.lower_bound = lower_bound
@@ -46,6 +47,12 @@ class GradientHardClipping(object):
         grad = param.grad
         if grad is None:
             return
+        if isinstance(grad, chainer.utils.RowSparseArray):
+            grad = grad.coalesce()
+            grad.values.clip(
+                self.lower_bound, self.upper_bound, out=grad.values)
+            param.grad = grad
+            return
         with chainer.using_device(param.device):
             xp = param.device.xp
             # TODO(kshitij12345): Fix when chainerx.clip
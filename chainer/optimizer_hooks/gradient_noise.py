@@ -2,6 +2,7 @@ import numpy
 
 import chainer
 from chainer import cuda
+from chainer import utils
 
 
 def exponential_decay_noise(xp, shape, dtype, hook, opt):
@@ -34,6 +35,9 @@ class GradientNoise(object):
     with :math:`\\eta` selected from {0.01, 0.3, 1.0} and
     :math:`\\gamma = 0.55`.
 
+    If the gradient is a :class:`~chainer.utils.RowSparseArray`, the noise is
+    only added to the rows in the gradient.
+
     Args:
         eta (float): Parameter that defines the scale of the noise. For
             the default noise function, it is recommended that it be either
@@ -73,6 +77,12 @@ class GradientNoise(object):
             return
         with chainer.using_device(param.device):
             xp = param.device.xp
+            if isinstance(g, utils.RowSparseArray):
+                g = g.coalesce()
+                g.values += self.noise_func(
+                    xp, g.values.shape, g.values.dtype, self, rule)
+                param.grad = g
+                return
             noise = self.noise_func(xp, g.shape, g.dtype, self, rule)
             if xp is cuda.cupy:
                 kernel = cuda.elementwise(
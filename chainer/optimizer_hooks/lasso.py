@@ -1,5 +1,6 @@
 import chainer
 from chainer import cuda
+from chainer import utils
 
 
 class Lasso(object):
@@ -8,6 +9,9 @@ class Lasso(object):
     This hook function adds a scaled parameter to the sign of each weight.
     It can be used as a regularization.
 
+    If the gradient is a :class:`~chainer.utils.RowSparseArray`, only the rows
+    in the gradient are regularized.
+
     Args:
         rate (float): Coefficient for the weight decay.
 
@@ -31,6 +35,7 @@ class Lasso(object):
     name = 'Lasso'
     call_for_each_param = True
     timing = 'pre'
+    _elementwise = True
 
     def __init__(self, rate):
         self.rate = rate
@@ -41,6 +46,11 @@ class Lasso(object):
             return
         with chainer.using_device(param.device):
             xp = param.device.xp
+            if isinstance(g, utils.RowSparseArray):
+                g = g.coalesce()
+                g.values += self.rate * xp.sign(p[g.indices])
+                param.grad = g
+                return
             sign = xp.sign(p)
             if xp is cuda.cupy:
                 kernel = cuda.elementwise(
@@ -1,5 +1,6 @@
 import chainer
 from chainer import cuda
+from chainer import utils
 
 
 class WeightDecay(object):
@@ -9,6 +10,9 @@ class WeightDecay(object):
     This hook function adds a scaled parameter to the corresponding gradient.
     It can be used as a regularization.
 
+    If the gradient is a :class:`~chainer.utils.RowSparseArray`, only the rows
+    in the gradient are decayed.
+
     Args:
         rate (float): Coefficient for the weight decay.
 
@@ -33,6 +37,7 @@ class WeightDecay(object):
     name = 'WeightDecay'
     call_for_each_param = True
     timing = 'pre'
+    _elementwise = True
 
     def __init__(self, rate):
         self.rate = rate
@@ -45,7 +50,11 @@ class WeightDecay(object):
             rate = self.rate
             if param._loss_scale is not None:
                 rate *= param._loss_scale
-            if param.device.xp is cuda.cupy:
+            if isinstance(g, utils.RowSparseArray):
+                g = g.coalesce()
+                g.values += rate * p[g.indices]
+                param.grad = g
+            elif param.device.xp is cuda.cupy:
                 kernel = cuda.elementwise(
                     'T p, T decay', 'T g', 'g += decay * p', 'weight_decay')
                 kernel(p, rate, g)
@@ -37,6 +37,9 @@ class AdaGradRule(optimizer.UpdateRule):
         eps (float): Small value for the numerical stability.
 
     """
+
+    _elementwise_update = True
+
     _kernel = None
 
     def __init__(self, parent_hyperparam=None, lr=None, eps=None):
@@ -114,6 +114,9 @@ class AdamRule(optimizer.UpdateRule):
         gamma (float): Convergence speed of the bound functions in AdaBound.
 
     """
+
+    _elementwise_update = True
+
     _kernel = None
     _amsgrad_kernel = None
     _adabound_kernel = None
@@ -51,6 +51,8 @@ class RMSpropRule(optimizer.UpdateRule):
 
     """
 
+    _elementwise_update = True
+
     def __init__(self, parent_hyperparam=None, lr=None, alpha=None, eps=None,
                  eps_inside_sqrt=None):
         super(RMSpropRule, self).__init__(
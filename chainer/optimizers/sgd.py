@@ -32,6 +32,9 @@ class SGDRule(optimizer.UpdateRule):
         lr (float): Learning rate.
 
     """
+
+    _elementwise_update = True
+
     _kernel = None
 
     def __init__(self, parent_hyperparam=None, lr=None):
@@ -325,6 +325,120 @@ class Summary(object):
             warnings.warn('The previous statistics are not saved.')
 
 
+class _SummaryBuffer(object):
+
+    # Weighted sums of scalars accumulated on one device. Each name has a slot
+    # in the vectors, so that all the scalars reported at once are added by a
+    # few vectorized operations.
+
+    def __init__(self, device):
+        self.device = device
+        self.names = []
+        self.slots = {}
+        self.x = None
+        self.x2 = None
+        self.n = None
+        self._indices = {}
+
+    def add(self, names, values, weights, initial_values):
+        # names must be unique.
+        device = self.device
+        xp = device.xp
+        index = self._get_index(names, initial_values)
+        with chainer.using_device(device):
+            if xp is numpy:
+                v = numpy.array(values, dtype=numpy.float64)
+            else:
+                v = xp.stack(values).astype(numpy.float64, copy=False)
+
+            if all(type(w) is int and w == 1 for w in weights):
+                self.x[index] += v
+                self.x2[index] += v * v
+                self.n[index] += 1
+                return
+
+            if all(_is_host_scalar(w) for w in weights):
+                w = device.send(numpy.array(weights, dtype=numpy.float64))
+            else:
+                w = xp.stack([_send_scalar(w, device) for w in weights])
+                w = w.astype(numpy.float64, copy=False)
+            wv = w * v
+            self.x[index] += wv
+            self.x2[index] += wv * v
+            self.n[index] += w
+
+    def _get_index(self, names, initial_values):
+        index = self._indices.get(names)
+        if index is not None:
+            return index
+
+        if len(self._indices) >= 64:
+            # Avoid unbounded growth with ever-changing sets of names.
+            self._indices.clear()
+        slots = self.slots
+        new_names = [name for name in names if name not in slots]
+        if new_names:
+            self._extend(new_names, initial_values)
+        positions = [slots[name] for name in names]
+        begin = positions[0]
+        if positions == list(six.moves.range(begin, begin + len(names))):
+            index = slice(begin, begin + len(names))
+        else:
+            index = self.device.send(numpy.array(positions, dtype=numpy.intp))
+        self._indices[names] = index
+        return index
+
+    def _extend(self, names, initial_values):
+        # Allocates slots for new names, initialized with the statistics
+        # loaded from a snapshot if any.
+        initial = numpy.zeros((3, len(names)), dtype=numpy.float64)
+        for i, name in enumerate(names):
+            self.slots[name] = len(self.names)
+            self.names.append(name)
+            init = initial_values.pop(name, None)
+            if init is not None:
+                initial[:, i] = init
+        initial = self.device.send(initial)
+        xp = self.device.xp
+        with chainer.using_device(self.device):
+            if self.x is None:
+                self.x, self.x2, self.n = [a.copy() for a in initial]
+            else:
+                self.x = xp.concatenate((self.x, initial[0]))
+                self.x2 = xp.concatenate((self.x2, initial[1]))
+                self.n = xp.concatenate((self.n, initial[2]))
+
+    def compute_mean(self):
+        with chainer.using_device(self.device):
+            return self.x / self.n
+
+    def make_statistics(self):
+        xp = self.device.xp
+        with chainer.using_device(self.device):
+            mean = self.x / self.n
+            var = self.x2 / self.n - mean * mean
+            return mean, xp.sqrt(var)
+
+    def get(self, name):
+        slot = self.slots[name]
+        return self.x[slot], self.x2[slot], self.n[slot]
+
+
+_host_scalar_types = (float, bool, numpy.generic, numpy.ndarray) + \
+    six.integer_types
+_cpu_device = backend.CpuDevice()
+
+
+def _is_host_scalar(value):
+    return isinstance(value, _host_scalar_types)
+
+
+def _send_scalar(value, device):
+    if _is_host_scalar(value):
+        value = numpy.asarray(value)
+    return device.send(value)
+
+
 class DictSummary(object):
 
     """Online summarization of a sequence of dictionaries.
@@ -333,10 +447,21 @@ class DictSummary(object):
     It only computes the statistics for scalar values and variables of scalar
     values in the dictionaries.
 
+    The scalars added at once are stacked into one vector for each device and
+    accumulated by a few vectorized operations. The statistics are kept on the
+    devices of the reported values, and no transfer to the host takes place
+    until the returned values of :meth:`compute_mean` or
+    :meth:`make_statistics` are converted by the caller.
+
     """
 
     def __init__(self):
-        self._summaries = collections.defaultdict(Summary)
+        self._names = []
+        self._buffers = {}
+        self._name_to_buffer = {}
+        # Statistics loaded from a snapshot, which are moved to a buffer when
+        # the name is reported again.
+        self._loaded = {}
 
     def add(self, d):
         """Adds a dictionary of scalars.
@@ -348,7 +473,8 @@ class DictSummary(object):
                is a tuple, the second element is interpreted as a weight.
 
         """
-        summaries = self._summaries
+        name_to_buffer = self._name_to_buffer
+        batches = collections.OrderedDict()
         for k, v in six.iteritems(d):
             w = 1
             if isinstance(v, tuple):
@@ -359,10 +485,41 @@ class DictSummary(object):
                 if not numpy.isscalar(w) and not getattr(w, 'ndim', -1) == 0:
                     raise ValueError(
                         'Given weight to {} was not scalar.'.format(k))
+                if isinstance(w, chainerx.ndarray):
+                    w = backend.from_chx(w.as_grad_stopped())
             if isinstance(v, variable.Variable):
                 v = v.array
-            if numpy.isscalar(v) or getattr(v, 'ndim', -1) == 0:
-                summaries[k].add(v, weight=w)
+            if not (numpy.isscalar(v) or getattr(v, 'ndim', -1) == 0):
+                continue
+            if isinstance(v, chainerx.ndarray):
+                # Accumulate ChainerX arrays with the memory-shared NumPy/CuPy
+                # arrays.
+                v = backend.from_chx(v.as_grad_stopped())
+
+            if _is_host_scalar(v):
+                device = _cpu_device
+            else:
+                device = backend.get_device_from_array(v)
+            buf = name_to_buffer.get(k)
+            if buf is None:
+                buf = self._buffers.get(device)
+                if buf is None:
+                    buf = self._buffers[device] = _SummaryBuffer(device)
+                name_to_buffer[k] = buf
+                if k not in self._loaded:
+                    self._names.append(k)
+            if buf.device != device:
+                v = _send_scalar(v, buf.device)
+
+            batch = batches.get(buf)
+            if batch is None:
+                batch = batches[buf] = ([], [], [])
+            batch[0].append(k)
+            batch[1].append(v)
+            batch[2].append(w)
+
+        for buf, (names, values, weights) in six.iteritems(batches):
+            buf.add(tuple(names), values, weights, self._loaded)
 
     def compute_mean(self):
         """Creates a dictionary of mean values.
@@ -374,8 +531,14 @@ class DictSummary(object):
             dict: Dictionary of mean values.
 
         """
-        return {name: summary.compute_mean()
-                for name, summary in six.iteritems(self._summaries)}
+        means = {}
+        for buf in six.itervalues(self._buffers):
+            mean = buf.compute_mean()
+            for name, slot in six.iteritems(buf.slots):
+                means[name] = mean[slot]
+        for name, (x, x2, n) in six.iteritems(self._loaded):
+            means[name] = x / n
+        return means
 
     def make_statistics(self):
         """Creates a dictionary of statistics.
@@ -390,27 +553,48 @@ class DictSummary(object):
 
         """
         stats = {}
-        for name, summary in six.iteritems(self._summaries):
-            mean, std = summary.make_statistics()
+        for buf in six.itervalues(self._buffers):
+            mean, std = buf.make_statistics()
+            for name, slot in six.iteritems(buf.slots):
+                stats[name] = mean[slot]
+                stats[name + '.std'] = std[slot]
+        for name, (x, x2, n) in six.iteritems(self._loaded):
+            mean = x / n
             stats[name] = mean
-            stats[name + '.std'] = std
+            stats[name + '.std'] = numpy.sqrt(x2 / n - mean * mean)
 
         return stats
 
     def serialize(self, serializer):
         if isinstance(serializer, serializer_module.Serializer):
-            names = list(self._summaries.keys())
+            names = self._names
             serializer('_names', json.dumps(names))
             for index, name in enumerate(names):
-                self._summaries[name].serialize(
-                    serializer['_summaries'][str(index)])
+                buf = self._name_to_buffer.get(name)
+                if buf is None:
+                    x, x2, n = self._loaded[name]
+                else:
+                    x, x2, n = buf.get(name)
+                s = serializer['_summaries'][str(index)]
+                s('_x', x)
+                s('_x2', x2)
+                s('_n', n)
         else:
-            self._summaries.clear()
+            self._names = []
+            self._buffers.clear()
+            self._name_to_buffer.clear()
+            self._loaded.clear()
             try:
                 names = json.loads(serializer('_names', ''))
             except KeyError:
                 warnings.warn('The names of statistics are not saved.')
                 return
             for index, name in enumerate(names):
-                self._summaries[name].serialize(
-                    serializer['_summaries'][str(index)])
+                s = serializer['_summaries'][str(index)]
+                try:
+                    stats = (s('_x', 0.0), s('_x2', 0.0), s('_n', 0.0))
+                except KeyError:
+                    warnings.warn('The previous statistics are not saved.')
+                    stats = (0.0, 0.0, 0.0)
+                self._names.append(name)
+                self._loaded[name] = stats
@@ -6,3 +6,4 @@ from chainer.serializers.npz import DictionarySerializer  # NOQA
 from chainer.serializers.npz import load_npz  # NOQA
 from chainer.serializers.npz import NpzDeserializer  # NOQA
 from chainer.serializers.npz import save_npz  # NOQA
+from chainer.serializers.npz import save_npz_sharded  # NOQA
@@ -1,3 +1,9 @@
+import json
+from multiprocessing import pool
+import os
+import struct
+import zipfile
+
 import numpy
 import six
 
@@ -20,6 +26,82 @@ if numpy.lib.NumpyVersion(numpy.__version__) >= '1.10.0':
     _allow_pickle_kwargs['allow_pickle'] = True
 
 
+class _MappedNpz(object):
+
+    """Read-only mapping of arrays memory-mapped from an uncompressed NPZ file.
+
+    Each member of the NPZ file is mapped on access without reading it into
+    memory. Members that cannot be mapped (e.g., object arrays) are read as
+    usual.
+
+    Args:
+        filename (str): Path to an NPZ file saved without compression.
+        mmap_mode (str): Mode of memory mapping. It is either ``'r'``
+            (read-only) or ``'c'`` (copy-on-write).
+
+    """
+
+    def __init__(self, filename, mmap_mode='r'):
+        if mmap_mode not in ('r', 'c'):
+            raise ValueError(
+                'mmap_mode must be either \'r\' or \'c\', not {}'.format(
+                    mmap_mode))
+        self.filename = filename
+        self.mmap_mode = mmap_mode
+        self._members = {}
+        with zipfile.ZipFile(filename) as zf:
+            for info in zf.infolist():
+                if not info.filename.endswith('.npy'):
+                    continue
+                if info.compress_type != zipfile.ZIP_STORED:
+                    raise ValueError(
+                        'cannot memory-map a compressed NPZ file: {}'.format(
+                            filename))
+                self._members[info.filename[:-4]] = info.header_offset
+        self._file = open(filename, 'rb')
+
+    def __contains__(self, key):
+        return key in self._members
+
+    def __getitem__(self, key):
+        f = self._file
+        header_offset = self._members[key]
+
+        # Skip the local file header of the zip member.
+        f.seek(header_offset)
+        local_header = f.read(30)
+        name_length, extra_length = struct.unpack('<HH', local_header[26:30])
+        member_offset = header_offset + 30 + name_length + extra_length
+
+        f.seek(member_offset)
+        version = numpy.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = \
+                numpy.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = \
+                numpy.lib.format.read_array_header_2_0(f)
+
+        if dtype.hasobject:
+            f.seek(member_offset)
+            return numpy.lib.format.read_array(f, **_allow_pickle_kwargs)
+        if numpy.prod(shape, dtype=numpy.int64) == 0:
+            return numpy.empty(shape, dtype=dtype)
+        # The returned view keeps the mapping alive.
+        return numpy.asarray(numpy.memmap(
+            self.filename, dtype=dtype, mode=self.mmap_mode, offset=f.tell(),
+            shape=shape, order='F' if fortran_order else 'C'))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 class DictionarySerializer(serializer.Serializer):
 
     """Serializer for dictionary.
@@ -114,6 +196,150 @@ def save_npz(file, obj, compression=True):
         numpy.savez(file, **target)
 
 
+_SHARDED_NPZ_MANIFEST = 'manifest.json'
+_SHARDED_NPZ_FORMAT = 'chainer.sharded_npz'
+
+
+def _split_into_shards(target, n_shards):
+    # Greedily assigns the largest remaining array to the lightest shard so
+    # that the shards have similar sizes.
+    nbytes = {key: numpy.asarray(value).nbytes
+              for key, value in six.iteritems(target)}
+    shards = [{} for _ in six.moves.range(n_shards)]
+    sizes = [0] * n_shards
+    for key in sorted(target, key=lambda k: -nbytes[k]):
+        i = sizes.index(min(sizes))
+        shards[i][key] = target[key]
+        sizes[i] += nbytes[key]
+    return [shard for shard in shards if shard]
+
+
+def save_npz_sharded(dirname, obj, n_shards=4, compression=True,
+                     n_threads=None):
+    """Saves an object to a directory of NPZ shards.
+
+    The serialized dictionary of the object is split into ``n_shards`` NPZ
+    files of similar sizes, which are written (and compressed) concurrently by
+    a thread pool. The directory also contains a manifest that records the
+    shard of each key. The saved directory can be loaded by :func:`load_npz`.
+
+    Args:
+        dirname (str): Target directory to write to. It is created if it does
+            not exist.
+        obj: Object to be serialized. It must support serialization protocol.
+            If it is a dictionary object, the serialization will be skipped.
+        n_shards (int): Number of NPZ files to split the object into.
+        compression (bool): If ``True``, compression in the resulting zip files
+            is enabled.
+        n_threads (int): Number of threads to write the shards. If ``None``,
+            it is equal to the number of shards.
+
+    .. seealso::
+        :func:`chainer.serializers.save_npz`,
+        :func:`chainer.serializers.load_npz`
+
+    """
+    if n_shards < 1:
+        raise ValueError('n_shards must be positive: {}'.format(n_shards))
+
+    if isinstance(obj, dict):
+        target = obj
+    else:
+        s = DictionarySerializer()
+        s.save(obj)
+        target = s.target
+
+    shards = _split_into_shards(target, n_shards)
+    names = ['shard_{}.npz'.format(i) for i in six.moves.range(len(shards))]
+
+    if not os.path.exists(dirname):
+        os.makedirs(dirname)
+
+    def save_shard(args):
+        name, shard = args
+        save_npz(os.path.join(dirname, name), shard, compression)
+
+    if n_threads is None:
+        n_threads = len(shards)
+    if n_threads > 1 and len(shards) > 1:
+        # zlib releases the GIL while compressing
+        thread_pool = pool.ThreadPool(min(n_threads, len(shards)))
+        try:
+            thread_pool.map(save_shard, zip(names, shards))
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+    else:
+        for args in zip(names, shards):
+            save_shard(args)
+
+    keys = {}
+    for i, shard in enumerate(shards):
+        for key in shard:
+            keys[key] = i
+    manifest = {
+        'format': _SHARDED_NPZ_FORMAT,
+        'shards': names,
+        'keys': keys,
+    }
+    # Write the manifest last so that a directory with a manifest is complete
+    with open(os.path.join(dirname, _SHARDED_NPZ_MANIFEST), 'w') as f:
+        json.dump(manifest, f)
+
+
+class _ShardedNpz(object):
+
+    """Read-only mapping of arrays in a directory saved by save_npz_sharded.
+
+    All the shards are read concurrently by a thread pool on construction.
+
+    """
+
+    def __init__(self, dirname, n_threads=None):
+        with open(os.path.join(dirname, _SHARDED_NPZ_MANIFEST)) as f:
+            manifest = json.load(f)
+        if manifest.get('format') != _SHARDED_NPZ_FORMAT:
+            raise ValueError(
+                'not a sharded NPZ directory: {}'.format(dirname))
+
+        def load_shard(name):
+            with numpy.load(os.path.join(dirname, name),
+                            **_allow_pickle_kwargs) as f:
+                return {key: f[key] for key in f.files}
+
+        names = manifest['shards']
+        if n_threads is None:
+            n_threads = len(names)
+        if n_threads > 1 and len(names) > 1:
+            thread_pool = pool.ThreadPool(min(n_threads, len(names)))
+            try:
+                shards = thread_pool.map(load_shard, names)
+            finally:
+                thread_pool.close()
+                thread_pool.join()
+        else:
+            shards = [load_shard(name) for name in names]
+
+        self._arrays = {}
+        for shard in shards:
+            self._arrays.update(shard)
+
+    def __contains__(self, key):
+        return key in self._arrays
+
+    def __getitem__(self, key):
+        return self._arrays[key]
+
+    def close(self):
+        self._arrays = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 class NpzDeserializer(serializer.Deserializer):
 
     """Deserializer for NPZ format.
@@ -134,22 +360,28 @@ class NpzDeserializer(serializer.Deserializer):
             going to be skipped.
             This can also be a list of callables and strings that behave as
             described above.
+        copy (bool): If ``False``, a NumPy array given as a value is not
+            overwritten but the array read from ``npz`` is returned instead,
+            provided that they have the same shape and dtype. It avoids a
+            copy when the arrays are memory-mapped (see :func:`load_npz`).
 
     """
 
-    def __init__(self, npz, path='', strict=True, ignore_names=None):
+    def __init__(self, npz, path='', strict=True, ignore_names=None,
+                 copy=True):
         self.npz = npz
         self.path = path
         self.strict = strict
         if ignore_names is None:
             ignore_names = []
         self.ignore_names = ignore_names
+        self.copy = copy
 
     def __getitem__(self, key):
         key = key.strip('/')
         return NpzDeserializer(
             self.npz, self.path + key + '/', strict=self.strict,
-            ignore_names=self.ignore_names)
+            ignore_names=self.ignore_names, copy=self.copy)
 
     def __call__(self, key, value):
         key = self.path + key.lstrip('/')
@@ -181,6 +413,10 @@ class NpzDeserializer(serializer.Deserializer):
             value_view = chainerx.to_numpy(value, copy=False)
             numpy.copyto(value_view, dataset)
         elif isinstance(value, numpy.ndarray):
+            if (not self.copy and isinstance(dataset, numpy.ndarray)
+                    and dataset.shape == value.shape
+                    and dataset.dtype == value.dtype):
+                return dataset
             numpy.copyto(value, dataset)
         elif isinstance(value, cuda.ndarray):
             value.set(numpy.asarray(dataset, dtype=value.dtype))
@@ -209,14 +445,17 @@ class NpzDeserializer(serializer.Deserializer):
         return value
 
 
-def load_npz(file, obj, path='', strict=True, ignore_names=None):
+def load_npz(file, obj, path='', strict=True, ignore_names=None,
+             mmap_mode=None, copy=True):
     """Loads an object from the file in NPZ format.
 
     This is a short-cut function to load from an `.npz` file that contains only
     one object.
 
     Args:
-        file (str or file-like): File to be loaded.
+        file (str or file-like): File to be loaded. It can also be a directory
+            saved by :func:`save_npz_sharded`, in which case the shards are
+            read concurrently.
         obj: Object to be deserialized. It must support serialization protocol.
         path (str): The path in the hierarchy of the serialized data under
             which the data is to be loaded. The default behavior (blank) will
@@ -231,12 +470,37 @@ def load_npz(file, obj, path='', strict=True, ignore_names=None):
             going to be skipped.
             This can also be a list of callables and strings that behave as
             described above.
+        mmap_mode (str): If ``'r'`` or ``'c'``, each array in the file is
+            memory-mapped in read-only or copy-on-write mode respectively and
+            copied directly into the destination without loading the whole
+            array into memory first. The file must be given by its name and
+            must be saved without compression, i.e., by :func:`save_npz` with
+            ``compression=False``.
+        copy (bool): If ``False``, parameters and persistent values on CPU
+            adopt the arrays read from the file instead of copying them.
+            Combined with ``mmap_mode='r'``, the parameters become read-only
+            views of the file, which is useful for models used only for
+            inference.
 
     .. seealso::
-        :func:`chainer.serializers.save_npz`
+        :func:`chainer.serializers.save_npz`,
+        :func:`chainer.serializers.save_npz_sharded`
 
     """
-    with numpy.load(file, **_allow_pickle_kwargs) as f:
+    if isinstance(file, six.string_types) and os.path.isdir(file):
+        if mmap_mode is not None:
+            raise ValueError('cannot memory-map a sharded NPZ directory')
+        npz = _ShardedNpz(file)
+    elif mmap_mode is None:
+        npz = numpy.load(file, **_allow_pickle_kwargs)
+    else:
+        if not isinstance(file, six.string_types):
+            raise TypeError(
+                'file must be a file name to use mmap_mode, not {}'.format(
+                    type(file)))
+        npz = _MappedNpz(file, mmap_mode)
+    with npz as f:
         d = NpzDeserializer(
-            f, path=path, strict=strict, ignore_names=ignore_names)
+            f, path=path, strict=strict, ignore_names=ignore_names,
+            copy=copy)
         d.load(obj)
@@ -1,4 +1,5 @@
 from chainer.training import extensions  # NOQA
+from chainer.training import step_profiler  # NOQA
 from chainer.training import triggers  # NOQA
 from chainer.training import updaters  # NOQA
 from chainer.training import util  # NOQA
@@ -9,6 +10,7 @@ from chainer.training.extension import make_extension  # NOQA
 from chainer.training.extension import PRIORITY_EDITOR  # NOQA
 from chainer.training.extension import PRIORITY_READER  # NOQA
 from chainer.training.extension import PRIORITY_WRITER  # NOQA
+from chainer.training.step_profiler import StepProfiler  # NOQA
 from chainer.training.trainer import Trainer  # NOQA
 from chainer.training.trigger import get_trigger  # NOQA
 from chainer.training.trigger import IntervalTrigger  # NOQA
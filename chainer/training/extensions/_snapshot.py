@@ -154,6 +154,8 @@ trigger=(1, 'epoch'))
 ThreadQueueWriter`
         - :class:`chainer.training.extensions.snapshot_writers.\
 ProcessQueueWriter`
+        - :class:`chainer.training.extensions.snapshot_writers.\
+ShardedWriter`
 
     .. seealso::
 
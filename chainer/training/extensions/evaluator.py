@@ -1,5 +1,7 @@
 import copy
 import datetime
+import sys
+import threading
 import warnings
 
 import six
@@ -20,7 +22,8 @@ from chainer.utils import argument
 class Evaluator(extension.Extension):
 
     """__init__(self, iterator, target, converter=convert.concat_examples, \
-device=None, eval_hook=None, eval_func=None, *, progress_bar=False)
+device=None, eval_hook=None, eval_func=None, *, progress_bar=False, \
+async_evaluation=False)
 
     Trainer extension to evaluate models on a validation set.
 
@@ -54,6 +57,29 @@ device=None, eval_hook=None, eval_func=None, *, progress_bar=False)
 
     This extension is called at the end of each epoch by default.
 
+    If ``async_evaluation`` is enabled, the evaluation runs in a background
+    thread while training proceeds. At each invocation the evaluator
+    snapshots the target links (their parameters and persistent values are
+    copied, so that subsequent updates do not affect the evaluation) and
+    starts evaluating the snapshot. The next validation batch is fetched and
+    converted in another thread while the current one is being evaluated.
+    The result of an asynchronous evaluation is reported at the next
+    invocation of the extension, i.e., it lags behind by one trigger
+    interval: the observation of the trainer, and hence
+    :class:`~chainer.training.extensions.LogReport`,
+    :class:`~chainer.training.extensions.PlotReport` and triggers such as
+    :class:`~chainer.training.triggers.EarlyStoppingTrigger`, see the
+    result of the previous evaluation. The iteration at which that evaluation
+    was triggered is not reported, but included in the dictionary returned by
+    the extension as ``<name>/iteration``. At the last iteration of the
+    training, which is determined by the training length of the stop trigger,
+    the evaluation runs synchronously and its result is reported instead of
+    the previous one. If the training stops otherwise (e.g., by early
+    stopping), the result of the evaluation still running can be obtained by
+    :meth:`wait` after :meth:`finalize` is called.
+    Note that a custom ``eval_func`` referring to the original links is
+    evaluated against the live parameters instead of the snapshot.
+
     Args:
         iterator: Dataset iterator for the validation dataset. It can also be
             a dictionary of iterators. If this is just an iterator, the
@@ -73,11 +99,14 @@ device=None, eval_hook=None, eval_func=None, *, progress_bar=False)
             which is similar to
             :class:`~chainer.training.extensions.ProgressBar`.
             (default: ``False``)
+        async_evaluation: Boolean flag to run the evaluation in a background
+            thread on a snapshot of the target links. It cannot be combined
+            with ``progress_bar``. (default: ``False``)
 
     .. warning::
 
-        The argument ``progress_bar`` is experimental.
-        The interface can change in the future.
+        The arguments ``progress_bar`` and ``async_evaluation`` are
+        experimental. The interface can change in the future.
 
     Attributes:
         converter: Converter function.
@@ -94,7 +123,11 @@ device=None, eval_hook=None, eval_func=None, *, progress_bar=False)
 
     def __init__(self, iterator, target, converter=convert.concat_examples,
                  device=None, eval_hook=None, eval_func=None, **kwargs):
-        progress_bar, = argument.parse_kwargs(kwargs, ('progress_bar', False))
+        progress_bar, async_evaluation = argument.parse_kwargs(
+            kwargs, ('progress_bar', False), ('async_evaluation', False))
+        if progress_bar and async_evaluation:
+            raise ValueError(
+                'progress_bar cannot be used with async_evaluation')
 
         if device is not None:
             device = backend.get_device(device)
@@ -113,6 +146,9 @@ device=None, eval_hook=None, eval_func=None, *, progress_bar=False)
         self.eval_func = eval_func
 
         self._progress_bar = progress_bar
+        self._async_evaluation = async_evaluation
+        self._async_job = None
+        self._async_result = None
 
         for key, iter in six.iteritems(iterator):
             if (isinstance(iter, (iterators.SerialIterator,
@@ -164,24 +200,95 @@ device=None, eval_hook=None, eval_func=None, *, progress_bar=False)
             reported by the evaluation function.
 
         """
-        # set up a reporter
+        if self._async_evaluation:
+            return self._call_async(trainer)
+
+        reporter = self._make_reporter(self._targets)
+        with reporter:
+            with configuration.using_config('train', False):
+                result = self.evaluate()
+
+        reporter_module.report(result)
+        return result
+
+    def _make_reporter(self, targets):
         reporter = reporter_module.Reporter()
         if self.name is not None:
             prefix = self.name + '/'
         else:
             prefix = ''
-        for name, target in six.iteritems(self._targets):
+        for name, target in six.iteritems(targets):
             reporter.add_observer(prefix + name, target)
             reporter.add_observers(prefix + name,
                                    target.namedlinks(skipself=True))
+        return reporter
 
-        with reporter:
-            with configuration.using_config('train', False):
-                result = self.evaluate()
+    def _call_async(self, trainer):
+        # Report the result of the previous evaluation (if any) and start a
+        # new one on a snapshot of the current targets.
+        result = self.wait()
+        if result is not None:
+            self._report_async_result(result)
 
-        reporter_module.report(result)
+        if trainer is None:
+            iteration = None
+        else:
+            iteration = trainer.updater.iteration
+            if _is_last_iteration(trainer):
+                # The result of an evaluation started now could not be
+                # reported before the training finishes.
+                reporter = self._make_reporter(self._targets)
+                with reporter:
+                    with configuration.using_config('train', False):
+                        result = self.evaluate()
+                reporter_module.report(result)
+                result[self._iteration_key()] = iteration
+                return result
+
+        targets = {name: _snapshot_link(target)
+                   for name, target in six.iteritems(self._targets)}
+        self._async_job = _AsyncEvaluation(self, targets, iteration)
+        return result
+
+    def _report_async_result(self, result):
+        # The iteration is not a metric, so it is kept out of the reports,
+        # e.g., so that LogReport does not average it.
+        key = self._iteration_key()
+        reporter_module.report(
+            {k: v for k, v in six.iteritems(result) if k != key})
+
+    def _iteration_key(self):
+        if self.name is not None:
+            return self.name + '/iteration'
+        return 'iteration'
+
+    def wait(self):
+        """Waits for the asynchronous evaluation and returns its result.
+
+        This method is only meaningful if ``async_evaluation`` is enabled. It
+        blocks until the running evaluation (if any) finishes, and returns
+        the result that has not been reported yet.
+
+        Returns:
+            dict: Result dictionary of the last asynchronous evaluation, or
+            ``None`` if there is no pending result. If the evaluation was
+            triggered by a trainer, the iteration at that time is included
+            as ``<name>/iteration``.
+
+        """
+        self._join_async_job()
+        result, self._async_result = self._async_result, None
         return result
 
+    def _join_async_job(self):
+        job, self._async_job = self._async_job, None
+        if job is None:
+            return
+        result = job.get()
+        if job.iteration is not None:
+            result[self._iteration_key()] = job.iteration
+        self._async_result = result
+
     def evaluate(self):
         """Evaluates the model and returns a result dictionary.
 
@@ -231,23 +338,36 @@ device=None, eval_hook=None, eval_func=None, *, progress_bar=False)
         if self._progress_bar:
             pbar = _IteratorProgressBar(iterator=it)
 
-        for batch in it:
-            observation = {}
-            with reporter_module.report_scope(observation):
-                in_arrays = convert._call_converter(
-                    self.converter, batch, self.device)
-                with function.no_backprop_mode():
-                    if isinstance(in_arrays, tuple):
-                        eval_func(*in_arrays)
-                    elif isinstance(in_arrays, dict):
-                        eval_func(**in_arrays)
+        if self._async_evaluation:
+            # Fetch and convert the next batch while evaluating the current.
+            batches = _prefetch_converted(it, self.converter, self.device)
+        else:
+            batches = it
+
+        try:
+            for batch in batches:
+                observation = {}
+                with reporter_module.report_scope(observation):
+                    if self._async_evaluation:
+                        in_arrays = batch
                     else:
-                        eval_func(in_arrays)
-
-            summary.add(observation)
-
-            if self._progress_bar:
-                pbar.update()
+                        in_arrays = convert._call_converter(
+                            self.converter, batch, self.device)
+                    with function.no_backprop_mode():
+                        if isinstance(in_arrays, tuple):
+                            eval_func(*in_arrays)
+                        elif isinstance(in_arrays, dict):
+                            eval_func(**in_arrays)
+                        else:
+                            eval_func(in_arrays)
+
+                summary.add(observation)
+
+                if self._progress_bar:
+                    pbar.update()
+        finally:
+            if self._async_evaluation:
+                batches.close()
 
         if self._progress_bar:
             pbar.close()
@@ -259,13 +379,111 @@ device=None, eval_hook=None, eval_func=None, *, progress_bar=False)
 
         This method calls the `finalize` method of each iterator that
         this evaluator has.
-        It is called at the end of training loops.
+        It is called at the end of training loops. If an asynchronous
+        evaluation is running, it waits for the evaluation to finish; the
+        result can then be retrieved by :meth:`wait`.
 
         """
+        self._join_async_job()
         for iterator in six.itervalues(self._iterators):
             iterator.finalize()
 
 
+def _is_last_iteration(trainer):
+    # Tells if the stop trigger of the trainer fires after this iteration,
+    # as far as it is known from the training length.
+    get_training_length = getattr(
+        trainer.stop_trigger, 'get_training_length', None)
+    if get_training_length is None:
+        return False
+    length, unit = get_training_length()
+    if unit == 'iteration':
+        return trainer.updater.iteration >= length
+    return trainer.updater.epoch_detail >= length
+
+
+def _snapshot_link(target):
+    snapshot = target.copy(mode='copy')
+    snapshot.cleargrads()
+    return snapshot
+
+
+class _AsyncEvaluation(object):
+
+    """Evaluation of a snapshot of targets running in a background thread."""
+
+    def __init__(self, evaluator, targets, iteration):
+        evaluator = copy.copy(evaluator)
+        evaluator._targets = targets
+        evaluator._async_job = None
+        evaluator._async_result = None
+        self._evaluator = evaluator
+        self.iteration = iteration
+
+        self._result = None
+        self._exc_info = None
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        evaluator = self._evaluator
+        try:
+            # Configuration and reporters are thread-local, so they are set
+            # up again in this thread.
+            reporter = evaluator._make_reporter(evaluator._targets)
+            with reporter:
+                with configuration.using_config('train', False):
+                    self._result = evaluator.evaluate()
+        except Exception:
+            self._exc_info = sys.exc_info()
+
+    def get(self):
+        self._thread.join()
+        if self._exc_info is not None:
+            six.reraise(*self._exc_info)
+        return self._result
+
+
+def _prefetch_converted(it, converter, device):
+    queue = six.moves.queue.Queue(maxsize=1)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except six.moves.queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for batch in it:
+                in_arrays = convert._call_converter(converter, batch, device)
+                if not put((True, in_arrays)):
+                    return
+            put((False, None))
+        except Exception:
+            put((None, sys.exc_info()))
+
+    thread = threading.Thread(target=produce)
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            status, value = queue.get()
+            if status is None:
+                six.reraise(*value)
+            if not status:
+                return
+            yield value
+    finally:
+        stop.set()
+        thread.join()
+
+
 class _IteratorProgressBar(util.ProgressBar):
 
     def __init__(self, iterator, bar_length=None, out=None):
@@ -1,13 +1,18 @@
+import collections
+
 import numpy
 import six
 
 import chainer
 from chainer import backend
+from chainer.backends import cuda
 from chainer import reporter
 from chainer.training import extension
 from chainer.training import trigger as trigger_module
 
 
+_percentile_q = (0.13, 2.28, 15.87, 50, 84.13, 97.72, 99.87)
+
 _default_statistics = {
     'mean': lambda x: backend.get_array_module(x).mean(x),
     'std': lambda x: backend.get_array_module(x).std(x),
@@ -15,10 +20,109 @@ _default_statistics = {
     'max': lambda x: backend.get_array_module(x).max(x),
     'zeros': lambda x: backend.get_array_module(x).count_nonzero(x == 0),
     'percentile': lambda x: backend.get_array_module(x).percentile(
-        x, (0.13, 2.28, 15.87, 50, 84.13, 97.72, 99.87))
+        x, _percentile_q)
 }
 
 
+def _segment_sum(xp, x, segment_ids, starts, dtype):
+    # Sums up each segment of a flat array. Segments must be non-empty.
+    if xp is numpy:
+        return numpy.add.reduceat(x, starts, dtype=dtype)
+    out = xp.zeros((len(starts),), dtype)
+    cuda.cupyx.scatter_add(out, segment_ids, x.astype(dtype, copy=False))
+    return out
+
+
+def _sort_segments(xp, flat, segment_ids):
+    # Sorts the values within each segment of a flat array.
+    if flat.dtype.itemsize > 4:
+        keys = xp.stack((flat, segment_ids.astype(flat.dtype)))
+        return flat[xp.lexsort(keys)]
+
+    # Map the bits of each value to an unsigned integer of the same order,
+    # and put the segment index in the upper bits, so that a single sort of
+    # integers sorts all segments.
+    sign = numpy.uint32(1 << 31)
+    bits = flat.astype(numpy.float32, copy=False).view(numpy.uint32)
+    bits = xp.where((bits & sign) != 0, ~bits, bits | sign)
+    keys = bits.astype(numpy.uint64)
+    keys |= segment_ids.astype(numpy.uint64) << numpy.uint64(32)
+    keys = xp.sort(keys)
+    bits = keys.astype(numpy.uint32)
+    bits = xp.where((bits & sign) != 0, bits ^ sign, ~bits)
+    return bits.view(numpy.float32)
+
+
+class _Segments(object):
+
+    # Layout of arrays of the same device and dtype concatenated into a flat
+    # array, which is reused while the sizes of the arrays do not change.
+
+    def __init__(self, device, sizes):
+        self.sizes = sizes
+        ends = numpy.cumsum(sizes)
+        starts = ends - sizes
+        self.starts = starts
+        segment_ids = numpy.repeat(numpy.arange(len(sizes)), sizes)
+        self.device_starts = device.send(starts)
+        self.device_sizes = device.send(numpy.asarray(sizes))
+        self.segment_ids = device.send(segment_ids)
+
+
+def _batched_statistics(xp, flat, segments, names):
+    # Computes the default statistics of all segments at once. Returns a
+    # dictionary from statistic names to arrays of the values of the
+    # segments, and a boolean array indicating segments including NaNs.
+    starts = segments.starts
+    sizes = segments.device_sizes
+    segment_ids = segments.segment_ids
+    ret = {}
+
+    has_nan = _segment_sum(
+        xp, xp.isnan(flat), segment_ids, starts, numpy.int64) > 0
+
+    if 'mean' in names or 'std' in names:
+        mean = _segment_sum(
+            xp, flat, segment_ids, starts, numpy.float64) / sizes
+        ret['mean'] = mean
+        if 'std' in names:
+            dev = flat - mean[segment_ids].astype(flat.dtype)
+            ret['std'] = xp.sqrt(_segment_sum(
+                xp, dev * dev, segment_ids, starts, numpy.float64) / sizes)
+
+    if 'zeros' in names:
+        ret['zeros'] = _segment_sum(
+            xp, flat == 0, segment_ids, starts, numpy.int64)
+
+    if 'percentile' in names or (
+            xp is not numpy and ('min' in names or 'max' in names)):
+        sorted_flat = _sort_segments(xp, flat, segment_ids)
+        device_starts = segments.device_starts
+        ret['min'] = sorted_flat[device_starts]
+        ret['max'] = sorted_flat[device_starts + sizes - 1]
+        if 'percentile' in names:
+            q = xp.asarray(_percentile_q, numpy.float64) / 100
+            # Linear interpolation as numpy.percentile does.
+            pos = q[None, :] * (sizes[:, None] - 1)
+            lower = xp.floor(pos).astype(numpy.int64)
+            upper = xp.minimum(lower + 1, sizes[:, None] - 1)
+            lower_value = sorted_flat[device_starts[:, None] + lower]
+            upper_value = sorted_flat[device_starts[:, None] + upper]
+            ret['percentile'] = (
+                lower_value + (upper_value - lower_value) * (pos - lower))
+    elif 'min' in names or 'max' in names:
+        ret['min'] = numpy.minimum.reduceat(flat, starts)
+        ret['max'] = numpy.maximum.reduceat(flat, starts)
+
+    # NaNs propagate to the order statistics as numpy does.
+    for name in ('min', 'max', 'percentile'):
+        if name in ret:
+            value = ret[name].astype(numpy.float64)
+            mask = has_nan if value.ndim == 1 else has_nan[:, None]
+            ret[name] = xp.where(mask, numpy.nan, value)
+    return ret, has_nan
+
+
 class ParameterStatistics(extension.Extension):
     """Trainer extension to report parameter statistics.
 
@@ -106,6 +210,9 @@ class ParameterStatistics(extension.Extension):
         self._trigger = trigger_module.get_trigger(trigger)
         self._summary = reporter.DictSummary()
         self._skip_nan_params = skip_nan_params
+        self._keys = {}
+        self._index_keys = {}
+        self._segments = {}
 
     def __call__(self, trainer):
         """Execute the statistics extension.
@@ -121,39 +228,40 @@ class ParameterStatistics(extension.Extension):
                 invoked this extension.
         """
         statistics = {}
+        functions = self._statistics
+        # The default statistics are computed for all parameters at once.
+        batched_names = [
+            name for name, function in six.iteritems(functions)
+            if _default_statistics.get(name) is function]
+        other_functions = [
+            (name, function) for name, function in six.iteritems(functions)
+            if name not in batched_names]
+
+        for attr_name in self._attrs:
+            groups = collections.OrderedDict()
+            for link in self._links:
+                link_name = getattr(link, 'name', 'None')
+                for param_name, param in link.namedparams():
+                    # Get parameters as a flattened one-dimensional array
+                    # since the statistics function should make no
+                    # assumption about the axes
+                    params = getattr(param, attr_name)
+                    if batched_names and self._can_batch(params):
+                        group = groups.setdefault(
+                            (param.device, params.dtype), [])
+                        group.append(
+                            (params, (link_name, param_name, attr_name)))
+                        function_items = other_functions
+                    else:
+                        function_items = list(six.iteritems(functions))
+                    if function_items:
+                        self._compute_statistics(
+                            statistics, params.ravel(), function_items,
+                            (link_name, param_name, attr_name))
 
-        for link in self._links:
-            link_name = getattr(link, 'name', 'None')
-            for param_name, param in link.namedparams():
-                for attr_name in self._attrs:
-                    for function_name, function in \
-                            six.iteritems(self._statistics):
-                        # Get parameters as a flattened one-dimensional array
-                        # since the statistics function should make no
-                        # assumption about the axes
-                        params = getattr(param, attr_name).ravel()
-                        if (self._skip_nan_params
-                            and (
-                                backend.get_array_module(params).isnan(params)
-                                .any())):
-                            value = numpy.nan
-                        else:
-                            value = function(params)
-                        key = self.report_key_template.format(
-                            prefix=self._prefix + '/' if self._prefix else '',
-                            link_name=link_name,
-                            param_name=param_name,
-                            attr_name=attr_name,
-                            function_name=function_name
-                        )
-                        if (isinstance(value, chainer.get_array_types())
-                                and value.size > 1):
-                            # Append integer indices to the keys if the
-                            # statistic function return multiple values
-                            statistics.update({'{}/{}'.format(key, i): v for
-                                               i, v in enumerate(value)})
-                        else:
-                            statistics[key] = value
+            for (device, dtype), group in six.iteritems(groups):
+                self._compute_batched_statistics(
+                    statistics, device, group, batched_names)
 
         self._summary.add(statistics)
 
@@ -161,6 +269,92 @@ class ParameterStatistics(extension.Extension):
             reporter.report(self._summary.compute_mean())
             self._summary = reporter.DictSummary()  # Clear summary
 
+    def _get_key(self, names, function_name):
+        key = self._keys.get((names, function_name))
+        if key is None:
+            link_name, param_name, attr_name = names
+            key = self.report_key_template.format(
+                prefix=self._prefix + '/' if self._prefix else '',
+                link_name=link_name,
+                param_name=param_name,
+                attr_name=attr_name,
+                function_name=function_name
+            )
+            self._keys[names, function_name] = key
+        return key
+
+    def _get_index_keys(self, key, n):
+        index_keys = self._index_keys.get(key)
+        if index_keys is None or len(index_keys) != n:
+            index_keys = ['{}/{}'.format(key, i) for i in six.moves.range(n)]
+            self._index_keys[key] = index_keys
+        return index_keys
+
+    @staticmethod
+    def _can_batch(params):
+        return (isinstance(params, (numpy.ndarray, cuda.ndarray))
+                and params.dtype.kind == 'f'
+                and params.size > 0)
+
+    def _compute_statistics(self, statistics, params, function_items,
+                            names):
+        has_nan = None
+        for function_name, function in function_items:
+            if self._skip_nan_params:
+                if has_nan is None:
+                    has_nan = bool(
+                        backend.get_array_module(params).isnan(params).any())
+            if has_nan:
+                value = numpy.nan
+            else:
+                value = function(params)
+            key = self._get_key(names, function_name)
+            if (isinstance(value, chainer.get_array_types())
+                    and value.size > 1):
+                # Append integer indices to the keys if the
+                # statistic function return multiple values
+                statistics.update(six.moves.zip(
+                    self._get_index_keys(key, value.size), value))
+            else:
+                statistics[key] = value
+
+    def _compute_batched_statistics(self, statistics, device, group,
+                                    function_names):
+        arrays = [params for params, _ in group]
+        sizes = numpy.array([params.size for params in arrays])
+        segments_key = device, arrays[0].dtype, len(sizes)
+        segments = self._segments.get(segments_key)
+        if segments is None or not numpy.array_equal(segments.sizes, sizes):
+            segments = _Segments(device, sizes)
+            self._segments[segments_key] = segments
+
+        xp = device.xp
+        with chainer.using_device(device):
+            flat = xp.concatenate([params.ravel() for params in arrays])
+            values, has_nan = _batched_statistics(
+                xp, flat, segments, function_names)
+        if xp is numpy:
+            values = {name: value.tolist()
+                      for name, value in six.iteritems(values)}
+        if self._skip_nan_params:
+            has_nan = backend.CpuDevice().send(has_nan).tolist()
+        else:
+            has_nan = None
+
+        for i, (_, names) in enumerate(group):
+            skip = has_nan is not None and has_nan[i]
+            for function_name in function_names:
+                key = self._get_key(names, function_name)
+                if skip:
+                    statistics[key] = numpy.nan
+                    continue
+                value = values[function_name][i]
+                if function_name == 'percentile':
+                    statistics.update(six.moves.zip(
+                        self._get_index_keys(key, len(value)), value))
+                else:
+                    statistics[key] = value
+
     def register_statistics(self, name, function):
         """Register a function to compute a certain statistic.
 
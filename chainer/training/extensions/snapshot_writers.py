@@ -293,3 +293,46 @@ class ProcessQueueWriter(QueueWriter):
 
     def create_consumer(self, q):
         return multiprocessing.Process(target=self.consume, args=(q,))
+
+
+class ShardedWriter(StandardWriter):
+    """Snapshot writer that saves a sharded checkpoint in a separate thread.
+
+    This class creates a new thread that saves the snapshot by
+    :func:`~chainer.serializers.save_npz_sharded`, which compresses the
+    shards concurrently in a thread pool. The snapshot is saved as a
+    directory named by ``filename``, which can be loaded by
+    :func:`~chainer.serializers.load_npz`.
+
+    Args:
+        n_shards (int): Number of NPZ files to split the snapshot into.
+        compression (bool): If ``True``, compression in the resulting zip files
+            is enabled.
+        n_threads (int): Number of threads to write the shards. If ``None``,
+            it is equal to the number of shards.
+
+    .. seealso::
+
+        - :meth:`chainer.training.extensions.snapshot`
+    """
+
+    def __init__(self, n_shards=4, compression=True, n_threads=None):
+        super(ShardedWriter, self).__init__(
+            savefun=npz.save_npz_sharded, n_shards=n_shards,
+            compression=compression, n_threads=n_threads)
+
+    def create_worker(self, filename, outdir, target, **kwds):
+        return threading.Thread(
+            target=self.save,
+            args=(filename, outdir, target, self._savefun),
+            kwargs=self._kwds)
+
+    def save(self, filename, outdir, target, savefun, **kwds):
+        prefix = 'tmp' + filename
+        with utils.tempdir(prefix=prefix, dir=outdir) as tmpdir:
+            tmppath = os.path.join(tmpdir, filename)
+            savefun(tmppath, target, **kwds)
+            path = os.path.join(outdir, filename)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            shutil.move(tmppath, path)
@@ -0,0 +1,194 @@
+import collections
+import contextlib
+import json
+import os
+import threading
+
+import six
+
+from chainer import _phase
+from chainer import reporter as reporter_module
+from chainer.training import trainer as trainer_module
+
+
+def get_current_profiler():
+    """Returns the step profiler activated in the current thread.
+
+    Returns:
+        StepProfiler: The innermost active profiler, or ``None`` if no
+        profiler is active.
+
+    """
+    profilers = _phase._get_phase_hooks()
+    if not profilers:
+        return None
+    return profilers[-1]
+
+
+def phase(name):
+    """Returns a context manager that times a phase of the current step.
+
+    The time spent in the ``with`` block is attributed to the phase ``name``
+    of the current :class:`StepProfiler`. If no profiler is active, this
+    function returns a context manager that does nothing, so that it can be
+    left in the code of updaters and optimizers without overhead.
+
+    Args:
+        name (str): Name of the phase.
+
+    """
+    return _phase.phase(name)
+
+
+class StepProfiler(object):
+
+    """Profiler of the breakdown of the time of each training step.
+
+    The step profiler measures the time of each phase of training steps:
+    ``data`` (waiting for the iterator), ``convert`` (the converter),
+    ``forward``, ``backward`` and ``update`` (the update rules and optimizer
+    hooks), and ``extension/<name>`` for every extension invoked by the
+    trainer. The total time of each step is recorded as ``step``.
+
+    It is enabled by passing it to :class:`~chainer.training.Trainer`. The
+    percentiles of the time of each phase over the last ``window`` steps are
+    reported at every iteration through the reporter of the trainer, under
+    the keys of the form ``<prefix>/<phase>/p<percentile>`` (in seconds).
+    The profiler can also be used manually as a context manager, in which
+    case :meth:`start_step` and :meth:`end_step` have to be called around
+    each step.
+
+    Phases are reported by :func:`phase`, which only touches the profiler
+    activated in the calling thread. The built-in updaters and optimizers
+    report their phases; custom update routines can add more phases by
+    ``with chainer.training.step_profiler.phase('name'):``. Phases can be
+    nested, e.g., the ``forward`` and ``backward`` phases of
+    :meth:`GradientMethod.update() <chainer.GradientMethod.update>` are
+    nested in the ``update`` phase of the updaters, and the time of a phase
+    excludes that of the phases nested in it.
+
+    Args:
+        window (int): Number of the recent steps over which percentiles are
+            computed.
+        percentiles (tuple of ints): Percentiles to report.
+        trace (bool): If ``True``, every timed phase is also recorded as an
+            event, which can be written as a Chrome trace by
+            :meth:`dump_trace`.
+        max_trace_events (int): Maximum number of the events kept for the
+            trace. Older events are discarded.
+        prefix (str): Prefix of the keys of the reported values.
+
+    """
+
+    def __init__(self, window=100, percentiles=(50, 95, 99), trace=False,
+                 max_trace_events=1000000, prefix='profile'):
+        if window <= 0:
+            raise ValueError('window must be positive')
+        self.window = window
+        self.percentiles = tuple(percentiles)
+        self.prefix = prefix
+        self._samples = collections.OrderedDict()
+        self._step = None
+        self._step_start = None
+        self._nested = []
+        if trace:
+            self._events = collections.deque(maxlen=max_trace_events)
+        else:
+            self._events = None
+
+    def __enter__(self):
+        _phase._get_phase_hooks().append(self)
+        return self
+
+    def __exit__(self, typ, value, traceback):
+        _phase._get_phase_hooks().pop()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Times the ``with`` block as the phase ``name``.
+
+        Phases can be nested, in which case the time of the inner phases is
+        excluded from that of the outer one.
+
+        """
+        nested = self._nested
+        nested.append(0.0)
+        start = trainer_module._get_time()
+        try:
+            yield
+        finally:
+            end = trainer_module._get_time()
+            inner = nested.pop()
+            if nested:
+                nested[-1] += end - start
+            self._record(name, start, end, end - start - inner)
+
+    def start_step(self):
+        """Starts a new step."""
+        self._step = collections.OrderedDict()
+        self._step_start = trainer_module._get_time()
+
+    def end_step(self):
+        """Ends the current step and adds its phases to the statistics."""
+        if self._step is None:
+            raise RuntimeError('step has not been started')
+        end = trainer_module._get_time()
+        self._record('step', self._step_start, end, end - self._step_start)
+        for name, elapsed in six.iteritems(self._step):
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = collections.deque(maxlen=self.window)
+                self._samples[name] = samples
+            samples.append(elapsed)
+        self._step = None
+
+    def _record(self, name, start, end, elapsed):
+        step = self._step
+        if step is not None:
+            step[name] = step.get(name, 0.0) + elapsed
+        if self._events is not None:
+            self._events.append(
+                (name, start, end, threading.current_thread().ident))
+
+    def get_statistics(self):
+        """Returns the percentiles of the time of each phase.
+
+        Percentiles are computed by the nearest-rank method over the recent
+        ``window`` steps in which the phase occurred.
+
+        Returns:
+            dict: Percentiles in seconds keyed by
+            ``<prefix>/<phase>/p<percentile>``.
+
+        """
+        stats = {}
+        for name, samples in six.iteritems(self._samples):
+            values = sorted(samples)
+            n = len(values)
+            for q in self.percentiles:
+                index = min(n - 1, int(q * n / 100.0))
+                key = '{}/{}/p{}'.format(self.prefix, name, q)
+                stats[key] = values[index]
+        return stats
+
+    def report(self):
+        """Reports the statistics to the current reporter."""
+        reporter_module.report(self.get_statistics())
+
+    def dump_trace(self, path):
+        """Writes the recorded events in the Chrome trace event format.
+
+        The output can be loaded by ``chrome://tracing`` or Perfetto.
+
+        Args:
+            path (str): Path of the output JSON file.
+
+        """
+        if self._events is None:
+            raise RuntimeError('trace is not enabled')
+        pid = os.getpid()
+        events = [{'name': name, 'ph': 'X', 'pid': pid, 'tid': tid,
+                   'ts': start * 1e6, 'dur': (end - start) * 1e6}
+                  for name, start, end, tid in self._events]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events}, f)
@@ -126,6 +126,10 @@ class Trainer(object):
             If it is not callable, it is passed to :class:`IntervalTrigger`.
         out: Output directory.
         extensions: Extensions registered to the trainer.
+        profiler (~chainer.training.StepProfiler): Step profiler to measure
+            the breakdown of the time of each iteration. If it is given, the
+            percentiles of the time of each phase and extension are reported
+            at every iteration. See :class:`~chainer.training.StepProfiler`.
 
     Attributes:
         updater: The updater object for this trainer.
@@ -136,15 +140,17 @@ class Trainer(object):
             :class:`Reporter` class for details.
         out: Output directory.
         reporter: Reporter object to report observed values.
+        profiler: The step profiler, or ``None`` if profiling is disabled.
 
     """
 
     def __init__(self, updater, stop_trigger=None, out='result',
-                 extensions=None):
+                 extensions=None, profiler=None):
         self.updater = updater
         self.stop_trigger = trigger_module.get_trigger(stop_trigger)
         self.observation = {}
         self.out = out
+        self.profiler = profiler
         if extensions is None:
             extensions = []
 
@@ -337,13 +343,16 @@ class Trainer(object):
 
         # main training loop
         try:
-            while not stop_trigger(self):
-                self.observation = {}
-                with reporter.scope(self.observation):
-                    update()
-                    for name, entry in extensions:
-                        if entry.trigger(self):
-                            entry.extension(self)
+            if self.profiler is None:
+                while not stop_trigger(self):
+                    self.observation = {}
+                    with reporter.scope(self.observation):
+                        update()
+                        for name, entry in extensions:
+                            if entry.trigger(self):
+                                entry.extension(self)
+            else:
+                self._run_profiled_loop(extensions)
         except Exception as e:
             if show_loop_exception_msg:
                 # Show the exception here, as it will appear as if chainer
@@ -384,6 +393,27 @@ class Trainer(object):
         self._final_elapsed_time = self.elapsed_time
         self._done = True
 
+    def _run_profiled_loop(self, extensions):
+        update = self.updater.update
+        reporter = self.reporter
+        stop_trigger = self.stop_trigger
+        profiler = self.profiler
+
+        with profiler:
+            while not stop_trigger(self):
+                self.observation = {}
+                with reporter.scope(self.observation):
+                    profiler.start_step()
+                    update()
+                    # Statistics of the preceding steps are reported before
+                    # the extensions so that they can read them.
+                    profiler.report()
+                    for name, entry in extensions:
+                        if entry.trigger(self):
+                            with profiler.phase('extension/' + name):
+                                entry.extension(self)
+                    profiler.end_step()
+
     def serialize(self, serializer):
         self.updater.serialize(serializer['updater'])
         if hasattr(self.stop_trigger, 'serialize'):
@@ -0,0 +1,389 @@
+import multiprocessing
+from multiprocessing import sharedctypes  # type: ignore
+import traceback
+
+import numpy
+import six
+
+import chainer
+from chainer.dataset import convert
+from chainer import reporter
+from chainer.training import step_profiler
+from chainer.training.updaters import multiprocess_parallel_updater
+from chainer.training.updaters import standard_updater
+
+
+class _SharedBuffers(object):
+
+    # Shared memory of the flattened gradients of all the processes, the
+    # reduced gradients and the parameters of the master model.
+
+    def __init__(self, n_processes, size, dtype):
+        self.n_processes = n_processes
+        self.size = size
+        self.dtype = numpy.dtype(dtype)
+        nbytes = size * self.dtype.itemsize
+        self.raw_grads = sharedctypes.RawArray('b', n_processes * nbytes)
+        self.raw_reduced = sharedctypes.RawArray('b', nbytes)
+        self.raw_params = sharedctypes.RawArray('b', nbytes)
+        # Boundaries of the chunks that each process reduces.
+        self.bounds = [size * i // n_processes
+                       for i in six.moves.range(n_processes + 1)]
+        self._views = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_views'] = None
+        return state
+
+    def _get_views(self):
+        if self._views is None:
+            grads = numpy.frombuffer(self.raw_grads, self.dtype).reshape(
+                self.n_processes, self.size)
+            reduced = numpy.frombuffer(self.raw_reduced, self.dtype)
+            params = numpy.frombuffer(self.raw_params, self.dtype)
+            self._views = grads, reduced, params
+        return self._views
+
+    @property
+    def grads(self):
+        return self._get_views()[0]
+
+    @property
+    def reduced(self):
+        return self._get_views()[1]
+
+    @property
+    def params(self):
+        return self._get_views()[2]
+
+    def reduce_chunk(self, proc_id):
+        # Reduce-scatter: each process averages its own chunk of the
+        # gradients over all the processes.
+        s = slice(self.bounds[proc_id], self.bounds[proc_id + 1])
+        reduced = self.reduced[s]
+        numpy.sum(self.grads[:, s], axis=0, out=reduced)
+        reduced /= self.n_processes
+
+
+class _Worker(multiprocessing.Process):
+
+    def __init__(self, proc_id, pipe, master):
+        super(_Worker, self).__init__()
+        self.proc_id = proc_id
+        self.pipe = pipe
+        self.converter = master.converter
+        self.model = master._master
+        self.device = master._devices[proc_id]
+        self.iterator = master._mpu_iterators[proc_id]
+        self.buffers = master._buffers
+
+    def setup(self):
+        self.model.to_device(self.device)
+        self.reporter = reporter.Reporter()
+        self.reporter.add_observer('main', self.model)
+        self.reporter.add_observers('main',
+                                    self.model.namedlinks(skipself=True))
+
+    def run(self):
+        try:
+            self.setup()
+            while True:
+                job, data = self.pipe.recv()
+                if job == 'finalize':
+                    break
+                if job == 'update':
+                    self.update()
+        except Exception:
+            self.pipe.send(('error', traceback.format_exc()))
+
+    def update(self):
+        # All-gather: parameters updated by the master
+        scatter_params(self.model, self.buffers.params)
+
+        self.model.cleargrads()
+        batch = self.converter(self.iterator.next(), self.device)
+        with self.reporter.scope({}):  # pass dummy observation
+            loss = multiprocess_parallel_updater._calc_loss(self.model, batch)
+        self.model.cleargrads()
+        loss.backward()
+        del loss
+
+        gather_grads(self.model, self.buffers.grads[self.proc_id])
+        self.pipe.send(('gathered', None))
+        job, _ = self.pipe.recv()
+        if job != 'reduce':
+            raise RuntimeError('Unexpected job: {}'.format(job))
+        self.buffers.reduce_chunk(self.proc_id)
+        self.pipe.send(('reduced', None))
+
+
+class CpuMultiprocessParallelUpdater(standard_updater.StandardUpdater):
+
+    """Implementation of a multiprocess parallel CPU Updater.
+
+    This is a variant of
+    :class:`~chainer.training.updaters.MultiprocessParallelUpdater` that
+    uses multiple processes on CPU devices. It forks a worker process for
+    each device except for the master, and exchanges the flattened gradients
+    and parameters through shared memory instead of NCCL.
+
+    In each update, every process computes the gradients of its own
+    mini-batch and writes them to the shared memory. Then each process
+    averages a separate chunk of the gradients over all the processes
+    (reduce-scatter), and the master updates the parameters with the
+    averaged gradients. The updated parameters are read by the workers at
+    the beginning of the next update.
+
+    Since the gradients are averaged over the processes, the update is
+    equivalent to that of :class:`~chainer.training.updaters.StandardUpdater`
+    with the concatenated mini-batch if the loss is averaged over the
+    examples, and hyperparameters of the optimizer are not modified.
+
+    Each process computes with NumPy, which may use multiple threads.
+    Limiting the number of threads of each process (e.g., by the
+    ``OMP_NUM_THREADS`` environment variable) avoids oversubscription of CPU
+    cores.
+
+    It does not transfer the values collected by :class:`Reporter` in the
+    workers to the master. So you can only see the reported values in the
+    master process.
+
+    Args:
+        iterators: List of dataset iterator for the training dataset. The
+            number of the iterators must be same to the number of processes.
+        optimizer: Optimizer to update parameters. The model should be attached
+            to the optimizer.
+        converter: Converter function to build input arrays. Each batch
+            extracted by the iterator is passed with corresponding ``device``
+            option to this function.
+            :func:`~chainer.dataset.concat_examples` is used by default.
+        devices: Dictionary or list of CPU devices, one for each process. The
+            master device will be the first one in the list or the value
+            attached to the key ``'main'``. If ``None``, the NumPy device is
+            used for all the processes.
+        auto_new_epoch (bool): If ``True``,
+            :meth:`~chainer.Optimizer.new_epoch` of the main optimizer is
+            automatically called when the ``is_new_epoch`` attribute of the
+            main iterator is ``True``.
+
+    """
+
+    def __init__(self, iterators, optimizer, converter=convert.concat_examples,
+                 devices=None, auto_new_epoch=True):
+        if devices is None:
+            devices = ['@numpy'] * len(iterators)
+        if isinstance(devices, dict):
+            devices = devices.copy()
+            main = devices.pop('main')
+            devices = [main] + list(six.itervalues(devices))
+        elif isinstance(devices, (list, tuple)):
+            devices = list(devices)
+        else:
+            raise ValueError(
+                'devices argument should be either dict, list or tuple,'
+                ' but {} was given.'.format(type(devices)))
+
+        devices = [chainer.get_device(device) for device in devices]
+        for device in devices:
+            if device.xp is not numpy:
+                raise ValueError(
+                    'CpuMultiprocessParallelUpdater only supports CPU '
+                    'devices, but {} was given.'.format(device))
+        if len(iterators) != len(devices):
+            raise ValueError(
+                'The number of iterators must be same to the number of '
+                'devices.')
+        for iterator in iterators[1:]:
+            assert len(iterator.dataset) == len(iterators[0].dataset)
+
+        super(CpuMultiprocessParallelUpdater, self).__init__(
+            iterator=iterators[0],
+            optimizer=optimizer,
+            converter=converter,
+            auto_new_epoch=auto_new_epoch,
+        )
+
+        self._master = optimizer.target
+        self._devices = devices
+        self._mpu_iterators = iterators
+        self._initialized = False
+
+        self._buffers = None
+        self._pipes = []
+        self._workers = []
+
+    def _send_message(self, message):
+        for pipe in self._pipes:
+            pipe.send(message)
+
+    def _receive_messages(self, expected):
+        for pipe in self._pipes:
+            job, data = pipe.recv()
+            if job == 'error':
+                raise RuntimeError(
+                    'An error occurred in a worker process:\n' + data)
+            if job != expected:
+                raise RuntimeError('Unexpected message: {}'.format(job))
+
+    def setup_workers(self):
+        if self._initialized:
+            return
+        self._initialized = True
+
+        self._master.to_device(self._devices[0])
+        self._master.cleargrads()
+        size, dtype = _get_size_and_dtype(self._master)
+        self._buffers = _SharedBuffers(len(self._devices), size, dtype)
+
+        for i in six.moves.range(1, len(self._devices)):
+            pipe, worker_end = multiprocessing.Pipe()
+            worker = _Worker(i, worker_end, self)
+            worker.start()
+            worker_end.close()
+            self._workers.append(worker)
+            self._pipes.append(pipe)
+
+    def update_core(self):
+        self.setup_workers()
+
+        buffers = self._buffers
+        gather_params(self._master, buffers.params)
+        self._send_message(('update', None))
+
+        with chainer.using_device(self._devices[0]):
+            # For reducing memory
+            self._master.cleargrads()
+
+            optimizer = self.get_optimizer('main')
+            iterator = self.get_iterator('main')
+            with step_profiler.phase('data'):
+                batch = iterator.next()
+            with step_profiler.phase('convert'):
+                batch = self.converter(batch, self._devices[0])
+
+            with step_profiler.phase('forward'):
+                loss = multiprocess_parallel_updater._calc_loss(
+                    self._master, batch)
+
+            with step_profiler.phase('backward'):
+                self._master.cleargrads()
+                loss.backward()
+                del loss
+
+            if self._workers:
+                with step_profiler.phase('allreduce'):
+                    gather_grads(self._master, buffers.grads[0])
+                    self._receive_messages('gathered')
+                    self._send_message(('reduce', None))
+                    buffers.reduce_chunk(0)
+                    self._receive_messages('reduced')
+                    scatter_grads(self._master, buffers.reduced)
+
+            with step_profiler.phase('update'):
+                optimizer.update()
+
+            if self.auto_new_epoch and iterator.is_new_epoch:
+                optimizer.new_epoch(auto=True)
+
+    def finalize(self):
+        for pipe in self._pipes:
+            try:
+                pipe.send(('finalize', None))
+            except (IOError, OSError):
+                pass  # the worker has already exited due to an error
+
+        for worker in self._workers:
+            worker.join()
+
+
+def _iter_params(link):
+    for _, param in sorted(link.namedparams()):
+        if param.size:
+            yield param
+
+
+def _get_size_and_dtype(link):
+    size = 0
+    dtypes = []
+    for param in link.params():
+        if param.array is None:
+            raise RuntimeError(
+                'CpuMultiprocessParallelUpdater requires all the parameters '
+                'to be initialized before the update.')
+        size += param.size
+        dtypes.append(param.dtype)
+    # Gradients are reduced in single precision at least.
+    dtype = numpy.promote_types(
+        numpy.result_type(numpy.float16, *dtypes), numpy.float32)
+    return size, dtype
+
+
+def _gather(link, target, out):
+    offset = 0
+    for param in _iter_params(link):
+        size = param.size
+        d = getattr(param, target)
+        if d is None:
+            out[offset:offset + size] = 0
+        elif isinstance(d, chainer.utils.RowSparseArray):
+            out[offset:offset + size] = d.to_dense().ravel()
+        else:
+            out[offset:offset + size] = d.ravel()
+        offset += size
+
+
+def _scatter(link, array, target):
+    offset = 0
+    for param in _iter_params(link):
+        size = param.size
+        d = getattr(param, target)
+        if d is None:
+            d = numpy.empty(param.shape, param.dtype)
+            setattr(param, target, d)
+        d[...] = array[offset:offset + size].reshape(param.shape)
+        offset += size
+
+
+def gather_grads(link, out):
+    """Copies all gradient arrays of a link to a flat array.
+
+    Gradients which are ``None`` are regarded as zeros.
+
+    Args:
+        link (chainer.link.Link): Target link object.
+        out (numpy.ndarray): One-dimensional array to which the gradients are
+            written.
+    """
+    _gather(link, 'grad', out)
+
+
+def gather_params(link, out):
+    """Copies all parameter arrays of a link to a flat array.
+
+    Args:
+        link (chainer.link.Link): Target link object.
+        out (numpy.ndarray): One-dimensional array to which the parameters
+            are written.
+    """
+    _gather(link, 'data', out)
+
+
+def scatter_grads(link, array):
+    """Puts back contents of a flat array to the gradient arrays of a link.
+
+    Args:
+        link (chainer.link.Link): Target link object.
+        array (numpy.ndarray): Flat array written by :func:`gather_grads`.
+    """
+    _scatter(link, array, 'grad')
+
+
+def scatter_params(link, array):
+    """Puts back contents of a flat array to the parameter arrays of a link.
+
+    Args:
+        link (chainer.link.Link): Target link object.
+        array (numpy.ndarray): Flat array written by :func:`gather_params`.
+    """
+    _scatter(link, array, 'data')
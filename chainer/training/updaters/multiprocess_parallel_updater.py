@@ -8,6 +8,7 @@ import chainer
 from chainer.backends import cuda
 from chainer.dataset import convert
 from chainer import reporter
+from chainer.training import step_profiler
 from chainer.training.updaters import standard_updater
 
 
@@ -249,7 +250,8 @@ class MultiprocessParallelUpdater(standard_updater.StandardUpdater):
                                  0, null_stream.ptr)
                 scatter_grads(self._master, gg)
                 del gg
-            optimizer.update()
+            with step_profiler.phase('update'):
+                optimizer.update()
             if self.comm is not None:
                 gp = gather_params(self._master)
                 nccl_data_type = _get_nccl_data_type(gp.dtype)
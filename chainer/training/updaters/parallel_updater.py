@@ -5,6 +5,7 @@ import six
 import chainer
 from chainer.dataset import convert
 from chainer import function
+from chainer.training import step_profiler
 from chainer.training.updaters import standard_updater
 
 
@@ -146,7 +147,8 @@ class ParallelUpdater(standard_updater.StandardUpdater):
         for model in six.itervalues(models_others):
             model_main.addgrads(model)
 
-        optimizer.update()
+        with step_profiler.phase('update'):
+            optimizer.update()
 
         for model in six.itervalues(models_others):
             model.copyparams(model_main)
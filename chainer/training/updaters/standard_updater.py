@@ -5,6 +5,7 @@ from chainer.backends import cuda
 from chainer.dataset import convert
 from chainer.dataset import iterator as iterator_module
 from chainer.training import _updater
+from chainer.training import step_profiler
 from chainer.utils import argument
 
 
@@ -207,19 +208,23 @@ loss_func=None, loss_scale=None, auto_new_epoch=True, *, input_device=None)
 
     def update_core(self):
         iterator = self._iterators['main']
-        batch = iterator.next()
-        in_arrays = convert._call_converter(
-            self.converter, batch, self.input_device)
+        with step_profiler.phase('data'):
+            batch = iterator.next()
+        with step_profiler.phase('convert'):
+            in_arrays = convert._call_converter(
+                self.converter, batch, self.input_device)
 
         optimizer = self._optimizers['main']
         loss_func = self.loss_func or optimizer.target
 
-        if isinstance(in_arrays, tuple):
-            optimizer.update(loss_func, *in_arrays)
-        elif isinstance(in_arrays, dict):
-            optimizer.update(loss_func, **in_arrays)
-        else:
-            optimizer.update(loss_func, in_arrays)
+        # The optimizer times the forward and backward phases nested in it.
+        with step_profiler.phase('update'):
+            if isinstance(in_arrays, tuple):
+                optimizer.update(loss_func, *in_arrays)
+            elif isinstance(in_arrays, dict):
+                optimizer.update(loss_func, **in_arrays)
+            else:
+                optimizer.update(loss_func, in_arrays)
 
         if self.auto_new_epoch and iterator.is_new_epoch:
             optimizer.new_epoch(auto=True)
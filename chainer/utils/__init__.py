@@ -9,6 +9,9 @@ import six
 
 import chainer
 # import classes and functions
+from chainer.utils.array import add_at  # NOQA
+from chainer.utils.array import scatter_add_rows  # NOQA
+from chainer.utils.array import segment_sum_rows  # NOQA
 from chainer.utils.array import size_of_shape  # NOQA
 from chainer.utils.array import sum_to  # NOQA
 from chainer.utils.conv import get_conv_outsize  # NOQA
@@ -20,6 +23,7 @@ from chainer.utils.meta import final  # NOQA
 from chainer.utils.nondeterministic import nondeterministic  # NOQA
 from chainer.utils.sparse import CooMatrix  # NOQA
 from chainer.utils.sparse import get_order  # NOQA
+from chainer.utils.sparse import RowSparseArray  # NOQA
 from chainer.utils.sparse import to_coo  # NOQA
 
 # The following alias has been moved to chainer/__init__.py in order to break
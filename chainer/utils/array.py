@@ -63,3 +63,134 @@ def sum_to(x, shape):
     if lead > 0:
         y = y.squeeze(lead_axis)
     return y
+
+
+def segment_sum_rows(indices, values, ignore_label=None):
+    """Sums the rows of values that share the same index.
+
+    The indices are sorted once by a stable sort, and the values of each
+    index are summed with :func:`numpy.add.reduceat` in the order in which
+    they appear, so the result is deterministic.
+
+    Args:
+        indices (numpy.ndarray): Integer array of row indices.
+        values (numpy.ndarray): Array of shape
+            ``indices.shape + row_shape``.
+        ignore_label (int or None): Index whose values are skipped.
+
+    Returns:
+        tuple: A pair of the sorted unique indices and the array of shape
+        ``(len(unique_indices),) + row_shape`` holding the sum of the values
+        of each index. The latter is a new array even if the indices are
+        already sorted and unique, so it can be modified in place.
+
+    """
+    indices = numpy.asarray(indices)
+    row_shape = values.shape[indices.ndim:]
+    indices = indices.ravel()
+    values = values.reshape((indices.size,) + row_shape)
+    copied = False
+    if ignore_label is not None:
+        mask = indices != ignore_label
+        indices = indices[mask]
+        values = values[mask]
+        copied = True
+    if indices.size == 0:
+        return indices, values.copy()
+
+    if (indices[1:] < indices[:-1]).any():
+        order = numpy.argsort(indices, kind='mergesort')
+        indices = indices[order]
+        values = values[order]
+        copied = True
+    starts = numpy.flatnonzero(numpy.concatenate(
+        ([True], indices[1:] != indices[:-1])))
+    if len(starts) == len(indices):
+        if not copied:
+            values = values.copy()
+        return indices, values
+    return indices[starts], numpy.add.reduceat(values, starts, axis=0)
+
+
+def scatter_add_rows(a, indices, values, ignore_label=None):
+    """Adds values to the rows of an array in place.
+
+    This is equivalent to ``numpy.add.at(a, indices, values)`` except that
+    values whose index is ``ignore_label`` are skipped, but is much faster
+    for a large number of indices. See :func:`segment_sum_rows` for the
+    algorithm. Negative indices count from the end of ``a``.
+
+    Args:
+        a (numpy.ndarray): Array to update.
+        indices (numpy.ndarray): Integer array of indices of the first axis
+            of ``a``.
+        values (numpy.ndarray): Array of shape
+            ``indices.shape + a.shape[1:]``.
+        ignore_label (int or None): Index whose values are skipped.
+
+    Returns:
+        numpy.ndarray: ``a``.
+
+    """
+    indices = numpy.asarray(indices)
+    values = values.reshape((indices.size,) + a.shape[1:])
+    indices = indices.ravel()
+    if ignore_label is not None:
+        mask = indices != ignore_label
+        indices = indices[mask]
+        values = values[mask]
+    if (indices < 0).any():
+        # Different indices of the same row have to be summed together.
+        indices = numpy.where(indices < 0, indices + len(a), indices)
+    rows, sums = segment_sum_rows(indices, values)
+    a[rows] += sums
+    return a
+
+
+def _get_row_index(a, slices):
+    # Returns the axis and the indices if ``slices`` selects ``a`` only by
+    # an integer array along one axis, and ``None`` otherwise.
+    if not isinstance(slices, tuple):
+        slices = slices,
+    if len(slices) > a.ndim:
+        return None
+    axis = indices = None
+    for i, s in enumerate(slices):
+        if isinstance(s, slice) and s == slice(None):
+            continue
+        if indices is None and isinstance(s, (numpy.ndarray, list)):
+            s = numpy.asarray(s)
+            if s.dtype.kind in 'iu' and s.ndim >= 1:
+                axis, indices = i, s
+                continue
+        return None
+    if indices is None:
+        return None
+    return axis, indices
+
+
+def add_at(a, slices, b):
+    """Performs unbuffered in place addition like :func:`numpy.add.at`.
+
+    If ``slices`` selects ``a`` only by an integer array along one axis
+    (e.g., ``a[indices]`` or ``a[:, indices]``), :func:`scatter_add_rows` is
+    used instead of :func:`numpy.add.at`, which is slow for a large number
+    of indices.
+
+    Args:
+        a (numpy.ndarray): Array to update.
+        slices: Index of ``a`` as accepted by :func:`numpy.add.at`.
+        b (numpy.ndarray): Values to add.
+
+    """
+    row_index = _get_row_index(a, slices)
+    if row_index is not None:
+        axis, indices = row_index
+        expected_shape = a.shape[:axis] + indices.shape + a.shape[axis + 1:]
+        if b.shape == expected_shape:
+            b = numpy.moveaxis(
+                b, list(six.moves.range(axis, axis + indices.ndim)),
+                list(six.moves.range(indices.ndim)))
+            scatter_add_rows(numpy.moveaxis(a, axis, 0), indices, b)
+            return
+    numpy.add.at(a, slices, b)
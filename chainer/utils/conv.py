@@ -1,3 +1,6 @@
+import itertools
+import threading
+
 import numpy
 import six
 
@@ -73,19 +76,9 @@ def im2col_cpu(
         out_w = get_conv_outsize(w, kw, sx, pw, cover_all, dx)
     assert out_w > 0, 'Width in the output should be positive.'
 
-    img = numpy.pad(img,
-                    ((0, 0), (0, 0), (ph, ph + sy - 1), (pw, pw + sx - 1)),
-                    mode='constant', constant_values=(pval,))
-    col = numpy.ndarray((n, c, kh, kw, out_h, out_w), dtype=img.dtype)
-
-    for j in six.moves.range(kh):
-        jdy = j * dy
-        j_lim = jdy + sy * out_h
-        for i in six.moves.range(kw):
-            idx = i * dx
-            i_lim = idx + sx * out_w
-            col[:, :, j, i, :, :] = img[:, :, jdy:j_lim:sy, idx:i_lim:sx]
-
+    col = numpy.empty((n, c, kh, kw, out_h, out_w), dtype=img.dtype)
+    col[...] = im2col_view_cpu(
+        img, (kh, kw), (sy, sx), (ph, pw), (out_h, out_w), (dy, dx), pval)
     return col
 
 
@@ -132,17 +125,10 @@ def im2col(img, kh, kw, sy, sx, ph, pw, cover_all=False, dy=1, dx=1,
 
 
 def col2im_cpu(col, sy, sx, ph, pw, h, w, dy=1, dx=1):
-    n, c, kh, kw, out_h, out_w = col.shape
-    img = numpy.zeros((n, c, h + 2 * ph + sy - 1, w + 2 * pw + sx - 1),
-                      dtype=col.dtype)
-    for j in six.moves.range(kh):
-        jdy = j * dy
-        j_lim = jdy + sy * out_h
-        for i in six.moves.range(kw):
-            idx = i * dx
-            i_lim = idx + sx * out_w
-            img[:, :, jdy:j_lim:sy, idx:i_lim:sx] += col[:, :, j, i]
-    return img[:, :, ph:h + ph, pw:w + pw]
+    n, c = col.shape[:2]
+    img = numpy.zeros((n, c, h, w), dtype=col.dtype)
+    col2im_add_cpu(col, (sy, sx), (ph, pw), (dy, dx), img)
+    return img
 
 
 def col2im_gpu(col, sy, sx, ph, pw, h, w, dy=1, dx=1):
@@ -182,3 +168,467 @@ def col2im_gpu(col, sy, sx, ph, pw, h, w, dy=1, dx=1):
 def col2im(col, sy, sx, ph, pw, h, w, dy=1, dx=1):
     fn = col2im_gpu if isinstance(col, cuda.ndarray) else col2im_cpu
     return fn(col, sy, sx, ph, pw, h, w, dy, dx)
+
+
+_cpu_workspace_size = 64 * 1024 * 1024
+_thread_local = threading.local()
+
+
+def get_cpu_workspace_size():
+    """Gets the workspace size for convolutions on CPU.
+
+    Returns:
+        int: The workspace size in bytes.
+
+    .. seealso:: :func:`~chainer.utils.conv.set_cpu_workspace_size`
+
+    """
+    return _cpu_workspace_size
+
+
+def set_cpu_workspace_size(size):
+    """Sets the workspace size for convolutions on CPU.
+
+    Convolutions on CPU without iDeep build the column matrix of a chunk of
+    the mini-batch at a time in a workspace buffer reused across calls, and
+    the batch is split into chunks so that the matrix fits in this size.
+    At least one sample is processed at a time regardless of the size.
+
+    Args:
+        size (int): The workspace size in bytes.
+
+    """
+    global _cpu_workspace_size
+    if size < 0:
+        raise ValueError('workspace size must be non-negative')
+    _cpu_workspace_size = size
+    _thread_local.workspace = None
+
+
+def _get_workspace(shape, dtype):
+    dtype = numpy.dtype(dtype)
+    nbytes = _prod(shape) * dtype.itemsize
+    buf = getattr(_thread_local, 'workspace', None)
+    if buf is None or buf.size < nbytes:
+        buf = numpy.empty(nbytes, dtype=numpy.uint8)
+        _thread_local.workspace = buf
+    return buf[:nbytes].view(dtype).reshape(shape)
+
+
+def _prod(shape):
+    size = 1
+    for s in shape:
+        size *= s
+    return size
+
+
+def _batch_chunks(n, sample_nbytes):
+    chunk = max(1, _cpu_workspace_size // max(1, sample_nbytes))
+    for start in six.moves.range(0, n, chunk):
+        yield start, min(start + chunk, n)
+
+
+def _pad_cpu(img, ksize, stride, pad, outs, dilate, pval):
+    # Pads only the region read by the kernel, i.e. no extra rows added by
+    # ``cover_all`` are allocated, and returns ``img`` itself if no padding
+    # is required.
+    dims = img.shape[2:]
+    ends = [s * (out - 1) + di * (k - 1) + 1
+            for (k, s, out, di) in zip(ksize, stride, outs, dilate)]
+    if not any(pad) and all(end <= d for (end, d) in zip(ends, dims)):
+        return img
+
+    padded = numpy.empty(img.shape[:2] + tuple(ends), dtype=img.dtype)
+    colon = slice(None)
+    dst_index = [colon, colon]
+    src_index = [colon, colon]
+    for axis, (d, p, end) in enumerate(zip(dims, pad, ends)):
+        lo = min(p, end)
+        hi = max(lo, min(p + d, end))
+        dst_index.append(slice(lo, hi))
+        src_index.append(slice(lo - p, hi - p) if hi > lo else slice(0, 0))
+        prefix = (colon,) * (axis + 2)
+        padded[prefix + (slice(None, lo),)] = pval
+        padded[prefix + (slice(hi, None),)] = pval
+    padded[tuple(dst_index)] = img[tuple(src_index)]
+    return padded
+
+
+def im2col_view_cpu(img, ksize, stride, pad, outs, dilate, pval=0):
+    """Returns the patches of an image as a strided view.
+
+    The result has the shape ``(n, c, k_1, ..., k_N, out_1, ..., out_N)`` of
+    the column array of :func:`im2col_cpu` without copying the image except
+    for padding. The view shares the memory of the image, so it must not be
+    written.
+
+    """
+    img = _pad_cpu(img, ksize, stride, pad, outs, dilate, pval)
+    strides = img.strides
+    shape = img.shape[:2] + tuple(ksize) + tuple(outs)
+    view_strides = (
+        strides[:2]
+        + tuple(st * di for (st, di) in zip(strides[2:], dilate))
+        + tuple(st * s for (st, s) in zip(strides[2:], stride)))
+    return numpy.lib.stride_tricks.as_strided(img, shape, view_strides)
+
+
+def _kernel_slices(ksize, stride, pad, dilate, outs, dims):
+    # Yields each kernel offset with the slices of the output and the input
+    # connected by it, both clipped to the part inside the input.
+    for kxs in itertools.product(*[six.moves.range(k) for k in ksize]):
+        out_index = []
+        img_index = []
+        for kx, s, p, di, out, d in zip(
+                kxs, stride, pad, dilate, outs, dims):
+            # The input index of the output index ``o`` is ``off + o * s``.
+            off = kx * di - p
+            o_lo = max(0, (s - 1 - off) // s)
+            o_hi = min(out, (d - off + s - 1) // s)
+            if o_lo >= o_hi:
+                break
+            out_index.append(slice(o_lo, o_hi))
+            start = off + o_lo * s
+            stop = start + (o_hi - o_lo - 1) * s + 1
+            img_index.append(slice(start, stop, s))
+        else:
+            yield kxs, tuple(out_index), tuple(img_index)
+
+
+def col2im_add_cpu(col, stride, pad, dilate, img):
+    """Adds a column array to an image in place.
+
+    This is the inverse operation of :func:`im2col_view_cpu`. Elements of
+    ``col`` that fall in the padding are discarded, so that no padded image
+    is allocated.
+
+    """
+    dims = img.shape[2:]
+    ndim = len(dims)
+    ksize = col.shape[2:2 + ndim]
+    outs = col.shape[2 + ndim:]
+    colon = slice(None)
+    for kxs, out_index, img_index in _kernel_slices(
+            ksize, stride, pad, dilate, outs, dims):
+        img[(colon, colon) + img_index] += (
+            col[(colon, colon) + kxs + out_index])
+    return img
+
+
+def convolution_forward_cpu(x, W, stride, pad, dilate, cover_all=False):
+    """Computes N-dimensional convolution on CPU without bias.
+
+    The column matrix of each chunk of the mini-batch is packed into a
+    reusable workspace and multiplied by the filter with a single matrix
+    product, which writes the output in place.
+
+    Args:
+        x (numpy.ndarray): Input of shape ``(n, c, d_1, ..., d_N)``.
+        W (numpy.ndarray): Filter of shape ``(c_O, c, k_1, ..., k_N)``.
+        stride (tuple of ints): Stride of filter applications.
+        pad (tuple of ints): Spatial padding width.
+        dilate (tuple of ints): Dilation factors.
+        cover_all (bool): Use ``cover_all`` option or not.
+
+    Returns:
+        numpy.ndarray: Output of shape ``(n, c_O, out_1, ..., out_N)`` in the
+        promoted type of ``x`` and ``W``.
+
+    """
+    dtype = numpy.promote_types(x.dtype, W.dtype)
+    n = x.shape[0]
+    out_c = W.shape[0]
+    ksize = W.shape[2:]
+    outs = tuple(get_conv_outsize(d, k, s, p, cover_all, di)
+                 for (d, k, s, p, di)
+                 in zip(x.shape[2:], ksize, stride, pad, dilate))
+    assert all(out > 0 for out in outs), 'Output sizes should be positive.'
+    m = _prod(W.shape[1:])
+    p = _prod(outs)
+
+    W_mat = W.reshape(out_c, m).astype(dtype, copy=False)
+    y = numpy.empty((n, out_c) + outs, dtype=dtype)
+    y_mat = y.reshape(n, out_c, p)
+    for start, end in _batch_chunks(n, m * p * dtype.itemsize):
+        col = _get_workspace((end - start,) + W.shape[1:] + outs, dtype)
+        col[...] = im2col_view_cpu(
+            x[start:end], ksize, stride, pad, outs, dilate)
+        numpy.matmul(W_mat, col.reshape(end - start, m, p),
+                     out=y_mat[start:end])
+    return y
+
+
+def convolution_backward_data_cpu(gy, W, stride, pad, dims, dilate):
+    """Computes the gradient of N-dimensional convolution w.r.t. the input.
+
+    This is also the forward computation of deconvolution without bias.
+
+    Args:
+        gy (numpy.ndarray): Gradient of the output of shape
+            ``(n, c_O, out_1, ..., out_N)``.
+        W (numpy.ndarray): Filter of shape ``(c_O, c, k_1, ..., k_N)``.
+        stride (tuple of ints): Stride of filter applications.
+        pad (tuple of ints): Spatial padding width.
+        dims (tuple of ints): Spatial shape of the input.
+        dilate (tuple of ints): Dilation factors.
+
+    Returns:
+        numpy.ndarray: Gradient of the input of shape
+        ``(n, c, d_1, ..., d_N)`` in the promoted type of ``gy`` and ``W``.
+
+    """
+    dtype = numpy.promote_types(gy.dtype, W.dtype)
+    n, out_c = gy.shape[:2]
+    outs = gy.shape[2:]
+    m = _prod(W.shape[1:])
+    p = _prod(outs)
+
+    W_mat = W.reshape(out_c, m).astype(dtype, copy=False).T
+    gy_mat = gy.reshape(n, out_c, p)
+    gx = numpy.zeros((n, W.shape[1]) + tuple(dims), dtype=dtype)
+    for start, end in _batch_chunks(n, m * p * dtype.itemsize):
+        col = _get_workspace((end - start, m, p), dtype)
+        numpy.matmul(W_mat, gy_mat[start:end], out=col)
+        col2im_add_cpu(col.reshape((end - start,) + W.shape[1:] + outs),
+                       stride, pad, dilate, gx[start:end])
+    return gx
+
+
+def convolution_backward_filter_cpu(x, gy, ksize, stride, pad, dilate):
+    """Computes the gradient of N-dimensional convolution w.r.t. the filter.
+
+    Args:
+        x (numpy.ndarray): Input of shape ``(n, c, d_1, ..., d_N)``.
+        gy (numpy.ndarray): Gradient of the output of shape
+            ``(n, c_O, out_1, ..., out_N)``.
+        ksize (tuple of ints): Size of the filter.
+        stride (tuple of ints): Stride of filter applications.
+        pad (tuple of ints): Spatial padding width.
+        dilate (tuple of ints): Dilation factors.
+
+    Returns:
+        numpy.ndarray: Gradient of the filter of shape
+        ``(c_O, c, k_1, ..., k_N)`` in the promoted type of ``x`` and
+        ``gy``.
+
+    """
+    dtype = numpy.promote_types(x.dtype, gy.dtype)
+    n, c = x.shape[:2]
+    out_c = gy.shape[1]
+    outs = gy.shape[2:]
+    ndim = len(outs)
+    m = c * _prod(ksize)
+    p = _prod(outs)
+
+    gW = numpy.zeros((out_c, m), dtype=dtype)
+    # (n, c, k_1, ..., k_N, out_1, ..., out_N)
+    # -> (c, k_1, ..., k_N, n, out_1, ..., out_N)
+    axes = tuple(six.moves.range(1, ndim + 2)) + (0,) + tuple(
+        six.moves.range(ndim + 2, 2 * ndim + 2))
+    for start, end in _batch_chunks(n, m * p * dtype.itemsize):
+        nb = end - start
+        col = _get_workspace((c,) + tuple(ksize) + (nb,) + outs, dtype)
+        col[...] = im2col_view_cpu(
+            x[start:end], ksize, stride, pad, outs, dilate).transpose(axes)
+        gy_mat = gy[start:end].reshape(nb, out_c, p).transpose(1, 0, 2)
+        gW += numpy.dot(gy_mat.reshape(out_c, nb * p),
+                        col.reshape(m, nb * p).T)
+    return gW.reshape((out_c, c) + tuple(ksize))
+
+
+# Pooling processes chunks of this size at a time to stay in the cache.
+_pooling_chunk_size = 1024 * 1024
+
+
+def _pooling_outsize(dims, ksize, stride, pad, cover_all):
+    outs = tuple(get_conv_outsize(d, k, s, p, cover_all)
+                 for (d, k, s, p) in zip(dims, ksize, stride, pad))
+    assert all(out > 0 for out in outs), 'Output sizes should be positive.'
+    return outs
+
+
+def max_pooling_forward_cpu(x, ksize, stride, pad, cover_all):
+    """Computes N-dimensional max pooling on CPU.
+
+    The maximum and its position are updated in a single pass over the
+    strided views of the kernel offsets, so that no column array is
+    allocated. The batch is processed in small chunks to keep the padded
+    input and the temporaries small and in the cache.
+
+    Args:
+        x (numpy.ndarray): Input of shape ``(n, c, d_1, ..., d_N)``.
+        ksize (tuple of ints): Size of pooling window.
+        stride (tuple of ints): Stride of pooling applications.
+        pad (tuple of ints): Spatial padding width.
+        cover_all (bool): Use ``cover_all`` option or not.
+
+    Returns:
+        tuple: Output of shape ``(n, c, out_1, ..., out_N)`` and the flattened
+        positions of the maxima in the pooling windows. The positions are
+        stored as :class:`numpy.int8` unless the window has more than 127
+        elements.
+
+    """
+    ndim = len(ksize)
+    outs = _pooling_outsize(x.shape[2:], ksize, stride, pad, cover_all)
+    shape = x.shape[:2] + outs
+    if _prod(ksize) <= numpy.iinfo(numpy.int8).max:
+        index_dtype = numpy.int8
+    else:
+        index_dtype = numpy.int32
+    y = numpy.empty(shape, dtype=x.dtype)
+    indexes = numpy.zeros(shape, dtype=index_dtype)
+
+    # Each plane is pooled independently, so the chunks are taken over the
+    # flattened batch and channel axes.
+    planes = x.shape[0] * x.shape[1]
+    x = x.reshape((planes, 1) + x.shape[2:])
+    y_planes = y.reshape((planes, 1) + outs)
+    indexes_planes = indexes.reshape((planes, 1) + outs)
+    colon = (slice(None),) * 2
+    chunk = max(1, _pooling_chunk_size // max(1, x[:1].nbytes))
+    for start in six.moves.range(0, planes, chunk):
+        end = min(start + chunk, planes)
+        view = im2col_view_cpu(x[start:end], ksize, stride, pad, outs,
+                               (1,) * ndim, pval=-numpy.inf)
+        y_c = y_planes[start:end]
+        indexes_c = indexes_planes[start:end]
+        mask = numpy.empty(y_c.shape, dtype=bool)
+        offsets = list(
+            itertools.product(*[six.moves.range(k) for k in ksize]))
+        for index, kxs in enumerate(offsets):
+            v = view[colon + kxs]
+            if index == 0:
+                y_c[...] = v
+                continue
+            # The first maximum is taken on ties as ``argmax`` does.
+            numpy.greater(v, y_c, out=mask)
+            numpy.copyto(indexes_c, index, where=mask)
+            numpy.maximum(y_c, v, out=y_c)
+
+        # NaN propagates to the output but is never greater than the others,
+        # so the positions of the windows with NaN are redone to point at
+        # the first NaN as ``argmax`` does.
+        nan_mask = numpy.isnan(y_c)
+        if nan_mask.any():
+            for index in six.moves.range(len(offsets) - 1, -1, -1):
+                v = view[colon + offsets[index]]
+                numpy.logical_and(numpy.isnan(v), nan_mask, out=mask)
+                numpy.copyto(indexes_c, index, where=mask)
+    return y, indexes
+
+
+def max_pooling_backward_cpu(gy, indexes, ksize, stride, pad, dims):
+    """Computes the gradient of N-dimensional max pooling on CPU.
+
+    Args:
+        gy (numpy.ndarray): Gradient of the output.
+        indexes (numpy.ndarray): Positions of the maxima returned by
+            :func:`max_pooling_forward_cpu`.
+        ksize (tuple of ints): Size of pooling window.
+        stride (tuple of ints): Stride of pooling applications.
+        pad (tuple of ints): Spatial padding width.
+        dims (tuple of ints): Spatial shape of the input.
+
+    Returns:
+        numpy.ndarray: Gradient of the input.
+
+    """
+    ndim = len(ksize)
+    gx = numpy.zeros(gy.shape[:2] + tuple(dims), dtype=gy.dtype)
+    colon = (slice(None),) * 2
+    zero = gy.dtype.type(0)
+    strides = [1] * ndim
+    for i in six.moves.range(ndim - 2, -1, -1):
+        strides[i] = strides[i + 1] * ksize[i + 1]
+    for kxs, out_index, img_index in _kernel_slices(
+            ksize, stride, pad, (1,) * ndim, gy.shape[2:], dims):
+        index = sum(kx * st for (kx, st) in zip(kxs, strides))
+        out_index = colon + out_index
+        gx[colon + img_index] += numpy.where(
+            indexes[out_index] == index, gy[out_index], zero)
+    return gx
+
+
+def max_pooling_gather_cpu(x, indexes, ksize, stride, pad):
+    """Gathers the elements at the maxima of N-dimensional max pooling.
+
+    Args:
+        x (numpy.ndarray): Input of shape ``(n, c, d_1, ..., d_N)``.
+        indexes (numpy.ndarray): Positions of the maxima returned by
+            :func:`max_pooling_forward_cpu`.
+        ksize (tuple of ints): Size of pooling window.
+        stride (tuple of ints): Stride of pooling applications.
+        pad (tuple of ints): Spatial padding width.
+
+    Returns:
+        numpy.ndarray: Elements of ``x`` at the positions of the shape of
+        ``indexes``.
+
+    """
+    ndim = len(ksize)
+    view = im2col_view_cpu(x, ksize, stride, pad, indexes.shape[2:],
+                           (1,) * ndim, pval=-numpy.inf)
+    y = numpy.empty(indexes.shape, dtype=x.dtype)
+    colon = (slice(None),) * 2
+    for index, kxs in enumerate(
+            itertools.product(*[six.moves.range(k) for k in ksize])):
+        numpy.copyto(y, view[colon + kxs], where=indexes == index)
+    return y
+
+
+def average_pooling_forward_cpu(x, ksize, stride, pad, cover_all):
+    """Computes the sums of N-dimensional pooling windows on CPU.
+
+    The sums are accumulated over the strided views of the kernel offsets
+    without allocating a column array. Padded elements are regarded as
+    zeros.
+
+    Args:
+        x (numpy.ndarray): Input of shape ``(n, c, d_1, ..., d_N)``.
+        ksize (tuple of ints): Size of pooling window.
+        stride (tuple of ints): Stride of pooling applications.
+        pad (tuple of ints): Spatial padding width.
+        cover_all (bool): Use ``cover_all`` option or not.
+
+    Returns:
+        numpy.ndarray: Sums of the windows of shape
+        ``(n, c, out_1, ..., out_N)``. The sums of half-precision inputs are
+        accumulated and returned in single precision.
+
+    """
+    ndim = len(ksize)
+    outs = _pooling_outsize(x.shape[2:], ksize, stride, pad, cover_all)
+    y = numpy.zeros(
+        x.shape[:2] + outs, dtype=numpy.promote_types(x.dtype, 'f'))
+    colon = (slice(None),) * 2
+    for kxs, out_index, img_index in _kernel_slices(
+            ksize, stride, pad, (1,) * ndim, outs, x.shape[2:]):
+        y[colon + out_index] += x[colon + img_index]
+    return y
+
+
+def average_pooling_backward_cpu(gy, ksize, stride, pad, dims):
+    """Adds the gradient of each pooling window to its elements on CPU.
+
+    This is the transpose of :func:`average_pooling_forward_cpu`, i.e. the
+    gradient of the sums of the windows.
+
+    Args:
+        gy (numpy.ndarray): Gradient of the output.
+        ksize (tuple of ints): Size of pooling window.
+        stride (tuple of ints): Stride of pooling applications.
+        pad (tuple of ints): Spatial padding width.
+        dims (tuple of ints): Spatial shape of the input.
+
+    Returns:
+        numpy.ndarray: Gradient of the input.
+
+    """
+    ndim = len(ksize)
+    gx = numpy.zeros(gy.shape[:2] + tuple(dims), dtype=gy.dtype)
+    colon = (slice(None),) * 2
+    for kxs, out_index, img_index in _kernel_slices(
+            ksize, stride, pad, (1,) * ndim, gy.shape[2:], dims):
+        gx[colon + img_index] += gy[colon + out_index]
+    return gx
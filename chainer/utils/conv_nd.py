@@ -1,9 +1,7 @@
-import itertools
-
 import numpy
-import six
 
 from chainer.backends import cuda
+from chainer.utils import conv
 from chainer.utils.conv import get_conv_outsize
 from chainer.utils import conv_nd_kernel
 
@@ -26,30 +24,12 @@ def im2col_nd_cpu(img, ksize, stride, pad, pval=0, cover_all=False, dilate=1):
                  in zip(dims, ksize, stride, pad, dilate))
     assert all(out > 0 for out in outs), 'Output sizes should be positive.'
 
-    # Pad around image.
-    pad_width = ((0, 0), (0, 0)) + tuple(
-        (p, p + s - 1) for (s, p) in zip(stride, pad))
-    img = numpy.pad(img, pad_width, mode='constant', constant_values=(pval,))
-
     # Make patch array with which we will compute correlation with filter.
     # shape: (n, c, k_1, k_2, ..., k_N, out_1, out_2, ..., out_N)
     shape = (n, c) + ksize + outs
-    col = numpy.ndarray(shape, dtype=img.dtype)
-
-    # Fill the patch array.
-    colon = slice(None)
-    for kxs in itertools.product(*[six.moves.range(k) for k in ksize]):
-        # col[:, :, kx_1, kx_2, ..., kx_N, :, :, ..., :]
-        col_index = (colon, colon) + kxs + (colon,) * ndim
-        # img[:, :, kx_1:kx_lim_1:s_1, ..., kx_N:kx_lim_N:s_N]
-        kx_dilate = tuple(kx * di for (kx, di) in zip(kxs, dilate))
-        kx_lims = tuple(kx_di + s * out
-                        for (kx_di, s, out) in zip(kx_dilate, stride, outs))
-        img_index = (colon, colon) + tuple(
-            slice(kx_di, kx_lim, s)
-            for (kx_di, kx_lim, s) in zip(kx_dilate, kx_lims, stride))
-        col[col_index] = img[img_index]
-
+    col = numpy.empty(shape, dtype=img.dtype)
+    col[...] = conv.im2col_view_cpu(
+        img, ksize, stride, pad, outs, dilate, pval)
     return col
 
 
@@ -88,31 +68,12 @@ def col2im_nd_cpu(col, stride, pad, dims, dilate=1):
     mid = (len(col.shape) - 2) // 2 + 2
     ksize = col.shape[2:mid]
     outs = col.shape[mid:]
-    colon = slice(None)
     ndim = len(outs)
     dilate = as_tuple(dilate, ndim)
     assert len(ksize) == len(stride) == len(pad) == len(dims) == ndim
 
-    # Image with padded size.
-    img_shape = (n, c) + tuple(d + 2 * p + s - 1
-                               for (d, p, s) in zip(dims, pad, stride))
-    img = numpy.zeros(img_shape, dtype=col.dtype)
-    for kxs in itertools.product(*[six.moves.range(k) for k in ksize]):
-        # (:, :, kx_1:kx_lim_1:s_1, ..., kx_N:kx_lim_N:s_N)
-        kx_dilate = tuple(kx * di for (kx, di) in zip(kxs, dilate))
-        kx_lims = tuple(kx_di + s * out
-                        for (kx_di, s, out) in zip(kx_dilate, stride, outs))
-        img_index = (colon, colon) + tuple(
-            slice(kx_di, kx_lim, s)
-            for (kx_di, kx_lim, s) in zip(kx_dilate, kx_lims, stride))
-        # (:, :, kx_1, kx_2, ..., kx_N, :, :, ..., :)
-        col_index = (colon, colon) + kxs + (colon,) * len(outs)
-        img[img_index] += col[col_index]
-
-    # (:, :, p_1:d_1 + p_1, p_2:d_2 + p_2, ..., p_N:d_N + p_N]
-    img_index = (colon, colon) + tuple(
-        slice(p, d + p) for (p, d) in zip(pad, dims))
-    return img[img_index]
+    img = numpy.zeros((n, c) + tuple(dims), dtype=col.dtype)
+    return conv.col2im_add_cpu(col, stride, pad, dilate, img)
 
 
 def col2im_nd_gpu(col, stride, pad, dims, dilate=1):
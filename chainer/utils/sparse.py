@@ -1,5 +1,8 @@
+import numpy
+
 import chainer
 from chainer import backend
+from chainer.utils import array as array_module
 
 
 class CooMatrix(object):
@@ -144,6 +147,127 @@ def to_coo(x, ldnz=None, requires_grad=False):
         raise ValueError('ndim of x must be 2 or 3.')
 
 
+class RowSparseArray(object):
+
+    """A gradient array whose rows are zero except for the given indices.
+
+    This is the gradient of a parameter that is only partially used in a
+    forward computation, e.g. the embedding matrix of
+    :class:`~chainer.links.EmbedID` with ``sparse_grad=True``. The row
+    indices may have duplicates, in which case the values of the same row
+    are summed; :meth:`coalesce` sums them up.
+
+    It can be the :attr:`~chainer.Variable.grad` of a parameter. The
+    gradients are accumulated in backprop, and the update rules of
+    elementwise optimizers (e.g. :class:`~chainer.optimizers.Adam`,
+    :class:`~chainer.optimizers.MomentumSGD` and
+    :class:`~chainer.optimizers.AdaGrad`) only update the referenced rows and
+    their states. Other update rules use the dense gradient. Only
+    :class:`numpy.ndarray` is supported.
+
+    Args:
+        indices (numpy.ndarray): One-dimensional integer array of the row
+            indices.
+        values (numpy.ndarray): Values of the rows. Its shape must be
+            ``(len(indices),) + shape[1:]``.
+        shape (tuple of int): Shape of the array in dense format.
+
+    """
+
+    # Lets NumPy defer binary operators with ndarrays to this class.
+    __array_ufunc__ = None
+
+    def __init__(self, indices, values, shape):
+        shape = tuple(shape)
+        if indices.ndim != 1:
+            raise ValueError('indices must be one-dimensional.')
+        if values.shape != (len(indices),) + shape[1:]:
+            raise ValueError(
+                'shape of values must be {}, but {} is given.'.format(
+                    (len(indices),) + shape[1:], values.shape))
+        self.indices = indices
+        self.values = values
+        self.shape = shape
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return array_module.size_of_shape(self.shape)
+
+    def __repr__(self):
+        return 'RowSparseArray(shape={}, dtype={}, n_rows={})'.format(
+            self.shape, self.dtype, len(self.indices))
+
+    def coalesce(self):
+        """Returns an equivalent array with sorted unique indices."""
+        indices, values = array_module.segment_sum_rows(
+            self.indices, self.values)
+        return RowSparseArray(indices, values, self.shape)
+
+    def to_dense(self):
+        """Returns the array in dense format."""
+        dense = numpy.zeros(self.shape, self.dtype)
+        return array_module.scatter_add_rows(dense, self.indices, self.values)
+
+    def astype(self, dtype, copy=True):
+        if not copy and dtype == self.dtype:
+            return self
+        return RowSparseArray(
+            self.indices, self.values.astype(dtype), self.shape)
+
+    def copy(self):
+        return RowSparseArray(
+            self.indices.copy(), self.values.copy(), self.shape)
+
+    def __add__(self, other):
+        if isinstance(other, RowSparseArray):
+            if other.shape != self.shape:
+                raise ValueError(
+                    'shape mismatch: {} != {}'.format(self.shape, other.shape))
+            return RowSparseArray(
+                numpy.concatenate((self.indices, other.indices)),
+                numpy.concatenate((self.values, other.values)),
+                self.shape)
+        if other.shape != self.shape:
+            raise ValueError(
+                'shape mismatch: {} != {}'.format(self.shape, other.shape))
+        return array_module.scatter_add_rows(
+            other.astype(numpy.result_type(other, self.values)),
+            self.indices, self.values)
+
+    __radd__ = __add__
+
+    def __mul__(self, other):
+        return RowSparseArray(self.indices, self.values * other, self.shape)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        return RowSparseArray(self.indices, self.values / other, self.shape)
+
+    __div__ = __truediv__
+
+    def __imul__(self, other):
+        self.values *= other
+        return self
+
+    def __itruediv__(self, other):
+        self.values /= other
+        return self
+
+    __idiv__ = __itruediv__
+
+    def __neg__(self):
+        return RowSparseArray(self.indices, -self.values, self.shape)
+
+
 def get_order(row, col):
     """Check if a coo matrix with given row and col is C or F order.
 
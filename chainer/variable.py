@@ -42,12 +42,17 @@ def _check_grad_type(func, x, is_node_x, gx):
         # TODO(kataoka): This should be an error.
         return
 
-    if not isinstance(gx, chainer.get_array_types()):
+    # The values of a row-sparse gradient are checked instead.
+    gx_array = gx.values if isinstance(
+        gx, chainer.utils.RowSparseArray) else gx
+
+    if not isinstance(gx_array, chainer.get_array_types()):
         msg = ('Type of grad is invalid:\n'
                + 'Expected: Any of {}\n'.format(chainer.get_array_types())
                + 'Actual: {}'.format(type(gx)))
         typ = TypeError
-    elif x_data is not None and not chainer.is_arrays_compatible((gx, x_data)):
+    elif x_data is not None and not chainer.is_arrays_compatible(
+            (gx_array, x_data)):
         msg = ('Type of data and grad mismatch\ngrad: %s != data: %s' %
                (type(gx), type(x_data)))
         typ = TypeError
@@ -1274,7 +1279,8 @@ class Variable(object):
         else:
             with chainer.using_device(self.device):
                 xp = self.device.xp
-                if self._grad is None:
+                if self._grad is None or isinstance(
+                        self._grad, chainer.utils.RowSparseArray):
                     self._grad = xp.zeros_like(arr)
                     self._grad_var = None
                 else:
@@ -1339,11 +1345,21 @@ class Variable(object):
         if var.grad is None:
             return
 
-        src = var.grad_var
-
         if self.array is None:
             self.initialize(var.shape)
 
+        if isinstance(var.grad, chainer.utils.RowSparseArray) or isinstance(
+                self.grad, chainer.utils.RowSparseArray):
+            # Row-sparse gradients are only supported on CPU and are added
+            # without a graph.
+            src = var.grad
+            if isinstance(src, chainer.utils.RowSparseArray):
+                src = src.copy()
+            dst = self.grad
+            self.grad = src if dst is None else src + dst
+            return
+
+        src = var.grad_var
         dst = self.grad_var
         src_device = src.device
         if src_device != dst_device:
@@ -56,6 +56,53 @@ class TestTabularDataset(unittest.TestCase):
 
         self.assertEqual(dataset.get_example(3), expected)
 
+    def test_fetch_indices(self):
+        def callback(indices, key_indices):
+            self.assertEqual(indices, [3, 1])
+            self.assertIsNone(key_indices)
+
+        dataset = dummy_dataset.DummyDataset(
+            mode=self.mode, return_array=self.return_array, callback=callback)
+        output = dataset.fetch(np.array([3, 1]))
+
+        if self.mode is tuple:
+            expected = tuple(dataset.data[:, [3, 1]])
+        elif self.mode is dict:
+            expected = dict(zip(('a', 'b', 'c'), dataset.data[:, [3, 1]]))
+        elif self.mode is None:
+            expected = dataset.data[0, [3, 1]]
+        np.testing.assert_equal(output, expected)
+
+    def test_getitem_indices(self):
+        n_calls = [0]
+
+        def callback(indices, key_indices):
+            self.assertEqual(indices, [3, 1])
+            self.assertIsNone(key_indices)
+            n_calls[0] += 1
+
+        dataset = dummy_dataset.DummyDataset(
+            mode=self.mode, return_array=self.return_array, callback=callback)
+        for index in ([3, 1], np.array([3, 1])):
+            output = dataset[index]
+            self.assertEqual(len(output), 2)
+            for out, i in zip(output, [3, 1]):
+                if self.mode is tuple:
+                    expected = tuple(dataset.data[:, i])
+                elif self.mode is dict:
+                    expected = dict(zip(('a', 'b', 'c'), dataset.data[:, i]))
+                elif self.mode is None:
+                    expected = dataset.data[0, i]
+                self.assertEqual(out, expected)
+        self.assertEqual(n_calls[0], 2)
+
+    def test_getitem_slice(self):
+        dataset = dummy_dataset.DummyDataset(
+            mode=self.mode, return_array=self.return_array)
+        output = dataset[2:8:3]
+        self.assertEqual(len(output), 2)
+        self.assertEqual(output[1], dataset.get_example(5))
+
     def test_iter(self):
         dataset = dummy_dataset.DummyDataset(
             mode=self.mode, return_array=self.return_array)
@@ -2,7 +2,6 @@ import sys
 import unittest
 
 import numpy
-import pytest
 
 from chainer import backend
 from chainer.backends import cuda
@@ -144,31 +143,16 @@ class TestConcatExamples(ConverterTestBase, unittest.TestCase):
         self.converter = dataset.concat_examples
 
 
-class _XFailConcatWithAsyncTransfer(object):
-
-    @attr.chainerx
-    @pytest.mark.xfail(strict=True)
-    def test_concat_arrays_to_chainerx(self, *args, **kwargs):
-        (
-            super(_XFailConcatWithAsyncTransfer, self)
-            .test_concat_arrays_to_chainerx(*args, **kwargs)
-        )
-
-    @attr.chainerx
-    @pytest.mark.xfail(strict=True)
-    def test_concat_tuples_to_chainerx(self, *args, **kwargs):
-        (
-            super(_XFailConcatWithAsyncTransfer, self)
-            .test_concat_tuples_to_chainerx(*args, **kwargs)
-        )
+@testing.backend.inject_backend_tests(
+    None,
+    [
+        # NumPy
+        {},
+    ])
+class TestConcatWithAsyncTransfer(ConverterTestBase, unittest.TestCase):
 
-    @attr.chainerx
-    @pytest.mark.xfail(strict=True)
-    def test_concat_dicts_to_chainerx(self, *args, **kwargs):
-        (
-            super(_XFailConcatWithAsyncTransfer, self)
-            .test_concat_dicts_to_chainerx(*args, **kwargs)
-        )
+    def setUp(self):
+        self.converter = chainer.dataset.ConcatWithAsyncTransfer()
 
 
 @testing.backend.inject_backend_tests(
@@ -177,12 +161,69 @@ class _XFailConcatWithAsyncTransfer(object):
         # NumPy
         {},
     ])
-class TestConcatWithAsyncTransfer(
-        _XFailConcatWithAsyncTransfer,
+class TestConcatWithAsyncTransferBufferPool(
         ConverterTestBase, unittest.TestCase):
 
     def setUp(self):
-        self.converter = chainer.dataset.ConcatWithAsyncTransfer()
+        self.converter = chainer.dataset.ConcatWithAsyncTransfer(
+            buffer_pool=dataset.BufferPool())
+
+
+@testing.parameterize(*testing.product({
+    'device': [None, -1, '@numpy'],
+}))
+class TestConcatWithAsyncTransferBufferPoolReuse(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = dataset.BufferPool(n_buffers=2)
+        self.converter = chainer.dataset.ConcatWithAsyncTransfer(
+            buffer_pool=self.pool)
+
+    def make_batch(self):
+        return [(numpy.random.rand(2, 3).astype(numpy.float32),
+                 numpy.random.rand(4).astype(numpy.float32))
+                for _ in range(5)]
+
+    def check_batch(self, arrays, batch):
+        for i in range(len(arrays)):
+            numpy.testing.assert_array_equal(
+                arrays[i], numpy.stack([example[i] for example in batch]))
+
+    def test_no_allocation_in_steady_state(self):
+        for _ in range(2):
+            self.converter(self.make_batch(), self.device)
+        n_allocations = self.pool.n_allocations
+        for _ in range(3):
+            batch = self.make_batch()
+            arrays = self.converter(batch, self.device)
+            self.check_batch(arrays, batch)
+        assert self.pool.n_allocations == n_allocations
+
+    def test_release(self):
+        batch = self.make_batch()
+        arrays = self.converter(batch, self.device)
+        for array in arrays:
+            self.pool.release(array)
+        batch = self.make_batch()
+        arrays2 = self.converter(batch, self.device)
+        assert arrays2[0] is arrays[0]
+        assert arrays2[1] is arrays[1]
+        self.check_batch(arrays2, batch)
+        assert self.pool.n_allocations == 2
+
+    @attr.gpu
+    def test_gpu(self):
+        pool = dataset.BufferPool(pinned=True)
+        converter = chainer.dataset.ConcatWithAsyncTransfer(buffer_pool=pool)
+        for _ in range(2):
+            converter(self.make_batch(), 0)
+        n_allocations = pool.n_allocations
+        for _ in range(3):
+            batch = self.make_batch()
+            arrays = converter(batch, 0)
+            assert isinstance(arrays[0], cuda.cupy.ndarray)
+            self.check_batch([cuda.to_cpu(a) for a in arrays], batch)
+        assert pool.n_allocations == n_allocations
 
 
 @_inject_backend_tests
@@ -284,6 +325,172 @@ class TestConcatExamplesWithPadding(unittest.TestCase):
         numpy.testing.assert_array_equal(arrays['y'][2, 2:, :], 0)
 
 
+@testing.parameterize(*testing.product({
+    'dtypes': [
+        (numpy.int32, numpy.float32),
+        (numpy.float32, numpy.float64),
+        (numpy.float16, numpy.float32, numpy.int8),
+    ],
+    'padding': [None, 0],
+}))
+class TestConcatExamplesMixedDtypes(unittest.TestCase):
+
+    def test_concat_examples(self):
+        arrays = [numpy.arange(6).reshape(2, 3).astype(dtype)
+                  for dtype in self.dtypes]
+        array = dataset.concat_examples(arrays, padding=self.padding)
+        expect = numpy.stack(arrays)
+        self.assertEqual(array.dtype, expect.dtype)
+        numpy.testing.assert_array_equal(array, expect)
+
+    def test_concat_examples_with_padding(self):
+        if self.padding is None:
+            raise unittest.SkipTest('padding is not given')
+        arrays = [numpy.arange(3 * (i + 1)).reshape(i + 1, 3).astype(dtype)
+                  for i, dtype in enumerate(self.dtypes)]
+        array = dataset.concat_examples(arrays, padding=self.padding)
+        self.assertEqual(array.dtype, numpy.result_type(*arrays))
+        for i, x in enumerate(arrays):
+            numpy.testing.assert_array_equal(array[i, :i + 1], x)
+            numpy.testing.assert_array_equal(array[i, i + 1:], self.padding)
+
+
+class TestConcatExamplesWithBucketing(unittest.TestCase):
+
+    def setUp(self):
+        self.lengths = [3, 7, 1, 5]
+        self.arrays = [numpy.random.rand(n, 2).astype(numpy.float32)
+                       for n in self.lengths]
+
+    def check_padded(self, array, length):
+        self.assertEqual(array.shape, (len(self.arrays), length, 2))
+        for i, n in enumerate(self.lengths):
+            numpy.testing.assert_array_equal(array[i, :n], self.arrays[i])
+            numpy.testing.assert_array_equal(array[i, n:], -1)
+
+    def test_bucket_width(self):
+        array = dataset.concat_examples(
+            self.arrays, padding=-1, bucket_width=4)
+        self.check_padded(array, 8)
+
+    def test_bucket_width_divisible(self):
+        array = dataset.concat_examples(
+            self.arrays, padding=-1, bucket_width=7)
+        self.check_padded(array, 7)
+
+    def test_bucket_width_tuples(self):
+        tuples = [(x, numpy.int32(i)) for i, x in enumerate(self.arrays)]
+        x, t = dataset.concat_examples(tuples, padding=-1, bucket_width=4)
+        self.check_padded(x, 8)
+        numpy.testing.assert_array_equal(t, numpy.arange(4))
+
+    def test_bucket_width_without_padding(self):
+        arrays = [numpy.random.rand(3, 2) for _ in range(4)]
+        with self.assertRaises(ValueError):
+            dataset.concat_examples(arrays, bucket_width=4)
+
+    def test_bucket_width_partial_padding(self):
+        tuples = [(x, numpy.int32(i)) for i, x in enumerate(self.arrays)]
+        x, t = dataset.concat_examples(
+            tuples, padding=(-1, None), bucket_width=4)
+        self.check_padded(x, 8)
+        numpy.testing.assert_array_equal(t, numpy.arange(4))
+
+    def test_different_shapes(self):
+        with self.assertRaises(ValueError):
+            dataset.concat_examples(self.arrays)
+
+
+class TestBufferPool(unittest.TestCase):
+
+    def test_release(self):
+        pool = dataset.BufferPool(n_buffers=2)
+        a = pool.get((2, 3), numpy.float32)
+        b = pool.get((2, 3), numpy.float32)
+        pool.release(a)
+        pool.release(a)
+        self.assertIs(pool.get((2, 3), numpy.float32), a)
+        self.assertIs(pool.get((2, 3), numpy.float32), b)
+        self.assertEqual(pool.n_allocations, 2)
+
+    def test_release_invalid(self):
+        pool = dataset.BufferPool()
+        with self.assertRaises(ValueError):
+            pool.release(numpy.empty((2, 3)))
+
+    def test_contains(self):
+        pool = dataset.BufferPool()
+        a = pool.get((2, 3), numpy.float32)
+        self.assertIn(a, pool)
+        self.assertNotIn(numpy.empty((2, 3)), pool)
+
+    def test_cpu_device(self):
+        pool = dataset.BufferPool(n_buffers=1)
+        a = pool.get((2, 3), numpy.float32, -1)
+        self.assertIsInstance(a, numpy.ndarray)
+        self.assertIs(pool.get((2, 3), numpy.float32), a)
+
+    @attr.gpu
+    def test_gpu_device(self):
+        pool = dataset.BufferPool(n_buffers=1)
+        a = pool.get((2, 3), numpy.float32, 0)
+        self.assertIsInstance(a, cuda.cupy.ndarray)
+        self.assertIsNot(pool.get((2, 3), numpy.float32), a)
+        self.assertIs(pool.get((2, 3), numpy.float32, 0), a)
+
+    def test_get(self):
+        pool = dataset.BufferPool(n_buffers=2)
+        a = pool.get((2, 3), numpy.float32)
+        self.assertEqual(a.shape, (2, 3))
+        self.assertEqual(a.dtype, numpy.float32)
+        b = pool.get((2, 3), numpy.float32)
+        self.assertIsNot(a, b)
+        self.assertIs(pool.get((2, 3), numpy.float32), a)
+        self.assertIs(pool.get((2, 3), numpy.float32), b)
+        self.assertIsNot(pool.get((2, 3), numpy.float64), a)
+        self.assertIsNot(pool.get((3, 2), numpy.float32), a)
+
+    def test_clear(self):
+        pool = dataset.BufferPool(n_buffers=1)
+        a = pool.get((2, 3), numpy.float32)
+        pool.clear()
+        self.assertIsNot(pool.get((2, 3), numpy.float32), a)
+
+    def test_invalid_n_buffers(self):
+        with self.assertRaises(ValueError):
+            dataset.BufferPool(n_buffers=0)
+
+    def test_concat_examples(self):
+        pool = dataset.BufferPool(n_buffers=1)
+        batch = [(numpy.random.rand(3), numpy.random.rand(n))
+                 for n in (2, 4, 3)]
+        x1, t1 = dataset.concat_examples(batch, padding=0, buffer_pool=pool)
+        expected_x, expected_t = dataset.concat_examples(batch, padding=0)
+        numpy.testing.assert_array_equal(x1, expected_x)
+        numpy.testing.assert_array_equal(t1, expected_t)
+
+        batch = batch[::-1]
+        x2, t2 = dataset.concat_examples(batch, padding=0, buffer_pool=pool)
+        self.assertIs(x2, x1)
+        self.assertIs(t2, t1)
+        expected_x, expected_t = dataset.concat_examples(batch, padding=0)
+        numpy.testing.assert_array_equal(x2, expected_x)
+        numpy.testing.assert_array_equal(t2, expected_t)
+
+    def test_concat_examples_builtin_types(self):
+        pool = dataset.BufferPool(n_buffers=1)
+        array = dataset.concat_examples([1, 2, 3], buffer_pool=pool)
+        numpy.testing.assert_array_equal(array, [1, 2, 3])
+        self.assertIs(pool.get(array.shape, array.dtype), array)
+
+    @attr.gpu
+    def test_pinned(self):
+        pool = dataset.BufferPool(pinned=True)
+        a = pool.get((2, 3), numpy.float32)
+        self.assertEqual(a.shape, (2, 3))
+        self.assertEqual(a.dtype, numpy.float32)
+
+
 @testing.parameterize(
     {'padding': None},
     {'padding': 0},
@@ -423,4 +630,35 @@ class TestToDeviceMultiGPU(unittest.TestCase):
         self.assertEqual(int(y.device), self.device)
 
 
+class TestTransferCollated(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.arange(6, dtype=numpy.float32).reshape(2, 3)
+        self.t = numpy.array([0, 1], dtype=numpy.int32)
+
+    def test_array(self):
+        y = dataset.transfer_collated(self.x)
+        numpy.testing.assert_array_equal(y, self.x)
+
+    def test_tuple(self):
+        y = dataset.transfer_collated((self.x, self.t), device=-1)
+        assert isinstance(y, tuple)
+        assert len(y) == 2
+        numpy.testing.assert_array_equal(y[0], self.x)
+        numpy.testing.assert_array_equal(y[1], self.t)
+
+    def test_dict(self):
+        y = dataset.transfer_collated({'x': self.x, 't': self.t})
+        assert set(y.keys()) == {'x', 't'}
+        numpy.testing.assert_array_equal(y['x'], self.x)
+        numpy.testing.assert_array_equal(y['t'], self.t)
+
+    @attr.gpu
+    def test_tuple_gpu(self):
+        y = dataset.transfer_collated((self.x, self.t), device=0)
+        assert isinstance(y[0], cuda.cupy.ndarray)
+        assert isinstance(y[1], cuda.cupy.ndarray)
+        cuda.cupy.testing.assert_array_equal(y[0], self.x)
+
+
 testing.run_module(__name__, __file__)
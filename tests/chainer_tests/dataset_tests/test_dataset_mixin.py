@@ -79,4 +79,38 @@ class TestDatasetMixin(unittest.TestCase):
                              ds.values[i * 4096:(i + 1) * 4096])
 
 
+class BatchDataset(SimpleDataset):
+
+    def __init__(self, values):
+        super(BatchDataset, self).__init__(values)
+        self.calls = []
+
+    def get_examples(self, indices):
+        indices = list(indices)
+        self.calls.append(indices)
+        return [self.values[i] for i in indices]
+
+
+class TestDatasetMixinGetExamples(unittest.TestCase):
+
+    def setUp(self):
+        self.ds = BatchDataset([1, 2, 3, 4, 5])
+
+    def test_default(self):
+        ds = SimpleDataset([1, 2, 3, 4, 5])
+        self.assertEqual(ds.get_examples([3, 0]), [4, 1])
+
+    def test_slice(self):
+        self.assertEqual(self.ds[1:4], [2, 3, 4])
+        self.assertEqual(self.ds.calls, [[1, 2, 3]])
+
+    def test_list(self):
+        self.assertEqual(self.ds[[4, 0]], [5, 1])
+        self.assertEqual(self.ds.calls, [[4, 0]])
+
+    def test_int(self):
+        self.assertEqual(self.ds[2], 3)
+        self.assertEqual(self.ds.calls, [])
+
+
 testing.run_module(__name__, __file__)
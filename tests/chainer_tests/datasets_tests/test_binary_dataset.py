@@ -0,0 +1,200 @@
+import ctypes
+import io
+import multiprocessing
+import os
+import sys
+import unittest
+
+import numpy
+
+from chainer import datasets
+from chainer import iterators
+from chainer import testing
+from chainer import utils
+
+
+class BytesIO(io.BytesIO):
+
+    # The writer closes the file after writing the index.
+    def close(self):
+        pass
+
+
+class ReaderMock(object):
+    def __init__(self, io_):
+        self.io = io_
+        self._lock = multiprocessing.RLock()
+        self._hook_called = multiprocessing.Value(ctypes.c_int, 0, lock=False)
+        self._last_caller_pid = multiprocessing.Value(
+            ctypes.c_int, -1, lock=False)
+
+    @property
+    def n_hook_called(self):
+        with self._lock:
+            return self._hook_called.value
+
+    @property
+    def last_caller_pid(self):
+        with self._lock:
+            return self._last_caller_pid.value
+
+    def __getattr__(self, name):
+        return getattr(self.io, name)
+
+    def after_fork(self):
+        with self._lock:
+            self._hook_called.value += 1
+            self._last_caller_pid.value = os.getpid()
+
+
+class TestBinaryDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.io = BytesIO()
+        self.examples = [
+            (numpy.random.rand(n, 3).astype(numpy.float32), numpy.int32(n))
+            for n in [2, 0, 4, 1, 3]]
+
+    def write(self, examples):
+        with datasets.BinaryDatasetWriter(self.io) as writer:
+            for example in examples:
+                writer.write(example)
+
+    def check_example(self, actual, expected):
+        assert isinstance(actual, tuple)
+        assert len(actual) == 2
+        assert actual[0].dtype == numpy.float32
+        numpy.testing.assert_array_equal(actual[0], expected[0])
+        assert isinstance(actual[1], numpy.int32)
+        assert actual[1] == expected[1]
+
+    def test_write_read(self):
+        self.write(self.examples)
+        dataset = datasets.BinaryDataset(self.io)
+        assert len(dataset) == len(self.examples)
+        for i in range(len(self.examples)):
+            self.check_example(dataset[i], self.examples[i])
+        self.check_example(dataset[-1], self.examples[-1])
+
+    def test_get_examples(self):
+        self.write(self.examples)
+        dataset = datasets.BinaryDataset(self.io)
+        indices = [3, 1, 2, 4, 0, 3]
+        examples = dataset.get_examples(indices)
+        assert len(examples) == len(indices)
+        for example, i in zip(examples, indices):
+            self.check_example(example, self.examples[i])
+
+    def test_get_examples_writable(self):
+        self.write(self.examples)
+        dataset = datasets.BinaryDataset(self.io)
+        x, _ = dataset.get_examples([0, 1])[0]
+        x[...] = 0
+        numpy.testing.assert_array_equal(dataset[0][0], self.examples[0][0])
+
+    def test_index_out_of_range(self):
+        self.write(self.examples)
+        dataset = datasets.BinaryDataset(self.io)
+        with self.assertRaises(IndexError):
+            dataset[len(self.examples)]
+        with self.assertRaises(IndexError):
+            dataset.get_examples([0, len(self.examples)])
+
+    def test_dict(self):
+        self.write([{'x': x, 't': t} for x, t in self.examples])
+        dataset = datasets.BinaryDataset(self.io)
+        example = dataset[2]
+        assert set(example.keys()) == {'x', 't'}
+        self.check_example((example['x'], example['t']), self.examples[2])
+
+    def test_array(self):
+        self.write([x for x, _ in self.examples])
+        dataset = datasets.BinaryDataset(self.io)
+        numpy.testing.assert_array_equal(dataset[3], self.examples[3][0])
+
+    def test_empty(self):
+        self.write([])
+        dataset = datasets.BinaryDataset(self.io)
+        assert len(dataset) == 0
+
+    def test_inconsistent_examples(self):
+        writer = datasets.BinaryDatasetWriter(self.io)
+        writer.write((numpy.zeros(3, numpy.float32), 1))
+        with self.assertRaises(ValueError):
+            writer.write((numpy.zeros(3, numpy.float64), 1))
+        with self.assertRaises(ValueError):
+            writer.write((numpy.zeros((3, 1), numpy.float32), 1))
+        with self.assertRaises(ValueError):
+            writer.write(numpy.zeros(3, numpy.float32))
+
+    def test_object_dtype(self):
+        writer = datasets.BinaryDatasetWriter(self.io)
+        with self.assertRaises(TypeError):
+            writer.write((numpy.array([None, 1]),))
+
+    def test_invalid_file(self):
+        self.io.write(b'not a dataset')
+        with self.assertRaises(ValueError):
+            datasets.BinaryDataset(self.io)
+
+    def test_after_fork(self):
+        self.write(self.examples)
+
+        reader = ReaderMock(self.io)
+        # Assign to avoid destruction of the instance
+        # before creation a child process
+        dataset = datasets.BinaryDataset(reader)
+
+        assert reader.n_hook_called == 0
+        p = multiprocessing.Process()
+        p.start()
+        p.join()
+        assert reader.n_hook_called == 1
+        assert reader.last_caller_pid == p.pid
+
+        # Touch to suppress "unused variable' warning
+        del dataset
+
+
+class TestBinaryDatasetHelper(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = utils.tempdir()
+        dirpath = self.tempdir.__enter__()
+        self.path = os.path.join(dirpath, 'test.bin')
+
+    def tearDown(self):
+        self.tempdir.__exit__(*sys.exc_info())
+
+    def test_write_read(self):
+        with datasets.open_binary_dataset_writer(self.path) as writer:
+            for i in range(10):
+                writer.write((numpy.full(i, i, numpy.float32), i))
+
+        with datasets.open_binary_dataset(self.path) as dataset:
+            assert dataset._mmap is not None
+            assert len(dataset) == 10
+            x, t = dataset[3]
+            numpy.testing.assert_array_equal(x, numpy.full(3, 3))
+            assert t == 3
+            examples = dataset.get_examples(range(2, 6))
+            assert [t for _, t in examples] == [2, 3, 4, 5]
+
+    def test_multiprocess_iterator(self):
+        with datasets.open_binary_dataset_writer(self.path) as writer:
+            for i in range(10):
+                writer.write((numpy.full(3, i, numpy.float32), i))
+
+        with datasets.open_binary_dataset(self.path) as dataset:
+            it = iterators.MultiprocessIterator(
+                dataset, 4, repeat=False, shuffle=False, n_processes=2)
+            ts = []
+            for batch in it:
+                for x, t in batch:
+                    numpy.testing.assert_array_equal(x, numpy.full(3, t))
+                    ts.append(t)
+            it.finalize()
+            assert ts == list(range(10))
+
+
+testing.run_module(__name__, __file__)
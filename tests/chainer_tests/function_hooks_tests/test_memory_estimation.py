@@ -0,0 +1,121 @@
+import unittest
+
+import numpy
+import six
+
+import chainer
+from chainer import function_hooks
+from chainer import functions
+from chainer import links
+from chainer import testing
+
+
+class MLP(chainer.Chain):
+
+    def __init__(self):
+        super(MLP, self).__init__()
+        with self.init_scope():
+            self.l1 = links.Linear(5, 4)
+            self.l2 = links.Linear(4, 3)
+
+    def forward(self, x):
+        return self.l2(functions.relu(self.l1(x)))
+
+
+class TestMemoryEstimationHook(unittest.TestCase):
+
+    def setUp(self):
+        self.model = links.Classifier(MLP())
+        self.x = numpy.random.uniform(-1, 1, (2, 5)).astype(numpy.float32)
+        self.t = numpy.array([0, 2], numpy.int32)
+        self.hook = function_hooks.MemoryEstimationHook()
+        with self.hook:
+            self.loss = self.model(self.x, self.t)
+        self.result = self.hook.analyze(self.loss)
+
+    def test_name(self):
+        assert self.hook.name == 'MemoryEstimationHook'
+
+    def test_activation_memory(self):
+        # ReLU retains its output, which l2 retains as well; softmax cross
+        # entropy retains its input and the softmax output.
+        h_bytes = 2 * 4 * 4
+        y_bytes = 2 * 3 * 4
+        summary = self.hook.summary()
+        assert summary['Classifier/predictor/ReLU']['retained_bytes'] == \
+            h_bytes
+        assert summary[
+            'Classifier/predictor/l1/LinearFunction']['retained_bytes'] == 0
+        assert summary[
+            'Classifier/predictor/l2/LinearFunction']['retained_bytes'] == 0
+        assert summary['Classifier/SoftmaxCrossEntropy'][
+            'retained_bytes'] >= y_bytes
+        assert self.result['activation_memory'] == sum(
+            record['retained_bytes'] for record in summary.values())
+        assert self.hook.activation_memory == \
+            self.result['activation_memory']
+
+    def test_peak_memory(self):
+        assert self.hook.peak_memory == self.result['peak_memory']
+        timeline = self.hook.timeline()
+        # Accuracy is not differentiable, so it is not in the graph.
+        assert [t['function'] for t in timeline] == [
+            'SoftmaxCrossEntropy', 'LinearFunction', 'ReLU',
+            'LinearFunction']
+        assert [t['link'] for t in timeline] == [
+            'Classifier', 'Classifier/predictor/l2', 'Classifier/predictor',
+            'Classifier/predictor/l1']
+        assert self.hook.peak_memory == max(
+            [self.hook.activation_memory] + [t['memory'] for t in timeline])
+        # Gradients of the parameters are alive at the end of backward.
+        param_grad_bytes = sum(p.array.nbytes for p in self.model.params())
+        assert timeline[-1]['memory'] >= param_grad_bytes
+
+    def test_link_summary(self):
+        link_summary = self.hook.link_summary()
+        assert list(link_summary.keys()) == [
+            'Classifier', 'Classifier/predictor',
+            'Classifier/predictor/l1', 'Classifier/predictor/l2']
+        assert link_summary['Classifier']['retained_bytes'] == \
+            self.hook.activation_memory
+        assert link_summary['Classifier/predictor/l1']['input_bytes'] == \
+            self.x.nbytes
+
+    def test_suggest_forget_points(self):
+        suggestions = self.hook.suggest_forget_points()
+        paths = [path for path, _ in suggestions]
+        for i, path in enumerate(paths):
+            for other in paths[i + 1:]:
+                assert not other.startswith(path + '/')
+                assert not path.startswith(other + '/')
+        savings = [saving for _, saving in suggestions]
+        assert savings == sorted(savings, reverse=True)
+        assert all(saving > 0 for saving in savings)
+        assert len(self.hook.suggest_forget_points(n=1)) <= 1
+
+    def test_hidden_arrays(self):
+        hook = function_hooks.MemoryEstimationHook()
+        x = chainer.Variable(self.x)
+        with hook:
+            y = functions.sum(functions.dropout(x * 2))
+        hook.analyze(y)
+        # The mask of dropout is stored as an attribute.
+        assert hook.summary()['Dropout']['retained_bytes'] >= self.x.nbytes
+
+    def test_print_report(self):
+        io = six.StringIO()
+        self.hook.print_report(file=io)
+        lines = io.getvalue().splitlines()
+        assert lines[0] == 'Activation memory: {} bytes'.format(
+            self.hook.activation_memory)
+        assert lines[1] == 'Peak memory: {} bytes'.format(
+            self.hook.peak_memory)
+        assert lines[2].split() == ['LinkName', 'Retained', 'Input']
+
+    def test_not_analyzed(self):
+        hook = function_hooks.MemoryEstimationHook()
+        with self.assertRaises(RuntimeError):
+            hook.peak_memory
+
+
+testing.run_module(__name__, __file__)
@@ -0,0 +1,154 @@
+import unittest
+
+import numpy
+import six
+
+import chainer
+from chainer.backends import cuda
+from chainer import function_hooks
+from chainer import functions
+from chainer import links
+from chainer import testing
+from chainer.testing import attr
+
+
+class MLP(chainer.Chain):
+
+    def __init__(self):
+        super(MLP, self).__init__()
+        with self.init_scope():
+            self.l1 = links.Linear(5, 4)
+            self.l2 = links.Linear(4, 3)
+
+    def forward(self, x):
+        return self.l2(functions.relu(self.l1(x)))
+
+
+class TestSamplingTimerHook(unittest.TestCase):
+
+    def setUp(self):
+        self.model = links.Classifier(MLP())
+        self.x = numpy.random.uniform(-1, 1, (2, 5)).astype(numpy.float32)
+        self.t = numpy.array([0, 2], numpy.int32)
+
+    def run_iterations(self, hook, n, xp=numpy):
+        x = xp.asarray(self.x)
+        t = xp.asarray(self.t)
+        with hook:
+            for _ in range(n):
+                loss = self.model(x, t)
+                self.model.cleargrads()
+                loss.backward()
+
+    def test_name(self):
+        assert function_hooks.SamplingTimerHook().name == 'SamplingTimerHook'
+
+    def check_summary(self, xp):
+        hook = function_hooks.SamplingTimerHook()
+        self.run_iterations(hook, 3, xp)
+
+        assert hook.n_passes == 3
+        assert hook.n_sampled_passes == 3
+        summary = hook.summary()
+        record = summary['Classifier/predictor/l1/LinearFunction']
+        assert record['forward_occurrence'] == 3
+        assert record['backward_occurrence'] == 3
+        assert record['forward_time'] > 0
+        assert record['backward_time'] > 0
+        assert summary['Classifier/predictor/ReLU']['forward_occurrence'] == 3
+        assert 'Classifier/SoftmaxCrossEntropy' in summary
+
+        link_summary = hook.link_summary()
+        assert list(link_summary.keys()) == [
+            'Classifier', 'Classifier/predictor',
+            'Classifier/predictor/l1', 'Classifier/predictor/l2']
+        for record in link_summary.values():
+            assert record['occurrence'] == 3
+        assert (link_summary['Classifier']['elapsed_time'] >=
+                link_summary['Classifier/predictor']['elapsed_time'])
+        assert hook.total_time() > 0
+
+    def test_summary_cpu(self):
+        self.check_summary(numpy)
+
+    @attr.gpu
+    def test_summary_gpu(self):
+        self.model.to_gpu()
+        self.check_summary(cuda.cupy)
+
+    def test_sampling_interval(self):
+        hook = function_hooks.SamplingTimerHook(sampling_interval=3)
+        self.run_iterations(hook, 7)
+
+        assert hook.n_passes == 7
+        assert hook.n_sampled_passes == 3
+        record = hook.summary()['Classifier/predictor/l2/LinearFunction']
+        assert record['forward_occurrence'] == 3
+        assert record['backward_occurrence'] == 3
+        assert hook.link_summary()['Classifier']['occurrence'] == 3
+
+    def test_sampling_rate(self):
+        hook = function_hooks.SamplingTimerHook(sampling_rate=0.5, seed=0)
+        self.run_iterations(hook, 20)
+
+        record = hook.summary()['Classifier/predictor/l1/LinearFunction']
+        assert 0 < record['forward_occurrence'] < 20
+        assert 0 < record['backward_occurrence'] < 20
+
+    def test_invalid_sampling(self):
+        with self.assertRaises(ValueError):
+            function_hooks.SamplingTimerHook(sampling_interval=0)
+        with self.assertRaises(ValueError):
+            function_hooks.SamplingTimerHook(sampling_rate=0)
+
+    def test_function_without_link(self):
+        hook = function_hooks.SamplingTimerHook()
+        x = chainer.Variable(self.x)
+        with hook:
+            y = functions.exp(x)
+            y.grad = numpy.ones_like(self.x)
+            y.backward()
+        record = hook.summary()['Exp']
+        assert record['forward_occurrence'] == 1
+        assert record['backward_occurrence'] == 1
+
+
+@testing.parameterize(
+    {'unit': 'sec'},
+    {'unit': 'ms'},
+    {'unit': 'us'},
+    {'unit': 'ns'},
+    {'unit': 'auto'},
+    {'unit': 'auto_foreach'},
+)
+class TestSamplingTimerPrintReport(unittest.TestCase):
+
+    def test_print_report(self):
+        model = links.Classifier(links.Linear(5, 3))
+        x = numpy.random.uniform(-1, 1, (2, 5)).astype(numpy.float32)
+        t = numpy.array([0, 2], numpy.int32)
+        hook = function_hooks.SamplingTimerHook()
+        with hook:
+            model(x, t).backward()
+
+        io = six.StringIO()
+        hook.print_report(unit=self.unit, file=io)
+        time = r'[0-9.\-e]+(.s|sec)'
+        expect = r'''\AName +Forward +Backward +Occurrence
+Classifier +{t} +{t} +1
+  predictor +{t} +{t} +1
+    LinearFunction +{t} +{t} +1
+  SoftmaxCrossEntropy +{t} +{t} +1
+  Accuracy +{t} +{t} +1
+\Z'''.format(t=time)
+        six.assertRegex(self, io.getvalue(), expect)
+
+    def test_print_report_empty(self):
+        io = six.StringIO()
+        function_hooks.SamplingTimerHook().print_report(
+            unit=self.unit, file=io)
+        assert io.getvalue().split() == [
+            'Name', 'Forward', 'Backward', 'Occurrence']
+
+
+testing.run_module(__name__, __file__)
@@ -27,6 +27,7 @@ def make_sampler(backend_config, high):
     'dtype': [numpy.float16, numpy.float32, numpy.float64],
     't': [[0, 2], [-1, 1, 2]],
     'reduce': ['sum', 'no'],
+    'deterministic': [False, True],
 }))
 @testing.backend.inject_backend_tests(
     None,
@@ -140,7 +141,8 @@ class TestNegativeSamplingFunction(unittest.TestCase):
 
         def f(x, w):
             return functions.negative_sampling(
-                x, t_data, w, sampler, self.sample_size, reduce=self.reduce)
+                x, t_data, w, sampler, self.sample_size, reduce=self.reduce,
+                deterministic=self.deterministic)
 
         with backend_config:
             gradient_check.check_backward(
@@ -157,7 +159,8 @@ class TestNegativeSamplingFunction(unittest.TestCase):
 
         def f(x, w):
             return functions.negative_sampling(
-                x, t_data, w, sampler, self.sample_size, reduce=self.reduce)
+                x, t_data, w, sampler, self.sample_size, reduce=self.reduce,
+                deterministic=self.deterministic)
 
         with backend_config:
             gradient_check.check_double_backward(
@@ -165,6 +168,60 @@ class TestNegativeSamplingFunction(unittest.TestCase):
                 **self.check_double_backward_options)
 
 
+@testing.parameterize(*testing.product({
+    'dtype': [numpy.float16, numpy.float32, numpy.float64],
+    't': [[0, 2, 2, 4], [-1, 1, 2, 1], [-1, -1]],
+    'reduce': ['sum', 'no'],
+}))
+class TestNegativeSamplingFunctionBackwardCPU(unittest.TestCase):
+
+    in_size = 3
+    sample_size = 3
+    label_size = 5
+
+    def setUp(self):
+        batch = len(self.t)
+        self.x = numpy.random.uniform(
+            -1, 1, (batch, self.in_size)).astype(self.dtype)
+        self.t = numpy.array(self.t).astype(numpy.int32)
+        self.w = numpy.random.uniform(
+            -1, 1, (self.label_size, self.in_size)).astype(self.dtype)
+        g_shape = self.t.shape if self.reduce == 'no' else ()
+        self.gy = numpy.random.uniform(-1, 1, g_shape).astype(self.dtype)
+        self.check_options = {}
+        if self.dtype == numpy.float16:
+            self.check_options = {'atol': 1e-3, 'rtol': 1e-3}
+
+    def test_backward_cpu(self):
+        sampler = make_sampler(
+            testing.BackendConfig({}), self.label_size)
+        x = chainer.Variable(self.x)
+        w = chainer.Variable(self.w)
+        y, samples = functions.negative_sampling(
+            x, self.t, w, sampler, self.sample_size, reduce=self.reduce,
+            return_samples=True)
+        y.grad = self.gy
+        y.backward()
+
+        # Compare with the gradients accumulated for each sample.
+        gx = numpy.zeros_like(self.x)
+        gw = numpy.zeros_like(self.w)
+        for i in six.moves.range(len(self.x)):
+            if self.t[i] == -1:
+                continue
+            igy = self.gy if self.reduce == 'sum' else self.gy[i]
+            f = self.w[samples[i]].dot(self.x[i])
+            f[0] *= -1
+            g = igy / (1 + numpy.exp(-f))
+            g[0] *= -1
+            gx[i] = g.dot(self.w[samples[i]])
+            for ik, ig in six.moves.zip(samples[i], g):
+                gw[ik] += ig * self.x[i]
+
+        testing.assert_allclose(x.grad, gx, **self.check_options)
+        testing.assert_allclose(w.grad, gw, **self.check_options)
+
+
 class TestNegativeSamplingInvalidReductionOption(unittest.TestCase):
 
     def setUp(self):
@@ -210,6 +210,12 @@ class TestMaxPoolingNDIndices(unittest.TestCase):
     def test_cpu(self):
         self._check(self.x)
 
+    def test_cpu_indices_dtype(self):
+        # The indices are handed out in the default integer type of argmax.
+        _, indices = functions.max_pooling_nd(
+            self.x, 2, cover_all=False, return_indices=True)
+        assert indices.dtype == numpy.intp
+
     @attr.gpu
     @attr.cudnn
     def test_gpu(self):
@@ -7,6 +7,7 @@ import six
 import chainer
 from chainer import cuda
 from chainer import functions
+from chainer.functions.util import forget
 from chainer import gradient_check
 from chainer import links
 from chainer import testing
@@ -224,4 +225,91 @@ class TestBatchNormalization(unittest.TestCase):
             assert model2.link.N == 1
 
 
+@testing.parameterize(*testing.product({
+    'segmentation': [{}, {'n_segments': 1}, {'n_segments': 2},
+                     {'n_segments': 10}, {'memory_budget': 0},
+                     {'memory_budget': 1000}, {'memory_budget': 10 ** 9}],
+    'container': ['sequential', 'list'],
+}))
+class TestCheckpointSequential(unittest.TestCase):
+
+    def setUp(self):
+        layers = [links.Linear(4, 6), functions.relu, links.Linear(6, 6),
+                  functions.tanh, links.Linear(6, 3), functions.sigmoid]
+        if self.container == 'sequential':
+            self.layers = chainer.Sequential(*layers)
+        else:
+            self.layers = layers
+        self.reference = [
+            layer.copy('copy') if isinstance(layer, chainer.Link) else layer
+            for layer in layers]
+        self.x = numpy.random.uniform(-1, 1, (5, 4)).astype(numpy.float32)
+        self.gy = numpy.random.uniform(-1, 1, (5, 3)).astype(numpy.float32)
+
+    def test_forward_backward(self):
+        x = chainer.Variable(self.x)
+        y = functions.checkpoint_sequential(
+            self.layers, x, **self.segmentation)
+        y.grad = self.gy
+        y.backward()
+
+        x_ref = chainer.Variable(self.x)
+        h = x_ref
+        for layer in self.reference:
+            h = layer(h)
+        h.grad = self.gy
+        h.backward()
+
+        testing.assert_allclose(y.array, h.array)
+        testing.assert_allclose(x.grad, x_ref.grad)
+        links_ = [layer for layer in self.layers
+                  if isinstance(layer, chainer.Link)]
+        links_ref = [layer for layer in self.reference
+                     if isinstance(layer, chainer.Link)]
+        for link, link_ref in zip(links_, links_ref):
+            testing.assert_allclose(link.W.grad, link_ref.W.grad)
+            testing.assert_allclose(link.b.grad, link_ref.b.grad)
+
+
+class TestCheckpointSequentialSegments(unittest.TestCase):
+
+    def test_split_by_count(self):
+        assert forget._split_by_count(5, 2) in (
+            [(0, 2), (2, 5)], [(0, 3), (3, 5)])
+        assert forget._split_by_count(3, 3) == [(0, 1), (1, 2), (2, 3)]
+
+    def test_plan_segments(self):
+        sizes = [10, 10, 10, 10, 10, 10, 10, 10, 10]
+        assert forget._plan_segments(sizes, 90) is None
+        # Three segments retain two outputs and recompute 30 at once.
+        assert forget._plan_segments(sizes, 50) == [(0, 3), (3, 6), (6, 9)]
+        # The plan with the smallest peak is used if nothing fits.
+        segments = forget._plan_segments(sizes, 1)
+        assert forget._estimate_peak(sizes, segments) == 50
+
+    def test_plan_segments_by_size(self):
+        # Segments are balanced by the sizes rather than the counts.
+        sizes = [40, 10, 10, 10, 10, 10, 10]
+        segments = forget._plan_segments(sizes, 90)
+        assert segments == [(0, 2), (2, 7)]
+
+    def test_output_sizes_cached(self):
+        model = chainer.Sequential(links.Linear(4, 6), functions.relu)
+        x = numpy.random.uniform(-1, 1, (5, 4)).astype(numpy.float32)
+        sizes = forget._get_output_sizes(model, (x,))
+        assert sizes == [5 * 6 * 4, 5 * 6 * 4]
+        assert forget._get_output_sizes(model, (x,)) is sizes
+
+    def test_invalid_arguments(self):
+        model = chainer.Sequential(links.Linear(4, 6))
+        x = numpy.zeros((1, 4), numpy.float32)
+        with self.assertRaises(ValueError):
+            functions.checkpoint_sequential(
+                model, x, n_segments=2, memory_budget=10)
+        with self.assertRaises(ValueError):
+            functions.checkpoint_sequential(model, x, n_segments=0)
+        with self.assertRaises(ValueError):
+            functions.checkpoint_sequential([], x)
+
+
 testing.run_module(__name__, __file__)
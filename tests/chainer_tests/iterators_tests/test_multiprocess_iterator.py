@@ -15,6 +15,7 @@ import unittest
 import numpy
 import six
 
+from chainer import dataset
 from chainer import iterators
 from chainer import serializer
 from chainer import testing
@@ -372,6 +373,148 @@ class TestMultiprocessIteratorSlow(
     pass
 
 
+@testing.parameterize(*testing.product({
+    'n_prefetch': [1, 2],
+    'shared_mem': [None, 1000000],
+}))
+class TestMultiprocessIteratorZeroCopy(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = [
+            (numpy.full((3, 4), i, dtype=numpy.float32), i)
+            for i in range(10)]
+
+    def test_iterator_values(self):
+        it = iterators.MultiprocessIterator(
+            self.dataset, 3, repeat=False, shuffle=False, n_processes=2,
+            n_prefetch=self.n_prefetch, shared_mem=self.shared_mem,
+            zero_copy=True)
+        n = 0
+        for batch in it:
+            for x, i in batch:
+                numpy.testing.assert_array_equal(x, self.dataset[i][0])
+                n += 1
+        assert n == len(self.dataset)
+        it.finalize()
+
+    def test_iterator_views(self):
+        it = iterators.MultiprocessIterator(
+            self.dataset, 2, n_processes=2, n_prefetch=self.n_prefetch,
+            shared_mem=self.shared_mem, zero_copy=True)
+        # The first batch may be fetched in the main process to measure the
+        # size of examples
+        it.next()
+        for _ in range(5):
+            batch = it.next()
+            for x, i in batch:
+                assert not x.flags.owndata
+                numpy.testing.assert_array_equal(x, self.dataset[i][0])
+        it.finalize()
+
+    def test_reset(self):
+        it = iterators.MultiprocessIterator(
+            self.dataset, 2, n_processes=2, n_prefetch=self.n_prefetch,
+            shared_mem=self.shared_mem, zero_copy=True)
+        for _ in range(3):
+            for _ in range(4):
+                it.next()
+            it.reset()
+        it.finalize()
+
+
+class TestMultiprocessIteratorSharedMemoryReallocation(unittest.TestCase):
+
+    def test_enlarge_shared_memory(self):
+        dataset = [numpy.full(i * 100, i, dtype=numpy.float32)
+                   for i in range(1, 9)]
+        it = iterators.MultiprocessIterator(
+            dataset, 2, repeat=False, shuffle=False, n_processes=2,
+            shared_mem=800)
+        batches = list(it)
+        for i, batch in enumerate(batches):
+            for j, x in enumerate(batch):
+                numpy.testing.assert_array_equal(x, dataset[i * 2 + j])
+        assert it._prefetch_loop.mem_size == dataset[-1].nbytes
+        it.finalize()
+
+
+@testing.parameterize(*testing.product({
+    'shared_mem': [None, 1000000],
+    'zero_copy': [False, True],
+}))
+class TestMultiprocessIteratorCollate(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = [
+            (numpy.full((3, 4), i, dtype=numpy.float32), numpy.int32(i))
+            for i in range(10)]
+
+    def test_iterator_values(self):
+        it = iterators.MultiprocessIterator(
+            self.dataset, 3, repeat=False, shuffle=False, n_processes=2,
+            shared_mem=self.shared_mem, zero_copy=self.zero_copy,
+            collate=dataset.concat_examples)
+        n = 0
+        # With zero_copy, a batch is valid only until the next one is fetched
+        for k, (x, t) in enumerate(it):
+            indices = numpy.arange(k * 3, min(k * 3 + 3, len(self.dataset)))
+            assert isinstance(x, numpy.ndarray)
+            assert x.shape == (len(indices), 3, 4)
+            numpy.testing.assert_array_equal(t, indices)
+            numpy.testing.assert_array_equal(
+                x, numpy.broadcast_to(indices[:, None, None], x.shape))
+            n += 1
+        assert n == 4
+        it.finalize()
+
+    def test_enlarge_shared_memory(self):
+        data = [numpy.full(i * 100, i, dtype=numpy.float32)
+                for i in range(1, 9)]
+        it = iterators.MultiprocessIterator(
+            data, 2, repeat=False, shuffle=False, n_processes=2,
+            shared_mem=self.shared_mem, zero_copy=self.zero_copy,
+            collate=lambda batch: numpy.concatenate(batch))
+        for i, x in enumerate(it):
+            numpy.testing.assert_array_equal(
+                x, numpy.concatenate(data[i * 2:i * 2 + 2]))
+        assert it._prefetch_loop.collate_mem_size >= (
+            data[-2].nbytes + data[-1].nbytes)
+        it.finalize()
+
+
+class _BatchDataset(dataset.DatasetMixin):
+
+    def __init__(self, values):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def get_example(self, i):
+        raise AssertionError('get_examples should be used')
+
+    def get_examples(self, indices):
+        return [self.values[i] for i in indices]
+
+
+@testing.parameterize(*testing.product({
+    'shared_mem': [None, 1000000],
+    'n_processes': [1, 3],
+}))
+class TestMultiprocessIteratorGetExamples(unittest.TestCase):
+
+    def test_iterator_values(self):
+        values = [numpy.full(3, i, dtype=numpy.float32) for i in range(10)]
+        it = iterators.MultiprocessIterator(
+            _BatchDataset(values), 4, repeat=False, shuffle=False,
+            n_processes=self.n_processes, shared_mem=self.shared_mem)
+        batches = list(it)
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+        for i, x in enumerate(sum(batches, [])):
+            numpy.testing.assert_array_equal(x, values[i])
+        it.finalize()
+
+
 # Pickle doesnt allow to use lambdas or pure functions
 # when serializing the iterator
 # work is needed to wrap samplers in classes instead of
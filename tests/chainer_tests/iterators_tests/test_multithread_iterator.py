@@ -5,6 +5,7 @@ import unittest
 import numpy
 import six
 
+from chainer import dataset
 from chainer import iterators
 from chainer import serializer
 from chainer import testing
@@ -43,6 +44,38 @@ class DummyDeserializer(serializer.Deserializer):
         return value
 
 
+@testing.parameterize(*testing.product({
+    'n_threads': [1, 2],
+}))
+class TestMultithreadIteratorCollate(unittest.TestCase):
+
+    def test_iterator_values(self):
+        data = [(numpy.full((3, 4), i, dtype=numpy.float32), numpy.int32(i))
+                for i in range(10)]
+        it = iterators.MultithreadIterator(
+            data, 3, repeat=False, shuffle=False, n_threads=self.n_threads,
+            collate=dataset.concat_examples)
+        batches = list(it)
+        assert len(batches) == 4
+        for k, (x, t) in enumerate(batches):
+            indices = numpy.arange(k * 3, min(k * 3 + 3, len(data)))
+            assert x.shape == (len(indices), 3, 4)
+            numpy.testing.assert_array_equal(t, indices)
+            numpy.testing.assert_array_equal(
+                x, numpy.broadcast_to(indices[:, None, None], x.shape))
+        it.finalize()
+
+    def test_reset(self):
+        data = numpy.arange(10, dtype=numpy.float32)
+        it = iterators.MultithreadIterator(
+            data, 4, shuffle=False, n_threads=self.n_threads,
+            collate=numpy.stack)
+        numpy.testing.assert_array_equal(it.next(), data[:4])
+        it.reset()
+        numpy.testing.assert_array_equal(it.next(), data[:4])
+        it.finalize()
+
+
 @testing.parameterize(*testing.product({
     'n_threads': [1, 2],
     'order_sampler': [
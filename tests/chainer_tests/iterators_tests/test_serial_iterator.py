@@ -3,6 +3,7 @@ import unittest
 
 import numpy
 
+from chainer import dataset
 from chainer import iterators
 from chainer import serializer
 from chainer import testing
@@ -418,4 +419,50 @@ class TestSerialIteratorInvalidOrderSampler(unittest.TestCase):
             it.next()
 
 
+class BatchDataset(dataset.DatasetMixin):
+
+    def __init__(self, values):
+        self.values = values
+        self.calls = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def get_example(self, i):
+        raise AssertionError('get_examples should be used')
+
+    def get_examples(self, indices):
+        self.calls.append(list(indices))
+        return [self.values[i] for i in indices]
+
+
+class TestSerialIteratorGetExamples(unittest.TestCase):
+
+    def test_get_examples(self):
+        ds = BatchDataset([1, 2, 3, 4, 5])
+        it = iterators.SerialIterator(ds, 2, shuffle=False)
+        self.assertEqual(it.next(), [1, 2])
+        self.assertEqual(it.next(), [3, 4])
+        self.assertEqual(it.next(), [5, 1])
+        self.assertEqual(ds.calls, [[0, 1], [2, 3], [4, 0]])
+
+
+class TestSerialIteratorColumnar(unittest.TestCase):
+
+    def test_columnar(self):
+        ds = dataset.tabular.from_data(
+            numpy.arange(10), numpy.arange(10) * 2)
+        it = iterators.SerialIterator(ds, 4, repeat=False, shuffle=False,
+                                      columnar=True)
+        batches = list(it)
+        self.assertEqual(len(batches), 3)
+        a, b = batches[1]
+        numpy.testing.assert_array_equal(a, [4, 5, 6, 7])
+        numpy.testing.assert_array_equal(b, [8, 10, 12, 14])
+
+    def test_columnar_invalid_dataset(self):
+        with self.assertRaises(TypeError):
+            iterators.SerialIterator([1, 2, 3], 2, columnar=True)
+
+
 testing.run_module(__name__, __file__)
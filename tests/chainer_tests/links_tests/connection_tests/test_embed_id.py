@@ -129,4 +129,115 @@ class TestEmbedIDUnpickleOldFile(unittest.TestCase):
         self.assertEqual(y.data.shape, (2, 4))
 
 
+@testing.parameterize(*testing.product({
+    'ignore_label': [None, -1],
+    'n_calls': [1, 2],
+}))
+class TestEmbedIDSparseGrad(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.array([[3, 1, 3], [0, 3, -1]], numpy.int32)
+        if self.ignore_label is None:
+            self.x[1, 2] = 1
+        self.gy = numpy.random.uniform(-1, 1, (2, 3, 2)).astype(numpy.float32)
+
+    def compute_grad(self, sparse_grad):
+        numpy.random.seed(0)
+        link = links.EmbedID(
+            5, 2, ignore_label=self.ignore_label, sparse_grad=sparse_grad)
+        link.cleargrads()
+        for _ in range(self.n_calls):
+            y = link(self.x)
+            y.grad = self.gy
+            y.backward()
+        return link.W.grad
+
+    def test_sparse_grad(self):
+        dense = self.compute_grad(False)
+        sparse = self.compute_grad(True)
+        assert isinstance(sparse, chainer.utils.RowSparseArray)
+        assert sparse.shape == dense.shape
+        assert sorted(set(sparse.indices.tolist())) == [
+            i for i in range(5) if i in self.x]
+        testing.assert_allclose(sparse.to_dense(), dense)
+
+    def test_double_backprop(self):
+        # The dense gradient is computed if double backprop is enabled.
+        link = links.EmbedID(5, 2, sparse_grad=True)
+        y = link(numpy.array([0, 3], numpy.int32))
+        gW, = chainer.grad([y], [link.W], [numpy.ones((2, 2), numpy.float32)],
+                           enable_double_backprop=True)
+        assert isinstance(gW.array, numpy.ndarray)
+
+
+@testing.parameterize(*testing.product({
+    'hook': ['WeightDecay', 'GradientClipping', 'GradientHardClipping',
+             'loss_scaling'],
+}))
+class TestEmbedIDSparseGradUniqueIDs(unittest.TestCase):
+
+    def test_update(self):
+        # The gradient of sorted unique IDs must not be a view of the
+        # upstream gradient, which the hooks below would modify in place.
+        link = links.EmbedID(10, 3, sparse_grad=True)
+        W = link.W.array.copy()
+        optimizer = chainer.optimizers.SGD(lr=1)
+        optimizer.setup(link)
+        if self.hook == 'WeightDecay':
+            optimizer.add_hook(chainer.optimizer_hooks.WeightDecay(0.5))
+        elif self.hook == 'GradientClipping':
+            optimizer.add_hook(chainer.optimizer_hooks.GradientClipping(0.1))
+        elif self.hook == 'GradientHardClipping':
+            optimizer.add_hook(
+                chainer.optimizer_hooks.GradientHardClipping(-0.5, 0.5))
+        else:
+            optimizer.loss_scaling()
+
+        y = link(numpy.array([1, 2], numpy.int32))
+        loss = chainer.functions.sum(y)
+        link.cleargrads()
+        loss.backward()
+        optimizer.update()
+
+        assert (link.W.array[[0] + list(range(3, 10))] ==
+                W[[0] + list(range(3, 10))]).all()
+        assert (link.W.array[1:3] != W[1:3]).all()
+
+
+class TestEmbedIDSparseGradAddgrads(unittest.TestCase):
+
+    def backward(self, link, ids):
+        y = link(numpy.array(ids, numpy.int32))
+        y.grad = numpy.ones(y.shape, numpy.float32)
+        y.backward()
+
+    def test_addgrads(self):
+        link1 = links.EmbedID(5, 2, sparse_grad=True)
+        link2 = links.EmbedID(5, 2, sparse_grad=True)
+        link1.cleargrads()
+        link2.cleargrads()
+        self.backward(link1, [3, 1])
+        self.backward(link2, [3, 0])
+        link1.addgrads(link2)
+        grad = link1.W.grad
+        assert isinstance(grad, chainer.utils.RowSparseArray)
+        expect = numpy.zeros((5, 2), numpy.float32)
+        expect[[0, 1]] = 1
+        expect[3] = 2
+        testing.assert_allclose(grad.to_dense(), expect)
+
+    def test_addgrads_to_dense(self):
+        link1 = links.EmbedID(5, 2)
+        link2 = links.EmbedID(5, 2, sparse_grad=True)
+        link1.cleargrads()
+        link2.cleargrads()
+        self.backward(link1, [3, 1])
+        self.backward(link2, [3, 0])
+        link1.addgrads(link2)
+        expect = numpy.zeros((5, 2), numpy.float32)
+        expect[[0, 1]] = 1
+        expect[3] = 2
+        testing.assert_allclose(link1.W.grad, expect)
+
+
 testing.run_module(__name__, __file__)
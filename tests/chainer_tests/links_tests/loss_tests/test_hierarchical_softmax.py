@@ -53,10 +53,12 @@ class TestBinaryHierarchicalSoftmax(unittest.TestCase):
         if self.dtype == numpy.float16:
             self.check_sum_options = {'delta': 1e-3}
             self.test_forward_options = {'atol': 0.005}
+            self.check_forward_options = {'atol': 1e-2, 'rtol': 1e-2}
             self.check_backward_options = {'dtype': numpy.float64}
         else:
             self.check_sum_options = {'delta': 1e-5}
             self.test_forward_options = {}
+            self.check_forward_options = {}
             self.check_backward_options = {}
 
     def tearDown(self):
@@ -97,6 +99,28 @@ class TestBinaryHierarchicalSoftmax(unittest.TestCase):
         testing.assert_allclose(
             cpu_loss, cuda.to_cpu(gpu_loss), **self.test_forward_options)
 
+    def test_forward_cpu(self):
+        func = self.link._func
+        x = numpy.random.uniform(-1, 1, (6, 3)).astype(self.dtype)
+        t = numpy.array([0, 2, 4, 2, 1, 3], numpy.int32)
+        loss = self.link(chainer.Variable(x), chainer.Variable(t)).data
+
+        # The expected value is computed in float64.
+        W = self.W.astype(numpy.float64)
+        expect = 0
+        for ix, it in zip(x.astype(numpy.float64), t):
+            begin, end = func.begins[it], func.begins[it + 1]
+            wxy = W[func.paths[begin:end]].dot(ix) * func.codes[begin:end]
+            expect += numpy.logaddexp(0.0, -wxy).sum()
+        self.assertEqual(loss.dtype, self.dtype)
+        testing.assert_allclose(loss, expect, **self.check_forward_options)
+
+    @condition.retry(3)
+    def test_backward_cpu_repeated_labels(self):
+        x = numpy.random.uniform(-1, 1, (6, 3)).astype(self.dtype)
+        t = numpy.array([0, 2, 4, 2, 1, 2], numpy.int32)
+        self.check_backward(x, t, self.gy)
+
     def check_backward(self, x_data, t_data, y_grad):
 
         def f(x, t):
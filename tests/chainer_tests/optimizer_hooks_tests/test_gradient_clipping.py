@@ -80,4 +80,28 @@ class TestGradientClipping(unittest.TestCase):
             2.0)
 
 
+class TestGradientClippingSparseGrad(unittest.TestCase):
+
+    def test_gradient_clipping_sparse_grad(self):
+        link = chainer.links.EmbedID(5, 3, sparse_grad=True)
+        initial = link.W.array.copy()
+        y = link(np.array([3, 1, 3], np.int32))
+        y.grad = np.ones((3, 3), np.float32)
+        link.cleargrads()
+        y.backward()
+        assert isinstance(link.W.grad, chainer.utils.RowSparseArray)
+
+        opt = optimizers.SGD(lr=1)
+        opt.setup(link)
+        opt.add_hook(optimizer_hooks.GradientClipping(1.0))
+        opt.update()
+
+        # The norm is computed after summing up the duplicated rows.
+        norm = math.sqrt(3 * 1 ** 2 + 3 * 2 ** 2)
+        expect = initial.copy()
+        expect[1] -= 1 / norm
+        expect[3] -= 2 / norm
+        testing.assert_allclose(expect, link.W.array)
+
+
 testing.run_module(__name__, __file__)
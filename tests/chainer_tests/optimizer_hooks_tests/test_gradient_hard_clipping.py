@@ -2,6 +2,7 @@ import unittest
 
 import numpy as np
 
+import chainer
 from chainer import optimizer_hooks
 from chainer import optimizers
 from chainer import testing
@@ -63,4 +64,27 @@ class TestGradientHardClipping(unittest.TestCase):
             [backend_config0, backend_config1, backend_config2])
 
 
+class TestGradientHardClippingSparseGrad(unittest.TestCase):
+
+    def test_gradient_hard_clipping_sparse_grad(self):
+        link = chainer.links.EmbedID(5, 3, sparse_grad=True)
+        initial = link.W.array.copy()
+        y = link(np.array([3, 1, 3], np.int32))
+        y.grad = np.ones((3, 3), np.float32)
+        link.cleargrads()
+        y.backward()
+        assert isinstance(link.W.grad, chainer.utils.RowSparseArray)
+
+        opt = optimizers.SGD(lr=1)
+        opt.setup(link)
+        opt.add_hook(optimizer_hooks.GradientHardClipping(-0.1, 1.5))
+        opt.update()
+
+        # The duplicated rows are summed up before clipping.
+        expect = initial.copy()
+        expect[1] -= 1
+        expect[3] -= 1.5
+        testing.assert_allclose(expect, link.W.array)
+
+
 testing.run_module(__name__, __file__)
@@ -4,6 +4,7 @@ import itertools
 import mock
 import numpy as np
 
+import chainer
 from chainer import optimizer_hooks
 from chainer import optimizers
 from chainer import testing
@@ -85,4 +86,32 @@ class TestGradientNoise(unittest.TestCase):
             [backend_config0, backend_config1, backend_config2])
 
 
+class TestGradientNoiseSparseGrad(unittest.TestCase):
+
+    def test_gradient_noise_sparse_grad(self):
+        rate = 0.2
+        link = chainer.links.EmbedID(5, 3, sparse_grad=True)
+        initial = link.W.array.copy()
+        y = link(np.array([3, 1, 3], np.int32))
+        y.grad = np.ones((3, 3), np.float32)
+        link.cleargrads()
+        y.backward()
+        assert isinstance(link.W.grad, chainer.utils.RowSparseArray)
+
+        def noise_func(xp, shape, dtype, hook, opt):
+            return xp.full(shape, rate, dtype)
+
+        opt = optimizers.SGD(lr=1)
+        opt.setup(link)
+        opt.add_hook(optimizer_hooks.GradientNoise(
+            1, noise_func=noise_func))
+        opt.update()
+
+        # Only the rows in the gradient are perturbed.
+        expect = initial.copy()
+        expect[1] -= 1 + rate
+        expect[3] -= 2 + rate
+        testing.assert_allclose(expect, link.W.array)
+
+
 testing.run_module(__name__, __file__)
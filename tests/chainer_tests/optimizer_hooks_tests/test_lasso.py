@@ -2,6 +2,7 @@ import unittest
 
 import numpy as np
 
+import chainer
 from chainer import optimizer_hooks
 from chainer import optimizers
 from chainer import testing
@@ -60,4 +61,28 @@ class TestLasso(unittest.TestCase):
         self.check_lasso([backend_config0, backend_config1, backend_config2])
 
 
+class TestLassoSparseGrad(unittest.TestCase):
+
+    def test_lasso_sparse_grad(self):
+        rate = 0.2
+        link = chainer.links.EmbedID(5, 3, sparse_grad=True)
+        initial = link.W.array.copy()
+        y = link(np.array([3, 1, 3], np.int32))
+        y.grad = np.ones((3, 3), np.float32)
+        link.cleargrads()
+        y.backward()
+        assert isinstance(link.W.grad, chainer.utils.RowSparseArray)
+
+        opt = optimizers.SGD(lr=1)
+        opt.setup(link)
+        opt.add_hook(optimizer_hooks.Lasso(rate))
+        opt.update()
+
+        # Only the rows in the gradient are regularized.
+        expect = initial.copy()
+        expect[1] -= 1 + rate * np.sign(initial[1])
+        expect[3] -= 2 + rate * np.sign(initial[3])
+        testing.assert_allclose(expect, link.W.array)
+
+
 testing.run_module(__name__, __file__)
@@ -95,4 +95,28 @@ class TestWeightDecayLossScale(unittest.TestCase):
         return link.p.array
 
 
+class TestWeightDecaySparseGrad(unittest.TestCase):
+
+    def test_weight_decay_sparse_grad(self):
+        decay = 0.2
+        link = chainer.links.EmbedID(5, 3, sparse_grad=True)
+        initial = link.W.array.copy()
+        y = link(np.array([3, 1, 3], np.int32))
+        y.grad = np.ones((3, 3), np.float32)
+        link.cleargrads()
+        y.backward()
+        assert isinstance(link.W.grad, chainer.utils.RowSparseArray)
+
+        opt = optimizers.SGD(lr=1)
+        opt.setup(link)
+        opt.add_hook(optimizer_hooks.WeightDecay(decay))
+        opt.update()
+
+        # Only the rows in the gradient are decayed.
+        expect = initial.copy()
+        expect[1] -= 1 + decay * initial[1]
+        expect[3] -= 2 + decay * initial[3]
+        testing.assert_allclose(expect, link.W.array)
+
+
 testing.run_module(__name__, __file__)
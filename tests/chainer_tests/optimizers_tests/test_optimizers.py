@@ -1,5 +1,7 @@
+import copy
 import unittest
 
+import mock
 import six
 
 import numpy as np
@@ -7,6 +9,7 @@ import numpy as np
 import chainer
 from chainer import optimizers
 from chainer import testing
+import chainerx
 
 
 _parameterize_optimizers = testing.parameterize(*testing.product({
@@ -236,4 +239,269 @@ class TestAMSGrad(unittest.TestCase):
             atol=1e-7, rtol=1e-7)
 
 
+@testing.backend.inject_backend_tests(
+    None,
+    [
+        # CPU
+        {},
+        # Intel
+        {'use_ideep': True},
+        # CUDA
+        {'use_cuda': True, 'cuda_device': 0},
+        # ChainerX
+        {'use_chainerx': True, 'chainerx_device': 'native:0'},
+        {'use_chainerx': True, 'chainerx_device': 'cuda:0'},
+    ]
+)
+@testing.parameterize(*testing.product({
+    'optimizer_impl': [
+        optimizers.AdaGrad,
+        optimizers.Adam,
+        optimizers.AMSGrad,
+        optimizers.MomentumSGD,
+        optimizers.RMSprop,
+    ]
+}))
+class TestOptimizerFusedUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.xs = [np.random.uniform(-1, 1, (3, 4)).astype(np.float32)
+                   for _ in range(3)]
+
+    def create(self, device, fused):
+        np.random.seed(0)
+        link = chainer.Sequential(
+            chainer.links.Linear(4, 3), chainer.functions.tanh,
+            chainer.links.Linear(3, 2))
+        link.to_device(device)
+        opt = self.optimizer_impl()
+        opt.setup(link)
+        if fused:
+            opt.use_fused_update()
+        return link, opt
+
+    def run_updates(self, link, opt, device):
+        for x in self.xs:
+            x = device.send(x)
+            opt.update(lambda: chainer.functions.sum(link(x) ** 2))
+
+    def check_equal(self, link1, link2):
+        for (name, p1), (_, p2) in six.moves.zip(
+                sorted(link1.namedparams()), sorted(link2.namedparams())):
+            testing.assert_allclose(p1.array, p2.array, rtol=1e-5)
+            state1 = p1.update_rule.state
+            state2 = p2.update_rule.state
+            if state1 is None:
+                assert state2 is None
+                continue
+            assert sorted(state1.keys()) == sorted(state2.keys())
+            for key in state1:
+                testing.assert_allclose(state1[key], state2[key], rtol=1e-5)
+
+    def test_fused_update(self, backend_config):
+        device = backend_config.device
+        link1, opt1 = self.create(device, False)
+        link2, opt2 = self.create(device, True)
+        self.run_updates(link1, opt1, device)
+        self.run_updates(link2, opt2, device)
+        self.check_equal(link1, link2)
+
+    def test_arena_views(self, backend_config):
+        device = backend_config.device
+        if device.xp is chainerx or isinstance(
+                device, chainer.backends.intel64.Intel64Device):
+            raise unittest.SkipTest('arena is only used for NumPy/CuPy')
+        link, opt = self.create(device, True)
+        self.run_updates(link, opt, device)
+        assert len(opt._arenas) == 1
+        arena, = opt._arenas.values()
+        for param in link.params():
+            assert param.array.base is not None
+            assert param.grad.base is not None
+            for value in param.update_rule.state.values():
+                assert value.base is not None
+        assert arena.data.size == sum(p.size for p in link.params())
+
+    def test_fallback(self, backend_config):
+        device = backend_config.device
+        link1, opt1 = self.create(device, False)
+        link2, opt2 = self.create(device, True)
+        for link in (link1, link2):
+            link[0].W.update_rule.enabled = False
+        self.run_updates(link1, opt1, device)
+        self.run_updates(link2, opt2, device)
+        self.check_equal(link1, link2)
+
+    def test_hooks(self, backend_config):
+        device = backend_config.device
+        links = []
+        for fused in (False, True):
+            link, opt = self.create(device, fused)
+            opt.add_hook(chainer.optimizer_hooks.WeightDecay(1e-2))
+            opt.add_hook(chainer.optimizer_hooks.Lasso(1e-3))
+            opt.add_hook(chainer.optimizer_hooks.GradientClipping(0.5))
+            opt.add_hook(
+                chainer.optimizer_hooks.GradientHardClipping(-0.1, 0.1))
+            self.run_updates(link, opt, device)
+            links.append(link)
+        self.check_equal(*links)
+
+    def test_elementwise_hook_on_arena(self, backend_config):
+        device = backend_config.device
+        if device.xp is chainerx or isinstance(
+                device, chainer.backends.intel64.Intel64Device):
+            raise unittest.SkipTest('arena is only used for NumPy/CuPy')
+        sizes = []
+
+        def hook(rule, param):
+            sizes.append(param.size)
+        hook.call_for_each_param = True
+        hook._elementwise = True
+
+        link, opt = self.create(device, True)
+        opt.add_hook(hook)
+        self.run_updates(link, opt, device)
+        n_params = sum(p.size for p in link.params())
+        assert sizes == [n_params] * len(self.xs)
+
+    def test_arenas_prepared_once(self, backend_config):
+        device = backend_config.device
+        link, opt = self.create(device, True)
+        opt.add_hook(chainer.optimizer_hooks.WeightDecay(1e-2))
+        opt.add_hook(chainer.optimizer_hooks.GradientClipping(0.5))
+        opt.add_hook(
+            chainer.optimizer_hooks.GradientHardClipping(-0.1, 0.1))
+        with mock.patch.object(
+                opt, '_prepare_arenas', wraps=opt._prepare_arenas) as m:
+            self.run_updates(link, opt, device)
+        assert m.call_count == len(self.xs)
+        assert opt._arena_layout is None
+
+    def snapshot(self, opt):
+        target = {}
+        opt.serialize(chainer.serializers.DictionarySerializer(target))
+        return copy.deepcopy(target)
+
+    def test_serialize_compatible(self, backend_config):
+        device = backend_config.device
+        link1, opt1 = self.create(device, True)
+        link2, opt2 = self.create(device, False)
+        self.run_updates(link1, opt1, device)
+        self.run_updates(link2, opt2, device)
+
+        # A snapshot of the fused optimizer can be loaded to the unfused one
+        # and vice versa.
+        target = self.snapshot(opt1)
+        link3, opt3 = self.create(device, False)
+        link3.copyparams(link1)
+        opt3.serialize(chainer.serializers.NpzDeserializer(target))
+
+        target = self.snapshot(opt2)
+        link4, opt4 = self.create(device, True)
+        link4.copyparams(link2)
+        self.run_updates(link4, opt4, device)
+        link4.copyparams(link2)
+        opt4.serialize(chainer.serializers.NpzDeserializer(target))
+
+        self.run_updates(link1, opt1, device)
+        self.run_updates(link2, opt2, device)
+        self.run_updates(link3, opt3, device)
+        self.run_updates(link4, opt4, device)
+        self.check_equal(link1, link3)
+        self.check_equal(link2, link4)
+
+
+@testing.parameterize(*testing.product({
+    'optimizer_impl': [
+        optimizers.AdaGrad,
+        optimizers.Adam,
+        optimizers.AMSGrad,
+        optimizers.MomentumSGD,
+        optimizers.RMSprop,
+        optimizers.SGD,
+    ],
+    'loss_scale': [None, 4.],
+}))
+class TestOptimizerSparseUpdate(unittest.TestCase):
+
+    def create(self, sparse_grad):
+        np.random.seed(0)
+        link = chainer.links.EmbedID(6, 3, sparse_grad=sparse_grad)
+        opt = self.optimizer_impl()
+        opt.setup(link)
+        return link, opt
+
+    def update(self, link, opt, ids):
+        x = np.array(ids, np.int32)
+        loss = chainer.functions.sum(link(x) ** 2)
+        link.cleargrads()
+        loss.backward(loss_scale=self.loss_scale)
+        opt.update()
+
+    def test_sparse_update(self):
+        link1, opt1 = self.create(False)
+        link2, opt2 = self.create(True)
+        initial = link1.W.array.copy()
+
+        # The states are zero before the first update, so the lazy update is
+        # equivalent to the dense one.
+        for link, opt in ((link1, opt1), (link2, opt2)):
+            self.update(link, opt, [1, 4, 1])
+        assert isinstance(link2.W.grad, chainer.utils.RowSparseArray)
+        testing.assert_allclose(link1.W.array, link2.W.array)
+
+        # Rows that are not referenced are not updated.
+        before = link2.W.array.copy()
+        states = {name: value.copy()
+                  for name, value in link2.W.update_rule.state.items()}
+        self.update(link2, opt2, [2, 2])
+        after = link2.W.array
+        np.testing.assert_array_equal(after[[0, 1, 3, 4, 5]],
+                                      before[[0, 1, 3, 4, 5]])
+        assert not (after[2] == before[2]).any()
+        np.testing.assert_array_equal(after[[0, 3, 5]], initial[[0, 3, 5]])
+        for name, value in link2.W.update_rule.state.items():
+            np.testing.assert_array_equal(
+                value[[0, 1, 3, 4, 5]], states[name][[0, 1, 3, 4, 5]])
+
+    def test_fused_update(self):
+        link1, opt1 = self.create(True)
+        link2, opt2 = self.create(True)
+        opt2.use_fused_update()
+        for ids in ([1, 4, 1], [2, 2]):
+            self.update(link1, opt1, ids)
+            self.update(link2, opt2, ids)
+        testing.assert_allclose(link1.W.array, link2.W.array)
+
+
+class TestOptimizerSparseGradDynamicLossScaling(unittest.TestCase):
+
+    def update(self, link, opt, gy):
+        y = link(np.array([3, 1, 3], np.int32))
+        y.grad = gy
+        link.cleargrads()
+        y.backward()
+        assert isinstance(link.W.grad, chainer.utils.RowSparseArray)
+        opt.update()
+
+    def test_dynamic_loss_scaling(self):
+        link = chainer.links.EmbedID(5, 3, sparse_grad=True)
+        opt = optimizers.SGD(lr=1)
+        opt.setup(link)
+        opt.loss_scaling()
+
+        initial = link.W.array.copy()
+        self.update(link, opt, np.ones((3, 3), np.float32))
+        assert opt.is_safe_to_update()
+        assert not (link.W.array[[1, 3]] == initial[[1, 3]]).any()
+
+        before = link.W.array.copy()
+        gy = np.ones((3, 3), np.float32)
+        gy[1, 0] = np.inf
+        with testing.assert_warns(UserWarning):
+            self.update(link, opt, gy)
+        assert not opt.is_safe_to_update()
+        np.testing.assert_array_equal(link.W.array, before)
+
+
 testing.run_module(__name__, __file__)
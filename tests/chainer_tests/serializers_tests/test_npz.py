@@ -1,4 +1,6 @@
+import json
 import os
+import shutil
 import tempfile
 import unittest
 
@@ -544,6 +546,115 @@ class TestLoadNpz(unittest.TestCase):
             target.parent_linear.W.data)
 
 
+@testing.parameterize(*testing.product({
+    'n_shards': [1, 3, 10],
+    'n_threads': [None, 1],
+    'compress': [False, True],
+}))
+class TestSaveNpzSharded(unittest.TestCase):
+
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.source = link.Chain()
+        with self.source.init_scope():
+            self.source.l1 = links.Linear(3, 2)
+            self.source.l2 = links.Linear(2, 4)
+        self.source.add_persistent('p', 3)
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def make_target(self):
+        target = link.Chain()
+        with target.init_scope():
+            target.l1 = links.Linear(3, 2)
+            target.l2 = links.Linear(2, 4)
+        target.add_persistent('p', 0)
+        return target
+
+    def test_save_and_load(self):
+        npz.save_npz_sharded(
+            self.dirname, self.source, n_shards=self.n_shards,
+            compression=self.compress, n_threads=self.n_threads)
+
+        with open(os.path.join(self.dirname, 'manifest.json')) as f:
+            manifest = json.load(f)
+        # The number of shards is bounded by the number of arrays (5)
+        assert len(manifest['shards']) == min(self.n_shards, 5)
+        assert sorted(manifest['keys']) == [
+            'l1/W', 'l1/b', 'l2/W', 'l2/b', 'p']
+
+        target = self.make_target()
+        npz.load_npz(self.dirname, target)
+        for (name, param), (_, expected) in zip(
+                sorted(target.namedparams()),
+                sorted(self.source.namedparams())):
+            numpy.testing.assert_array_equal(param.array, expected.array)
+        assert target.p == 3
+
+    def test_load_with_path(self):
+        npz.save_npz_sharded(
+            self.dirname, self.source, n_shards=self.n_shards,
+            compression=self.compress, n_threads=self.n_threads)
+        target = links.Linear(2, 4)
+        npz.load_npz(self.dirname, target, path='l2/')
+        numpy.testing.assert_array_equal(
+            target.W.array, self.source.l2.W.array)
+
+    def test_invalid_n_shards(self):
+        with self.assertRaises(ValueError):
+            npz.save_npz_sharded(self.dirname, self.source, n_shards=0)
+
+
+@testing.parameterize(*testing.product({
+    'mmap_mode': ['r', 'c'],
+    'copy': [True, False],
+}))
+class TestLoadNpzMmap(unittest.TestCase):
+
+    def setUp(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.file = path
+
+        self.source = links.Linear(3, 2)
+        self.source.add_persistent('p', numpy.arange(4, dtype=numpy.int32))
+        self.source.add_persistent('q', None)
+        npz.save_npz(self.file, self.source, compression=False)
+
+    def tearDown(self):
+        os.remove(self.file)
+
+    def test_load(self):
+        target = links.Linear(3, 2)
+        target.add_persistent('p', numpy.zeros(4, dtype=numpy.int32))
+        target.add_persistent('q', 1)
+        W = target.W.array
+        npz.load_npz(
+            self.file, target, mmap_mode=self.mmap_mode, copy=self.copy)
+
+        numpy.testing.assert_array_equal(target.W.array, self.source.W.array)
+        numpy.testing.assert_array_equal(target.b.array, self.source.b.array)
+        numpy.testing.assert_array_equal(target.p, self.source.p)
+        assert target.q is None
+        if self.copy:
+            assert target.W.array is W
+        else:
+            assert target.W.array is not W
+            assert target.W.array.flags.writeable == (self.mmap_mode == 'c')
+
+    def test_load_compressed(self):
+        npz.save_npz(self.file, self.source, compression=True)
+        with self.assertRaises(ValueError):
+            npz.load_npz(self.file, links.Linear(3, 2),
+                         mmap_mode=self.mmap_mode)
+
+    def test_load_file_object(self):
+        with open(self.file, 'rb') as f:
+            with self.assertRaises(TypeError):
+                npz.load_npz(f, links.Linear(3, 2), mmap_mode=self.mmap_mode)
+
+
 @testing.parameterize(*testing.product({
     'compress': [False, True],
     'file_type': ['filename', 'bytesio'],
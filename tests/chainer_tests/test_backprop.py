@@ -112,6 +112,65 @@ class TestBackward(unittest.TestCase):
         testing.assert_allclose(x.grad, np.array(3, np.float32))
 
 
+class TestBackwardCachedSchedule(unittest.TestCase):
+
+    def setUp(self):
+        chainer._backprop._schedule_cache.clear()
+
+    def forward(self, x, w):
+        h = chainer.functions.tanh(chainer.functions.matmul(x, w))
+        h0, h1 = chainer.functions.split_axis(h, 2, axis=1)
+        return chainer.functions.sum(h0 * h1 + h0)
+
+    def check_backward(self, x_data, w_data):
+        x = chainer.Variable(x_data)
+        w = chainer.Variable(w_data)
+        self.forward(x, w).backward()
+        expected_gx, expected_gw = x.grad, w.grad
+
+        x.cleargrad()
+        w.cleargrad()
+        with chainer.using_config('cache_backward_schedule', True):
+            self.forward(x, w).backward()
+        testing.assert_allclose(x.grad, expected_gx)
+        testing.assert_allclose(w.grad, expected_gw)
+
+    def test_reuse_schedule(self):
+        x_data = np.random.uniform(-1, 1, (3, 4)).astype(np.float32)
+        w_data = np.random.uniform(-1, 1, (4, 6)).astype(np.float32)
+        self.check_backward(x_data, w_data)
+        assert len(chainer._backprop._schedule_cache) == 1
+        self.check_backward(x_data * 2, w_data)
+        assert len(chainer._backprop._schedule_cache) == 1
+
+    def test_different_shapes(self):
+        w_data = np.random.uniform(-1, 1, (4, 6)).astype(np.float32)
+        self.check_backward(
+            np.random.uniform(-1, 1, (3, 4)).astype(np.float32), w_data)
+        self.check_backward(
+            np.random.uniform(-1, 1, (5, 4)).astype(np.float32), w_data)
+        assert len(chainer._backprop._schedule_cache) == 2
+
+    def test_unreached_function(self):
+        x = chainer.Variable(np.array([1, 2], np.float32))
+        h0, h1 = chainer.functions.split_axis(x * 2, 2, axis=0)
+        y0 = h0 * 3
+        y1 = h1 * 4
+        with chainer.using_config('cache_backward_schedule', True):
+            y0.grad = np.array([1], np.float32)
+            chainer.backward([y0, y1])
+        testing.assert_allclose(x.grad, np.array([6, 0], np.float32))
+
+    def test_retain_grad(self):
+        x = chainer.Variable(np.array([1, 2], np.float32))
+        h = x * 2
+        y = chainer.functions.sum(h * h)
+        with chainer.using_config('cache_backward_schedule', True):
+            y.backward(retain_grad=True)
+        testing.assert_allclose(h.grad, np.array([4, 8], np.float32))
+        testing.assert_allclose(x.grad, np.array([8, 16], np.float32))
+
+
 # see also test_function_node.TestGradTypeCheck
 class TestBackwardTypeCheck(unittest.TestCase):
 
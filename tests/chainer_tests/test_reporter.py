@@ -366,6 +366,39 @@ class TestDictSummary(unittest.TestCase):
             'c': (9., 8.),
         })
 
+    def test_key_order(self):
+        self.summary.add({'a': 3., 'b': 1.})
+        self.summary.add({'b': 5., 'a': 1.})
+        self.summary.add({'c': 9., 'a': 2.})
+        self.summary.add({'b': 6., 'c': 8., 'a': 3.})
+
+        self.check(self.summary, {
+            'a': (3., 1., 2., 3.),
+            'b': (1., 5., 6.),
+            'c': (9., 8.),
+        })
+
+    def test_weight_mixed(self):
+        self.summary.add({'a': (1., 0.5), 'b': 2., 'c': (3., 2)})
+        self.summary.add({'a': (2., numpy.array(0.4)), 'b': 4., 'c': 5.})
+
+        mean = self.summary.compute_mean()
+        testing.assert_allclose(
+            mean['a'], (1 * 0.5 + 2 * 0.4) / (0.5 + 0.4))
+        testing.assert_allclose(mean['b'], 3.)
+        testing.assert_allclose(mean['c'], (3. * 2 + 5.) / 3)
+
+    @attr.gpu
+    def test_cupy_device_resident(self):
+        xp = cuda.cupy
+        self.summary.add({'cupy': xp.array(3, 'f'), 'float': 1.})
+        self.summary.add({'cupy': xp.array(1, 'f'), 'float': 2.})
+
+        mean = self.summary.compute_mean()
+        assert isinstance(mean['cupy'], xp.ndarray)
+        assert isinstance(mean['float'], numpy.generic)
+        self.check(self.summary, {'cupy': (3., 1.), 'float': (1., 2.)})
+
     def test_weight(self):
         self.summary.add({'a': (1., 0.5)})
         self.summary.add({'a': (2., numpy.array(0.4))})
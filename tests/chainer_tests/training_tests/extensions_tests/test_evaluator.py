@@ -1,5 +1,8 @@
+import shutil
+import tempfile
 import unittest
 
+import mock
 import numpy
 
 import chainer
@@ -8,6 +11,7 @@ from chainer.backends import _cpu
 from chainer import dataset
 from chainer import iterators
 from chainer import testing
+from chainer import training
 from chainer.training import extensions
 
 
@@ -291,4 +295,135 @@ class TestEvaluatorProgressBar(unittest.TestCase):
             self.evaluator.evaluate()
 
 
+class DummyParameterModel(chainer.Link):
+
+    def __init__(self):
+        super(DummyParameterModel, self).__init__()
+        with self.init_scope():
+            self.W = chainer.Parameter(numpy.ones((2, 3), 'f'))
+
+    def forward(self, x):
+        chainer.report({'loss': x.sum(), 'w': self.W.array.sum()}, self)
+
+
+class TestEvaluatorAsync(unittest.TestCase):
+
+    def setUp(self):
+        self.data = [
+            numpy.random.uniform(-1, 1, (3, 4)).astype('f') for _ in range(2)]
+        self.batches = [
+            numpy.random.uniform(-1, 1, (2, 3, 4)).astype('f')
+            for _ in range(4)]
+
+        self.iterator = DummyIterator(self.data)
+        self.converter = DummyConverter(self.batches)
+        self.target = DummyParameterModel()
+        self.evaluator = extensions.Evaluator(
+            self.iterator, self.target, converter=self.converter,
+            async_evaluation=True)
+        self.evaluator.name = 'eval'
+        self.trainer = mock.MagicMock()
+        self.trainer.stop_trigger = training.triggers.IntervalTrigger(
+            30, 'iteration')
+
+    def test_call(self):
+        self.trainer.updater.iteration = 10
+        with chainer.Reporter():
+            self.assertIsNone(self.evaluator(self.trainer))
+        # Updates after the trigger do not affect the running evaluation.
+        self.target.W.array[...] += 1
+
+        self.trainer.updater.iteration = 20
+        reporter = chainer.Reporter()
+        with reporter:
+            result = self.evaluator(self.trainer)
+        # The iteration is returned but not reported.
+        self.assertEqual(result.pop('eval/iteration'), 10)
+        self.assertEqual(reporter.observation, result)
+        self.assertAlmostEqual(
+            result['eval/main/loss'],
+            numpy.mean([numpy.sum(x) for x in self.batches[:2]]), places=4)
+        self.assertEqual(result['eval/main/w'], 6)
+
+        self.evaluator.finalize()
+        self.assertTrue(self.iterator.finalized)
+        result = self.evaluator.wait()
+        self.assertEqual(result['eval/iteration'], 20)
+        self.assertAlmostEqual(
+            result['eval/main/loss'],
+            numpy.mean([numpy.sum(x) for x in self.batches[2:]]), places=4)
+        self.assertEqual(result['eval/main/w'], 12)
+        self.assertIsNone(self.evaluator.wait())
+
+    def test_call_last_iteration(self):
+        self.trainer.updater.iteration = 20
+        with chainer.Reporter():
+            self.evaluator(self.trainer)
+        self.target.W.array[...] += 1
+
+        # The last evaluation runs synchronously on the current parameters.
+        self.trainer.updater.iteration = 30
+        reporter = chainer.Reporter()
+        with reporter:
+            result = self.evaluator(self.trainer)
+        self.assertEqual(result.pop('eval/iteration'), 30)
+        self.assertEqual(reporter.observation, result)
+        self.assertAlmostEqual(
+            result['eval/main/loss'],
+            numpy.mean([numpy.sum(x) for x in self.batches[2:]]), places=4)
+        self.assertEqual(result['eval/main/w'], 12)
+        self.assertIsNone(self.evaluator.wait())
+
+    def test_evaluation_error(self):
+        def eval_func(x):
+            raise ValueError('error in evaluation')
+
+        self.evaluator.eval_func = eval_func
+        self.evaluator()
+        with self.assertRaises(ValueError):
+            self.evaluator.wait()
+
+    def test_progress_bar(self):
+        with self.assertRaises(ValueError):
+            extensions.Evaluator(
+                self.iterator, self.target, progress_bar=True,
+                async_evaluation=True)
+
+
+class TestEvaluatorAsyncTrainer(unittest.TestCase):
+
+    def setUp(self):
+        self.out = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.out)
+
+    def test_last_evaluation_is_logged(self):
+        x = numpy.random.uniform(-1, 1, (8, 3)).astype('f')
+        t = numpy.random.randint(0, 2, 8).astype('i')
+        dset = chainer.datasets.TupleDataset(x, t)
+        model = chainer.links.Classifier(chainer.links.Linear(3, 2))
+        optimizer = chainer.optimizers.SGD()
+        optimizer.setup(model)
+        updater = training.updaters.StandardUpdater(
+            iterators.SerialIterator(dset, 4), optimizer)
+        trainer = training.Trainer(updater, (3, 'epoch'), out=self.out)
+        trainer.extend(extensions.Evaluator(
+            iterators.SerialIterator(dset, 4, repeat=False, shuffle=False),
+            model, async_evaluation=True))
+        log_report = extensions.LogReport()
+        trainer.extend(log_report)
+        trainer.run()
+
+        # The results lag behind by one epoch except for the last one.
+        log = log_report.log
+        self.assertEqual(len(log), 3)
+        self.assertNotIn('validation/main/loss', log[0])
+        self.assertIn('validation/main/loss', log[1])
+        self.assertEqual(log[-1]['iteration'], 6)
+        self.assertIn('validation/main/loss', log[-1])
+        for entry in log:
+            self.assertNotIn('validation/iteration', entry)
+
+
 testing.run_module(__name__, __file__)
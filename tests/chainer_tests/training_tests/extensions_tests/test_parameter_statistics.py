@@ -1,8 +1,10 @@
 import re
 import time
 import unittest
+import warnings
 
 import mock
+import numpy
 import six
 
 import chainer
@@ -179,4 +181,54 @@ class TestParameterStatisticsCustomFunction(TestParameterStatisticsBase,
             self.assertEqual(value, self.expect)
 
 
+@testing.parameterize(*testing.product({
+    'dtype': [numpy.float16, numpy.float32, numpy.float64],
+    'skip_nan_params': [True, False],
+}))
+class TestParameterStatisticsBatched(unittest.TestCase):
+
+    def setUp(self):
+        self.links = [chainer.links.Linear(3, 2), chainer.links.Linear(5, 4)]
+        for link in self.links:
+            for param in link.params():
+                param.array = numpy.random.uniform(
+                    -1, 1, param.shape).astype(self.dtype)
+                param.array.ravel()[0] = 0
+                param.grad = numpy.random.uniform(
+                    -1, 1, param.shape).astype(self.dtype)
+        self.links[1].b.grad[1] = numpy.nan
+
+    def observe(self, statistics):
+        extension = extensions.ParameterStatistics(
+            self.links, statistics=statistics,
+            skip_nan_params=self.skip_nan_params)
+        extension._trigger = lambda trainer: True
+        observation = {}
+        with chainer.reporter.Reporter().scope(observation):
+            extension(None)
+        return observation
+
+    def test_consistent_with_functions(self):
+        statistics = extensions.ParameterStatistics.default_statistics
+        # Wrapped functions are computed for each parameter.
+        wrapped = {name: (lambda f: lambda x: f(x))(function)
+                   for name, function in six.iteritems(statistics)}
+        with warnings.catch_warnings():
+            # numpy warns about NaNs in the statistics
+            warnings.simplefilter('ignore', RuntimeWarning)
+            expected = self.observe(wrapped)
+            actual = self.observe(statistics)
+
+        assert sorted(actual.keys()) == sorted(expected.keys())
+        # In float16, the percentiles of the batched parameters can be
+        # rounded differently from those of each parameter.
+        if self.dtype == numpy.float16:
+            tol = {'rtol': 1e-2, 'atol': 1e-3}
+        else:
+            tol = {'rtol': 1e-5, 'atol': 1e-6}
+        for key, value in six.iteritems(expected):
+            numpy.testing.assert_allclose(
+                float(actual[key]), float(value), err_msg=key, **tol)
+
+
 testing.run_module(__name__, __file__)
@@ -2,8 +2,12 @@ import unittest
 
 import mock
 import multiprocessing
+import os
 import threading
 
+import numpy
+
+from chainer import serializers
 from chainer import testing
 from chainer.training.extensions import snapshot_writers
 from chainer import utils
@@ -61,6 +65,44 @@ class TestProcessWriter(unittest.TestCase):
             assert isinstance(worker, multiprocessing.Process)
 
 
+class TestShardedWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.target = {
+            'a': numpy.arange(6, dtype=numpy.float32).reshape(2, 3),
+            'b': numpy.arange(100, dtype=numpy.int32),
+            'c': numpy.asarray(1.5),
+        }
+
+    def test_create_worker(self):
+        w = snapshot_writers.ShardedWriter()
+        with utils.tempdir() as tempd:
+            worker = w.create_worker('myfile.dat', tempd, self.target)
+            assert isinstance(worker, threading.Thread)
+
+    def test_call(self):
+        w = snapshot_writers.ShardedWriter(n_shards=2)
+        with utils.tempdir() as tempd:
+            w('myfile', tempd, self.target)
+            w('myfile', tempd, self.target)
+            w.finalize()
+
+            path = os.path.join(tempd, 'myfile')
+            assert sorted(os.listdir(path)) == [
+                'manifest.json', 'shard_0.npz', 'shard_1.npz']
+            loaded = {
+                'a': numpy.zeros((2, 3), dtype=numpy.float32),
+                'b': numpy.zeros(100, dtype=numpy.int32),
+                'c': numpy.asarray(0.0),
+            }
+            target = mock.MagicMock()
+            target.serialize.side_effect = lambda s: [
+                s(key, value) for key, value in loaded.items()]
+            serializers.load_npz(path, target)
+            for key, value in self.target.items():
+                numpy.testing.assert_array_equal(loaded[key], value)
+
+
 class TestQueueWriter(unittest.TestCase):
 
     def test_call(self):
@@ -0,0 +1,168 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+import numpy
+
+import chainer
+from chainer import iterators
+from chainer import links
+from chainer import optimizers
+from chainer import testing
+from chainer import training
+from chainer.training import step_profiler
+
+
+class TestStepProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = training.StepProfiler(
+            window=4, percentiles=(50, 100), trace=True)
+
+    def test_phase_without_profiler(self):
+        self.assertIsNone(step_profiler.get_current_profiler())
+        with step_profiler.phase('forward'):
+            pass
+
+    def test_scope(self):
+        with self.profiler:
+            self.assertIs(step_profiler.get_current_profiler(), self.profiler)
+        self.assertIsNone(step_profiler.get_current_profiler())
+
+    def test_statistics(self):
+        with self.profiler:
+            for i in range(6):
+                self.profiler.start_step()
+                with step_profiler.phase('forward'):
+                    pass
+                with step_profiler.phase('forward'):
+                    pass
+                if i % 2 == 0:
+                    with step_profiler.phase('extension/ext'):
+                        pass
+                self.profiler.end_step()
+
+        self.assertEqual(len(self.profiler._samples['forward']), 4)
+        self.assertEqual(len(self.profiler._samples['extension/ext']), 3)
+        stats = self.profiler.get_statistics()
+        self.assertEqual(
+            set(stats.keys()),
+            {'profile/{}/p{}'.format(name, q)
+             for name in ('forward', 'extension/ext', 'step')
+             for q in (50, 100)})
+        for name in ('forward', 'extension/ext', 'step'):
+            self.assertLessEqual(stats['profile/{}/p50'.format(name)],
+                                 stats['profile/{}/p100'.format(name)])
+        self.assertEqual(stats['profile/step/p100'],
+                         max(self.profiler._samples['step']))
+
+    def test_nested_phases(self):
+        times = iter([0.0, 1.0, 3.0, 6.0, 10.0, 15.0])
+        with mock.patch('chainer.training.trainer._get_time',
+                        lambda: next(times)):
+            with self.profiler:
+                self.profiler.start_step()
+                with step_profiler.phase('update'):
+                    with step_profiler.phase('forward'):
+                        pass
+                self.profiler.end_step()
+
+        # The time of the inner phase is excluded from the outer one.
+        stats = self.profiler.get_statistics()
+        self.assertEqual(stats['profile/forward/p100'], 3.0)
+        self.assertEqual(stats['profile/update/p100'], 6.0)
+        self.assertEqual(stats['profile/step/p100'], 15.0)
+        # The trace keeps the whole intervals.
+        self.assertEqual(
+            [(name, start, end)
+             for name, start, end, _ in self.profiler._events],
+            [('forward', 3.0, 6.0), ('update', 1.0, 10.0),
+             ('step', 0.0, 15.0)])
+
+    def test_report(self):
+        with self.profiler:
+            self.profiler.start_step()
+            with step_profiler.phase('data'):
+                pass
+            self.profiler.end_step()
+        reporter = chainer.Reporter()
+        with reporter:
+            self.profiler.report()
+        self.assertIn('profile/data/p50', reporter.observation)
+
+    def test_end_step_without_start(self):
+        with self.assertRaises(RuntimeError):
+            self.profiler.end_step()
+
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            training.StepProfiler(window=0)
+
+    def test_dump_trace(self):
+        with self.profiler:
+            self.profiler.start_step()
+            with step_profiler.phase('backward'):
+                pass
+            self.profiler.end_step()
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, 'trace.json')
+            self.profiler.dump_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+        finally:
+            shutil.rmtree(temp_dir)
+        names = [event['name'] for event in trace['traceEvents']]
+        self.assertEqual(names, ['backward', 'step'])
+        for event in trace['traceEvents']:
+            self.assertEqual(event['ph'], 'X')
+            self.assertGreaterEqual(event['dur'], 0)
+
+    def test_dump_trace_disabled(self):
+        with self.assertRaises(RuntimeError):
+            training.StepProfiler().dump_trace('trace.json')
+
+
+class TestStepProfilerTrainer(unittest.TestCase):
+
+    def test_trainer(self):
+        x = numpy.random.uniform(-1, 1, (8, 3)).astype(numpy.float32)
+        t = numpy.random.randint(0, 2, (8,)).astype(numpy.int32)
+        dataset = chainer.datasets.TupleDataset(x, t)
+        iterator = iterators.SerialIterator(dataset, 4)
+        model = links.Classifier(links.Linear(3, 2))
+        optimizer = optimizers.SGD()
+        optimizer.setup(model)
+        updater = training.updaters.StandardUpdater(iterator, optimizer)
+
+        observations = []
+        profiler = training.StepProfiler()
+        trainer = training.Trainer(
+            updater, (3, 'iteration'), out=tempfile.mkdtemp(),
+            profiler=profiler)
+
+        @training.make_extension(trigger=(1, 'iteration'))
+        def record(trainer):
+            observations.append(dict(trainer.observation))
+
+        trainer.extend(record)
+        try:
+            trainer.run()
+        finally:
+            shutil.rmtree(trainer.out)
+
+        self.assertIsNone(step_profiler.get_current_profiler())
+        self.assertEqual(len(observations), 3)
+        # Statistics of the preceding steps are reported.
+        self.assertNotIn('profile/step/p50', observations[0])
+        for phase in ('data', 'convert', 'forward', 'backward', 'update',
+                      'extension/record', 'step'):
+            self.assertIn('profile/{}/p95'.format(phase), observations[1])
+        self.assertEqual(len(profiler._samples['step']), 3)
+
+
+testing.run_module(__name__, __file__)
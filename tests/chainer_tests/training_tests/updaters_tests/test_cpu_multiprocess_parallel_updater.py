@@ -0,0 +1,195 @@
+import copy
+import unittest
+
+import numpy
+
+import chainer
+from chainer import initializers
+from chainer import testing
+from chainer import training
+import chainer.training.updaters.cpu_multiprocess_parallel_updater as cmpu
+
+
+class SimpleNet(chainer.Chain):
+
+    def __init__(self, dtype=numpy.float32):
+        super(SimpleNet, self).__init__()
+        W = initializers.HeNormal(1 / numpy.sqrt(2), dtype)
+        bias = initializers.Zero(dtype)
+        with self.init_scope():
+            self.conv = chainer.links.Convolution2D(
+                2, 2, 3, initialW=W, initial_bias=bias)
+            self.fc = chainer.links.Linear(
+                18, 2, initialW=W, initial_bias=bias)
+            # Parameters that do not receive gradients
+            self.unused = chainer.links.Linear(
+                2, 2, initialW=W, initial_bias=bias)
+
+    def forward(self, x, t):
+        h = chainer.functions.relu(self.conv(x))
+        y = self.fc(h)
+        loss = chainer.functions.softmax_cross_entropy(y, t)
+        chainer.reporter.report({'loss': loss}, self)
+        return loss
+
+
+class FailingNet(SimpleNet):
+
+    def forward(self, x, t):
+        if (x < 0).any():
+            raise ValueError('invalid input')
+        return super(FailingNet, self).forward(x, t)
+
+
+def _make_dataset(n, dtype=numpy.float32):
+    x = numpy.random.uniform(0, 1, (n, 2, 5, 5)).astype(dtype)
+    t = numpy.random.randint(0, 2, n).astype(numpy.int32)
+    return chainer.datasets.TupleDataset(x, t)
+
+
+class TestGatherScatter(unittest.TestCase):
+
+    def test_gather_scatter(self):
+        model = SimpleNet()
+        size = sum(param.size for param in model.params())
+        for param in model.params():
+            param.grad = numpy.random.uniform(
+                -1, 1, param.shape).astype(param.dtype)
+        model.unused.W.grad = None
+
+        grads = numpy.empty(size, numpy.float32)
+        cmpu.gather_grads(model, grads)
+        params = numpy.empty(size, numpy.float32)
+        cmpu.gather_params(model, params)
+
+        model2 = copy.deepcopy(model)
+        model2.cleargrads()
+        for param in model2.params():
+            param.array[...] = 0
+        cmpu.scatter_grads(model2, grads)
+        cmpu.scatter_params(model2, params)
+        for (name, p1), (_, p2) in zip(
+                sorted(model.namedparams()), sorted(model2.namedparams())):
+            numpy.testing.assert_array_equal(p1.array, p2.array)
+            if p1.grad is None:
+                numpy.testing.assert_array_equal(p2.grad, 0)
+            else:
+                numpy.testing.assert_array_equal(p1.grad, p2.grad)
+
+
+@testing.parameterize(*testing.product({
+    'n_processes': [1, 2, 3],
+    'dtype': [numpy.float32, numpy.float64],
+}))
+class TestCpuMultiprocessParallelUpdater(unittest.TestCase):
+
+    def setUp(self):
+        self.batch_size = 4
+        self.model = SimpleNet(self.dtype)
+        self.dataset = _make_dataset(24, self.dtype)
+        self.subsets = chainer.datasets.split_dataset_n(
+            self.dataset, self.n_processes)
+
+    def test_update(self):
+        model = self.model
+        reference = copy.deepcopy(model)
+
+        iterators = [
+            chainer.iterators.SerialIterator(
+                subset, self.batch_size, shuffle=False)
+            for subset in self.subsets]
+        optimizer = chainer.optimizers.MomentumSGD(lr=0.1)
+        optimizer.setup(model)
+        updater = cmpu.CpuMultiprocessParallelUpdater(iterators, optimizer)
+
+        # The update is equivalent to that with the concatenated mini-batch.
+        ref_optimizer = chainer.optimizers.MomentumSGD(lr=0.1)
+        ref_optimizer.setup(reference)
+        ref_iterators = [
+            chainer.iterators.SerialIterator(
+                subset, self.batch_size, shuffle=False)
+            for subset in self.subsets]
+
+        reporter = chainer.Reporter()
+        reporter.add_observer('main', model)
+        reporter.add_observer('reference', reference)
+        try:
+            with reporter:
+                for _ in range(3):
+                    updater.update()
+                    batch = sum([it.next() for it in ref_iterators], [])
+                    x, t = chainer.dataset.concat_examples(batch)
+                    ref_optimizer.update(reference, x, t)
+        finally:
+            updater.finalize()
+
+        assert updater.iteration == 3
+        for (name, p1), (_, p2) in zip(
+                sorted(model.namedparams()),
+                sorted(reference.namedparams())):
+            numpy.testing.assert_allclose(
+                p1.array, p2.array, rtol=1e-4, atol=1e-5, err_msg=name)
+
+    def test_trainer(self):
+        iterators = [
+            chainer.iterators.SerialIterator(subset, self.batch_size)
+            for subset in self.subsets]
+        optimizer = chainer.optimizers.SGD()
+        optimizer.setup(self.model)
+        updater = cmpu.CpuMultiprocessParallelUpdater(iterators, optimizer)
+        trainer = training.Trainer(updater, (2, 'iteration'))
+        trainer.run()
+        assert updater.iteration == 2
+        assert 'main/loss' in trainer.observation
+
+
+class TestCpuMultiprocessParallelUpdaterError(unittest.TestCase):
+
+    def test_worker_error(self):
+        dataset = _make_dataset(8)
+        # Only the worker receives an invalid input.
+        dataset._datasets[0][4:] = -1
+        iterators = [
+            chainer.iterators.SerialIterator(subset, 4, shuffle=False)
+            for subset in chainer.datasets.split_dataset_n(dataset, 2)]
+        optimizer = chainer.optimizers.SGD()
+        model = FailingNet()
+        optimizer.setup(model)
+        updater = cmpu.CpuMultiprocessParallelUpdater(iterators, optimizer)
+        reporter = chainer.Reporter()
+        reporter.add_observer('main', model)
+        try:
+            with self.assertRaises(RuntimeError) as cm, reporter:
+                updater.update()
+            assert 'invalid input' in str(cm.exception)
+        finally:
+            updater.finalize()
+
+    def test_invalid_number_of_devices(self):
+        iterators = [
+            chainer.iterators.SerialIterator(_make_dataset(4), 2)
+            for _ in range(2)]
+        optimizer = chainer.optimizers.SGD()
+        optimizer.setup(SimpleNet())
+        with self.assertRaises(ValueError):
+            cmpu.CpuMultiprocessParallelUpdater(
+                iterators, optimizer, devices=['@numpy'])
+
+
+class TestGatherSparseGrad(unittest.TestCase):
+
+    def test_gather_sparse_grad(self):
+        link = chainer.links.EmbedID(5, 3, sparse_grad=True)
+        y = link(numpy.array([3, 1, 3], numpy.int32))
+        y.grad = numpy.ones((3, 3), numpy.float32)
+        link.cleargrads()
+        y.backward()
+        assert isinstance(link.W.grad, chainer.utils.RowSparseArray)
+
+        grads = numpy.empty(link.W.size, numpy.float32)
+        cmpu.gather_grads(link, grads)
+        numpy.testing.assert_array_equal(
+            grads, link.W.grad.to_dense().ravel())
+
+
+testing.run_module(__name__, __file__)
@@ -53,4 +53,78 @@ class TestSumTo(unittest.TestCase):
         numpy.testing.assert_array_equal(y_expect, y_actual)
 
 
+@testing.parameterize(*testing.product({
+    'dtype': [numpy.float16, numpy.float32, numpy.float64],
+    'indices': [[], [1], [3, 1, 3, 0, 1, 3], [[0, 2], [2, -1]]],
+    'ignore_label': [None, 3],
+}))
+class TestScatterAddRows(unittest.TestCase):
+
+    def setUp(self):
+        self.indices = numpy.array(self.indices, numpy.int32)
+        self.a = numpy.random.uniform(-1, 1, (4, 2)).astype(self.dtype)
+        self.values = numpy.random.uniform(
+            -1, 1, self.indices.shape + (2,)).astype(self.dtype)
+        self.check_options = {}
+        if self.dtype == numpy.float16:
+            self.check_options = {'atol': 5e-3, 'rtol': 5e-3}
+
+    def test_scatter_add_rows(self):
+        expect = self.a.copy()
+        for i, v in zip(self.indices.ravel(), self.values.reshape(-1, 2)):
+            if i != self.ignore_label:
+                expect[i] += v
+        a = self.a.copy()
+        ret = array.scatter_add_rows(
+            a, self.indices, self.values, self.ignore_label)
+        assert ret is a
+        testing.assert_allclose(a, expect, **self.check_options)
+
+    def test_segment_sum_rows(self):
+        rows, sums = array.segment_sum_rows(
+            self.indices, self.values, self.ignore_label)
+        expect = {}
+        for i, v in zip(self.indices.ravel(), self.values.reshape(-1, 2)):
+            if i != self.ignore_label:
+                expect[i] = expect.get(i, 0) + v
+        assert rows.tolist() == sorted(expect)
+        assert sums.shape == (len(rows), 2)
+        assert sums.dtype == self.dtype
+        for row, s in zip(rows, sums):
+            testing.assert_allclose(s, expect[row], **self.check_options)
+
+    def test_segment_sum_rows_owns_values(self):
+        indices = numpy.arange(3)
+        values = numpy.broadcast_to(numpy.ones((1, 2), self.dtype), (3, 2))
+        rows, sums = array.segment_sum_rows(indices, values)
+        assert not numpy.may_share_memory(sums, values)
+        sums += 1
+
+
+@testing.parameterize(
+    {'shape': (5,), 'slices': ([0, 2, 0, 4],), 'b_shape': (4,)},
+    {'shape': (5, 3), 'slices': numpy.array([[1, 1], [4, -4]]),
+     'b_shape': (2, 2, 3)},
+    {'shape': (3, 5, 2), 'slices': (slice(None), [2, 0, 2]),
+     'b_shape': (3, 3, 2)},
+    {'shape': (3, 5, 2), 'slices': (slice(None), [[2, 0], [0, 2]]),
+     'b_shape': (3, 2, 2, 2)},
+    {'shape': (3, 5), 'slices': (slice(1, None), [2, 2]),
+     'b_shape': (2, 2)},
+    {'shape': (3, 5), 'slices': ([0, 0], [2, 2]), 'b_shape': (2,)},
+    {'shape': (3, 5), 'slices': numpy.array([True, False, True]),
+     'b_shape': (2, 5)},
+    {'shape': (3, 5), 'slices': ([0, 0],), 'b_shape': ()},
+)
+class TestAddAt(unittest.TestCase):
+
+    def test_add_at(self):
+        a = numpy.random.uniform(-1, 1, self.shape)
+        b = numpy.random.uniform(-1, 1, self.b_shape)
+        expect = a.copy()
+        numpy.add.at(expect, self.slices, b)
+        array.add_at(a, self.slices, b)
+        numpy.testing.assert_allclose(a, expect)
+
+
 testing.run_module(__name__, __file__)
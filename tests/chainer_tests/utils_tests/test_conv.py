@@ -154,4 +154,169 @@ class TestCol2Im(unittest.TestCase):
         self.check_col2im(*self.params, gpu=True)
 
 
+@testing.parameterize(*testing.product({
+    'params': [
+        (1, 1, 1, 1, 0, 0, 1, 1),
+        (2, 2, 2, 2, 2, 2, 2, 2),
+        (3, 3, 2, 3, 1, 0, 1, 1),
+        (1, 2, 3, 4, 4, 5, 2, 3),
+    ],
+    'cover_all': [False, True],
+    'workspace_size': [None, 1],
+}))
+class TestConvolutionCPU(unittest.TestCase):
+
+    def setUp(self):
+        self.dtype = numpy.float64
+        self.h = 8
+        self.w = 10
+        kh, kw = self.params[:2]
+        self.x = numpy.random.uniform(
+            -1, 1, (3, 2, self.h, self.w)).astype(self.dtype)
+        self.W = numpy.random.uniform(
+            -1, 1, (4, 2, kh, kw)).astype(self.dtype)
+        self.original_size = conv.get_cpu_workspace_size()
+        if self.workspace_size is not None:
+            conv.set_cpu_workspace_size(self.workspace_size)
+
+    def tearDown(self):
+        conv.set_cpu_workspace_size(self.original_size)
+
+    def test_forward_and_backward(self):
+        kh, kw, sy, sx, ph, pw, dy, dx = self.params
+        stride, pad, dilate = (sy, sx), (ph, pw), (dy, dx)
+        col = conv.im2col_cpu(self.x, kh, kw, sy, sx, ph, pw,
+                              cover_all=self.cover_all, dy=dy, dx=dx)
+
+        y = conv.convolution_forward_cpu(
+            self.x, self.W, stride, pad, dilate, cover_all=self.cover_all)
+        y_expect = numpy.tensordot(col, self.W, ((1, 2, 3), (1, 2, 3)))
+        testing.assert_allclose(y, numpy.rollaxis(y_expect, 3, 1))
+
+        gy = numpy.random.uniform(-1, 1, y.shape).astype(self.dtype)
+        gW = conv.convolution_backward_filter_cpu(
+            self.x, gy, (kh, kw), stride, pad, dilate)
+        gW_expect = numpy.tensordot(gy, col, ((0, 2, 3), (0, 4, 5)))
+        testing.assert_allclose(gW, gW_expect)
+
+        gx = conv.convolution_backward_data_cpu(
+            gy, self.W, stride, pad, (self.h, self.w), dilate)
+        gcol = numpy.rollaxis(numpy.tensordot(self.W, gy, (0, 1)), 3)
+        gx_expect = conv.col2im_cpu(
+            gcol, sy, sx, ph, pw, self.h, self.w, dy=dy, dx=dx)
+        testing.assert_allclose(gx, gx_expect)
+
+    def test_im2col_pval(self):
+        kh, kw, sy, sx, ph, pw, dy, dx = self.params
+        col = conv.im2col_cpu(self.x, kh, kw, sy, sx, ph, pw, pval=-5,
+                              cover_all=self.cover_all, dy=dy, dx=dx)
+        col_h, col_w = col.shape[4:]
+        for ky in moves.range(kh):
+            for kx in moves.range(kw):
+                for oy in moves.range(col_h):
+                    for ox in moves.range(col_w):
+                        y = ky * dy + oy * sy - ph
+                        x = kx * dx + ox * sx - pw
+                        if 0 <= y < self.h and 0 <= x < self.w:
+                            expect = self.x[:, :, y, x]
+                        else:
+                            expect = numpy.full((3, 2), -5, self.dtype)
+                        numpy.testing.assert_array_equal(
+                            col[:, :, ky, kx, oy, ox], expect)
+
+
+@testing.parameterize(*testing.product({
+    'params': [
+        ((2, 2), (2, 2), (0, 0)),
+        ((3, 3), (2, 2), (1, 1)),
+        ((3, 2), (1, 3), (2, 0)),
+        ((12, 11), (1, 1), (0, 0)),
+    ],
+    'cover_all': [False, True],
+    'chunk_size': [None, 1],
+}))
+class TestPoolingCPU(unittest.TestCase):
+
+    def setUp(self):
+        self.dtype = numpy.float64
+        self.h = 12
+        self.w = 11
+        self.x = numpy.random.uniform(
+            -1, 1, (3, 2, self.h, self.w)).astype(self.dtype)
+        self.original_size = conv._pooling_chunk_size
+        if self.chunk_size is not None:
+            conv._pooling_chunk_size = self.chunk_size
+
+    def tearDown(self):
+        conv._pooling_chunk_size = self.original_size
+
+    def test_max_pooling(self):
+        ksize, stride, pad = self.params
+        (kh, kw), (sy, sx), (ph, pw) = self.params
+        col = conv.im2col_cpu(
+            self.x, kh, kw, sy, sx, ph, pw, pval=-float('inf'),
+            cover_all=self.cover_all)
+        n, c, _, _, out_h, out_w = col.shape
+        col = col.reshape(n, c, kh * kw, out_h, out_w)
+
+        y, indexes = conv.max_pooling_forward_cpu(
+            self.x, ksize, stride, pad, self.cover_all)
+        numpy.testing.assert_array_equal(y, col.max(axis=2))
+        numpy.testing.assert_array_equal(indexes, col.argmax(axis=2))
+        if kh * kw <= 127:
+            self.assertEqual(indexes.dtype, numpy.int8)
+        else:
+            self.assertEqual(indexes.dtype, numpy.int32)
+
+        numpy.testing.assert_array_equal(
+            conv.max_pooling_gather_cpu(self.x, indexes, ksize, stride, pad),
+            y)
+
+        gy = numpy.random.uniform(-1, 1, y.shape).astype(self.dtype)
+        gx = conv.max_pooling_backward_cpu(
+            gy, indexes, ksize, stride, pad, (self.h, self.w))
+        gcol = numpy.zeros(col.shape, self.dtype)
+        numpy.put_along_axis(gcol, indexes[:, :, None].astype(numpy.intp),
+                             gy[:, :, None], axis=2)
+        gx_expect = conv.col2im_cpu(
+            gcol.reshape(n, c, kh, kw, out_h, out_w), sy, sx, ph, pw,
+            self.h, self.w)
+        testing.assert_allclose(gx, gx_expect)
+
+    def test_max_pooling_nan(self):
+        ksize, stride, pad = self.params
+        (kh, kw), (sy, sx), (ph, pw) = self.params
+        self.x[0, 0, 3, 4:6] = numpy.nan
+        self.x[1, 1, 0, 0] = numpy.nan
+        col = conv.im2col_cpu(
+            self.x, kh, kw, sy, sx, ph, pw, pval=-float('inf'),
+            cover_all=self.cover_all)
+        n, c, _, _, out_h, out_w = col.shape
+        col = col.reshape(n, c, kh * kw, out_h, out_w)
+
+        # The positions of the first NaNs are taken as argmax does.
+        y, indexes = conv.max_pooling_forward_cpu(
+            self.x, ksize, stride, pad, self.cover_all)
+        numpy.testing.assert_array_equal(y, col.max(axis=2))
+        numpy.testing.assert_array_equal(indexes, col.argmax(axis=2))
+
+    def test_average_pooling(self):
+        ksize, stride, pad = self.params
+        (kh, kw), (sy, sx), (ph, pw) = self.params
+        col = conv.im2col_cpu(
+            self.x, kh, kw, sy, sx, ph, pw, cover_all=self.cover_all)
+
+        y = conv.average_pooling_forward_cpu(
+            self.x, ksize, stride, pad, self.cover_all)
+        testing.assert_allclose(y, col.sum(axis=(2, 3)))
+
+        gy = numpy.random.uniform(-1, 1, y.shape).astype(self.dtype)
+        gx = conv.average_pooling_backward_cpu(
+            gy, ksize, stride, pad, (self.h, self.w))
+        gcol = numpy.broadcast_to(gy[:, :, None, None], col.shape)
+        gx_expect = conv.col2im_cpu(
+            numpy.ascontiguousarray(gcol), sy, sx, ph, pw, self.h, self.w)
+        testing.assert_allclose(gx, gx_expect)
+
+
 testing.run_module(__name__, __file__)
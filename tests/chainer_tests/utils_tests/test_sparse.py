@@ -108,4 +108,73 @@ class TestGetOrder2(unittest.TestCase):
             utils.get_order(row, col)
 
 
+@testing.parameterize(*testing.product({
+    'dtype': [numpy.float16, numpy.float32, numpy.float64],
+}))
+class TestRowSparseArray(unittest.TestCase):
+
+    def setUp(self):
+        self.indices = numpy.array([3, 0, 3, 1], numpy.int32)
+        self.values = numpy.random.uniform(-1, 1, (4, 2)).astype(self.dtype)
+        self.x = utils.RowSparseArray(self.indices, self.values, (5, 2))
+        self.expect = numpy.zeros((5, 2), self.dtype)
+        numpy.add.at(self.expect, self.indices, self.values)
+        self.check_options = {}
+        if self.dtype == numpy.float16:
+            self.check_options = {'atol': 1e-3, 'rtol': 1e-3}
+
+    def test_attributes(self):
+        assert self.x.shape == (5, 2)
+        assert self.x.dtype == self.dtype
+        assert self.x.ndim == 2
+        assert self.x.size == 10
+
+    def test_to_dense(self):
+        testing.assert_allclose(
+            self.x.to_dense(), self.expect, **self.check_options)
+
+    def test_coalesce(self):
+        y = self.x.coalesce()
+        assert y.indices.tolist() == [0, 1, 3]
+        testing.assert_allclose(
+            y.values, self.expect[[0, 1, 3]], **self.check_options)
+
+    def test_add_sparse(self):
+        y = self.x + self.x
+        assert isinstance(y, utils.RowSparseArray)
+        testing.assert_allclose(
+            y.to_dense(), self.expect * 2, **self.check_options)
+
+    def test_add_dense(self):
+        dense = numpy.random.uniform(-1, 1, (5, 2)).astype(self.dtype)
+        dense_copy = dense.copy()
+        for y in (self.x + dense, dense + self.x):
+            assert isinstance(y, numpy.ndarray)
+            testing.assert_allclose(
+                y, dense + self.expect, **self.check_options)
+        numpy.testing.assert_array_equal(dense, dense_copy)
+
+    def test_scale(self):
+        testing.assert_allclose(
+            (self.x * 2).to_dense(), self.expect * 2, **self.check_options)
+        testing.assert_allclose(
+            (self.x / 2).to_dense(), self.expect / 2, **self.check_options)
+        self.x /= 2
+        testing.assert_allclose(
+            self.x.to_dense(), self.expect / 2, **self.check_options)
+
+    def test_astype(self):
+        y = self.x.astype(numpy.float32)
+        assert y.dtype == numpy.float32
+        assert self.x.astype(self.dtype, copy=False) is self.x
+
+    def test_invalid_values_shape(self):
+        with self.assertRaises(ValueError):
+            utils.RowSparseArray(self.indices, self.values, (5, 3))
+
+    def test_add_shape_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.x + numpy.zeros((4, 2), self.dtype)
+
+
 testing.run_module(__name__, __file__)